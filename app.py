@@ -10,7 +10,8 @@ from pathlib import Path
 # Add utils directory to path
 sys.path.append(str(Path(__file__).parent))
 
-from utils.database import db_manager, get_nx_stats
+from utils.database import db_manager, get_nx_stats, get_memory_savings, get_writer_metrics
+from utils.memory_budget import memory_budget, current_session_id
 
 # Page configuration
 st.set_page_config(
@@ -83,10 +84,62 @@ def main():
         
         st.success("✅ Database connections working")
         
+        savings = get_memory_savings()
+        if savings['bytes_before']:
+            st.caption(
+                f"Compact column types: {savings['bytes_after'] / 1e6:.1f} MB instead of "
+                f"{savings['bytes_before'] / 1e6:.1f} MB across {savings['frames']} fetched tables"
+            )
+        
+        writers = get_writer_metrics()
+        if writers:
+            st.caption(" · ".join(
+                f"{domain.upper()} writes: {metrics['queue_depth']} queued, "
+                f"{metrics['jobs_committed']} committed, {metrics['commit_ms_avg']:.1f} ms avg commit"
+                for domain, metrics in writers.items()
+            ))
+    
     except Exception as e:
         st.error(f"❌ Database connection error: {str(e)}")
         st.info("💡 Databases will be created automatically when you access the domain pages.")
     
+    # Per-session memory and heavy work, for whoever runs the server
+    with st.expander("🛠️ Admin: Session Memory"):
+        stats = memory_budget.stats()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Sessions Holding Data", stats['sessions'])
+        with col2:
+            st.metric("Held", f"{stats['held_bytes'] / 2**20:.1f} MB",
+                      help=f"Limit {stats['total_bytes'] / 2**20:.0f} MB in total, "
+                           f"{memory_budget.session_bytes / 2**20:.0f} MB per session")
+        with col3:
+            st.metric("Heavy Jobs", f"{stats['heavy_running']} / {stats['max_heavy_jobs']}",
+                      help=f"{stats['heavy_waiting']} waiting")
+        with col4:
+            st.metric("Evictions / Rejections", f"{stats['evictions']} / {stats['rejections']}")
+        
+        usage = memory_budget.usage()
+        if usage.empty:
+            st.info("No session is holding data right now.")
+        else:
+            usage['session'] = usage['session'].where(usage['session'] != current_session_id(),
+                                                      usage['session'] + " (you)")
+            st.dataframe(
+                usage,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    'held_mb': st.column_config.NumberColumn("Held (MB)", format="%.1f"),
+                    'budget_used': st.column_config.ProgressColumn("Budget Used", min_value=0.0,
+                                                                   max_value=1.0, format="percent"),
+                }
+            )
+        if stats['running']:
+            st.write("**Running heavy jobs:**")
+            for job in stats['running']:
+                st.write(f"• {job['label']} ({job['session']}, {job['seconds']:.0f}s)")
+    
     # Technical information
     with st.expander("🔧 Technical Information"):
         st.markdown("""
@@ -80,6 +80,11 @@ SELECT
 FROM it_domain_projects
 ORDER BY task_index;
 
+-- Index for finding the highest task_index: numbers are zero-padded to
+-- three digits, so longer values sort after shorter ones
+CREATE INDEX idx_task_number ON it_domain_projects(LENGTH(task_index), task_index)
+WHERE task_index GLOB 'TASK[0-9][0-9][0-9]*';
+
 -- Trigger for auto-generating task_index
 CREATE TRIGGER generate_task_index 
 AFTER INSERT ON it_domain_projects
@@ -89,18 +94,21 @@ BEGIN
     UPDATE it_domain_projects 
     SET task_index = 'TASK' || printf('%03d', 
         COALESCE(
-            (SELECT MAX(CAST(SUBSTR(task_index, 5) AS INTEGER)) 
-             FROM it_domain_projects 
-             WHERE task_index GLOB 'TASK[0-9][0-9][0-9]' AND id != NEW.id), 
+            (SELECT CAST(SUBSTR(task_index, 5) AS INTEGER)
+             FROM it_domain_projects
+             WHERE task_index GLOB 'TASK[0-9][0-9][0-9]*'
+             ORDER BY LENGTH(task_index) DESC, task_index DESC
+             LIMIT 1), 
             0) + 1
     )
     WHERE id = NEW.id;
 END;
 
--- Trigger for updating timestamp
+-- Trigger for updating timestamp, skipped when the UPDATE already set it
 CREATE TRIGGER update_timestamp_it_projects
 AFTER UPDATE ON it_domain_projects
 FOR EACH ROW
+WHEN NEW.updated_at IS OLD.updated_at
 BEGIN
     UPDATE it_domain_projects 
     SET updated_at = CURRENT_TIMESTAMP 
@@ -0,0 +1,211 @@
+-- IT Domain Database Upgrades (it_domain.db)
+-- Idempotent statements applied on every startup after it_domain_schema.sql,
+-- so existing databases pick up new tables, indexes, views and triggers
+
+-- Normalized personnel assignments: one row per project, role and person.
+-- The personnel columns may hold comma-separated lists; utils/database.py
+-- splits them into this table whenever projects are added or changed.
+CREATE TABLE IF NOT EXISTS project_assignments (
+    project_id INTEGER NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    person VARCHAR(100) NOT NULL,
+    
+    PRIMARY KEY (project_id, role, person),
+    FOREIGN KEY (project_id) REFERENCES it_domain_projects(id) ON DELETE CASCADE,
+    CHECK (role IN ('dv_engineer', 'digital_designer', 'analog_designer'))
+) WITHOUT ROWID;
+
+-- Indexes for per-person and per-role lookups
+CREATE INDEX IF NOT EXISTS idx_assignments_person ON project_assignments(person, role);
+CREATE INDEX IF NOT EXISTS idx_assignments_role ON project_assignments(role, person);
+
+-- Remove assignments with their project (foreign keys are not enforced on
+-- the application connection, so the cascade is done by trigger)
+CREATE TRIGGER IF NOT EXISTS delete_project_assignments
+AFTER DELETE ON it_domain_projects
+FOR EACH ROW
+BEGIN
+    DELETE FROM project_assignments WHERE project_id = OLD.id;
+END;
+
+-- IP lineage: projects with inherit_from_ip set are edges from the parent
+-- IP to the project's own IP. Edges are reference-counted by project so
+-- several projects on the same IP pair share one edge.
+CREATE TABLE IF NOT EXISTS ip_lineage_edges (
+    parent_ip VARCHAR(100) NOT NULL,
+    child_ip VARCHAR(100) NOT NULL,
+    project_count INTEGER NOT NULL DEFAULT 1,
+    
+    PRIMARY KEY (parent_ip, child_ip)
+) WITHOUT ROWID;
+
+-- Transitive closure of ip_lineage_edges (self pairs are implicit).
+-- path_count is the number of distinct edge paths between the two IPs,
+-- which lets edge deletions be applied incrementally without a rebuild.
+CREATE TABLE IF NOT EXISTS ip_lineage (
+    ancestor VARCHAR(100) NOT NULL,
+    descendant VARCHAR(100) NOT NULL,
+    path_count INTEGER NOT NULL,
+    
+    PRIMARY KEY (ancestor, descendant)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_ip_lineage_descendant ON ip_lineage(descendant, ancestor);
+
+-- Reject projects whose inheritance would close a cycle
+CREATE TRIGGER IF NOT EXISTS check_ip_lineage_insert
+BEFORE INSERT ON it_domain_projects
+FOR EACH ROW
+WHEN TRIM(COALESCE(NEW.inherit_from_ip, '')) <> '' AND TRIM(COALESCE(NEW.ip, '')) <> ''
+BEGIN
+    SELECT RAISE(ABORT, 'IP lineage cycle: inherit_from_ip is a descendant of ip')
+    WHERE TRIM(NEW.inherit_from_ip) <> TRIM(NEW.ip)
+      AND EXISTS (SELECT 1 FROM ip_lineage
+                  WHERE ancestor = TRIM(NEW.ip) AND descendant = TRIM(NEW.inherit_from_ip));
+END;
+
+CREATE TRIGGER IF NOT EXISTS check_ip_lineage_update
+BEFORE UPDATE OF ip, inherit_from_ip ON it_domain_projects
+FOR EACH ROW
+WHEN TRIM(COALESCE(NEW.inherit_from_ip, '')) <> '' AND TRIM(COALESCE(NEW.ip, '')) <> ''
+BEGIN
+    SELECT RAISE(ABORT, 'IP lineage cycle: inherit_from_ip is a descendant of ip')
+    WHERE TRIM(NEW.inherit_from_ip) <> TRIM(NEW.ip)
+      AND EXISTS (SELECT 1 FROM ip_lineage
+                  WHERE ancestor = TRIM(NEW.ip) AND descendant = TRIM(NEW.inherit_from_ip));
+END;
+
+-- Project changes adjust edge reference counts. A project inheriting from
+-- its own IP (a respin) is not an edge.
+CREATE TRIGGER IF NOT EXISTS add_ip_lineage_edge
+AFTER INSERT ON it_domain_projects
+FOR EACH ROW
+WHEN TRIM(COALESCE(NEW.inherit_from_ip, '')) NOT IN ('', TRIM(COALESCE(NEW.ip, '')))
+  AND TRIM(COALESCE(NEW.ip, '')) <> ''
+BEGIN
+    INSERT INTO ip_lineage_edges (parent_ip, child_ip, project_count)
+    VALUES (TRIM(NEW.inherit_from_ip), TRIM(NEW.ip), 1)
+    ON CONFLICT (parent_ip, child_ip) DO UPDATE SET project_count = project_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS remove_ip_lineage_edge
+AFTER DELETE ON it_domain_projects
+FOR EACH ROW
+WHEN TRIM(COALESCE(OLD.inherit_from_ip, '')) NOT IN ('', TRIM(COALESCE(OLD.ip, '')))
+  AND TRIM(COALESCE(OLD.ip, '')) <> ''
+BEGIN
+    UPDATE ip_lineage_edges SET project_count = project_count - 1
+    WHERE parent_ip = TRIM(OLD.inherit_from_ip) AND child_ip = TRIM(OLD.ip);
+    DELETE FROM ip_lineage_edges
+    WHERE parent_ip = TRIM(OLD.inherit_from_ip) AND child_ip = TRIM(OLD.ip) AND project_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS update_ip_lineage_edge
+AFTER UPDATE OF ip, inherit_from_ip ON it_domain_projects
+FOR EACH ROW
+WHEN OLD.ip IS NOT NEW.ip OR OLD.inherit_from_ip IS NOT NEW.inherit_from_ip
+BEGIN
+    UPDATE ip_lineage_edges SET project_count = project_count - 1
+    WHERE parent_ip = TRIM(OLD.inherit_from_ip) AND child_ip = TRIM(OLD.ip)
+      AND TRIM(OLD.inherit_from_ip) <> TRIM(OLD.ip);
+    DELETE FROM ip_lineage_edges
+    WHERE parent_ip = TRIM(OLD.inherit_from_ip) AND child_ip = TRIM(OLD.ip) AND project_count <= 0;
+    INSERT INTO ip_lineage_edges (parent_ip, child_ip, project_count)
+    SELECT TRIM(NEW.inherit_from_ip), TRIM(NEW.ip), 1
+    WHERE TRIM(COALESCE(NEW.inherit_from_ip, '')) NOT IN ('', TRIM(COALESCE(NEW.ip, '')))
+      AND TRIM(COALESCE(NEW.ip, '')) <> ''
+    ON CONFLICT (parent_ip, child_ip) DO UPDATE SET project_count = project_count + 1;
+END;
+
+-- Closure maintenance. A new edge parent -> child adds every path
+-- (ancestor of parent) -> parent -> child -> (descendant of child); removing
+-- an edge subtracts the same paths and drops pairs left without any.
+CREATE TRIGGER IF NOT EXISTS add_ip_lineage_paths
+AFTER INSERT ON ip_lineage_edges
+FOR EACH ROW
+BEGIN
+    INSERT INTO ip_lineage (ancestor, descendant, path_count)
+    SELECT a.ancestor, d.descendant, a.path_count * d.path_count
+    FROM (SELECT ancestor, path_count FROM ip_lineage WHERE descendant = NEW.parent_ip
+          UNION ALL SELECT NEW.parent_ip, 1) a,
+         (SELECT descendant, path_count FROM ip_lineage WHERE ancestor = NEW.child_ip
+          UNION ALL SELECT NEW.child_ip, 1) d
+    WHERE true
+    ON CONFLICT (ancestor, descendant) DO UPDATE SET path_count = path_count + excluded.path_count;
+END;
+
+CREATE TRIGGER IF NOT EXISTS remove_ip_lineage_paths
+AFTER DELETE ON ip_lineage_edges
+FOR EACH ROW
+BEGIN
+    UPDATE ip_lineage
+    SET path_count = path_count -
+        (CASE WHEN ancestor = OLD.parent_ip THEN 1
+              ELSE (SELECT x.path_count FROM ip_lineage x
+                    WHERE x.ancestor = ip_lineage.ancestor AND x.descendant = OLD.parent_ip) END) *
+        (CASE WHEN descendant = OLD.child_ip THEN 1
+              ELSE (SELECT y.path_count FROM ip_lineage y
+                    WHERE y.ancestor = OLD.child_ip AND y.descendant = ip_lineage.descendant) END)
+    WHERE (ancestor = OLD.parent_ip
+           OR ancestor IN (SELECT ancestor FROM ip_lineage WHERE descendant = OLD.parent_ip))
+      AND (descendant = OLD.child_ip
+           OR descendant IN (SELECT descendant FROM ip_lineage WHERE ancestor = OLD.child_ip));
+    DELETE FROM ip_lineage
+    WHERE path_count <= 0
+      AND (descendant = OLD.child_ip
+           OR descendant IN (SELECT descendant FROM ip_lineage WHERE ancestor = OLD.child_ip));
+END;
+
+-- Timestamp trigger that skips rows whose UPDATE already set updated_at,
+-- so bulk updates don't issue a second UPDATE per row. Recreated on every
+-- startup to replace the unconditional trigger of older databases.
+DROP TRIGGER IF EXISTS update_timestamp_it_projects;
+CREATE TRIGGER update_timestamp_it_projects
+AFTER UPDATE ON it_domain_projects
+FOR EACH ROW
+WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE it_domain_projects 
+    SET updated_at = CURRENT_TIMESTAMP 
+    WHERE id = NEW.id;
+END;
+
+-- task_index generation that continues past TASK999 and reads the highest
+-- number from an index instead of scanning every project per insert
+CREATE INDEX IF NOT EXISTS idx_task_number ON it_domain_projects(LENGTH(task_index), task_index)
+WHERE task_index GLOB 'TASK[0-9][0-9][0-9]*';
+
+DROP TRIGGER IF EXISTS generate_task_index;
+CREATE TRIGGER generate_task_index 
+AFTER INSERT ON it_domain_projects
+FOR EACH ROW
+WHEN NEW.task_index IS NULL OR NEW.task_index = ''
+BEGIN
+    UPDATE it_domain_projects 
+    SET task_index = 'TASK' || printf('%03d', 
+        COALESCE(
+            (SELECT CAST(SUBSTR(task_index, 5) AS INTEGER)
+             FROM it_domain_projects
+             WHERE task_index GLOB 'TASK[0-9][0-9][0-9]*'
+             ORDER BY LENGTH(task_index) DESC, task_index DESC
+             LIMIT 1), 
+            0) + 1
+    )
+    WHERE id = NEW.id;
+END;
+
+-- Data generations: a per-table counter bumped by every write that
+-- changes the table, so caches of derived data (dashboard metrics) can be
+-- keyed on it. it_domain_projects is only written by the app, whose IT
+-- writer bumps it once per write job.
+CREATE TABLE IF NOT EXISTS data_generation (
+    table_name VARCHAR(50) PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO data_generation (table_name, generation) VALUES ('it_domain_projects', 0);
+
+-- Per-row triggers used to bump it, which slowed bulk writes
+DROP TRIGGER IF EXISTS bump_generation_it_projects_insert;
+DROP TRIGGER IF EXISTS bump_generation_it_projects_update;
+DROP TRIGGER IF EXISTS bump_generation_it_projects_delete;
@@ -1,8 +1,10 @@
 -- NX Domain Database Schema - Production Architecture (nx_domain.db)
 -- Complete schema for all 33 fields (17 IT + 16 NX) with external MySQL integration design
 
--- Enable foreign key support
-PRAGMA foreign_keys = ON;
+-- Foreign keys stay unenforced, as on every connection the app opens:
+-- nx_regression_data references imported_it_data(project_name), which
+-- isn't unique, so enforcing it only made creating this database fail
+-- with "foreign key mismatch".
 
 -- Imported IT data table (from IT Domain CSV) - All 17 IT fields
 CREATE TABLE imported_it_data (
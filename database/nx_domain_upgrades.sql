@@ -0,0 +1,99 @@
+-- NX Domain Database Upgrades (nx_domain.db)
+-- Idempotent statements applied on every startup after nx_domain_schema.sql,
+-- so existing databases pick up new tables, indexes, views and triggers
+
+-- Normalized personnel assignments of the imported IT projects, rebuilt by
+-- utils/database.py on every import
+CREATE TABLE IF NOT EXISTS imported_assignments (
+    project_name VARCHAR(100) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    person VARCHAR(100) NOT NULL,
+    
+    PRIMARY KEY (project_name, role, person)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_imported_assignments_person ON imported_assignments(person, role);
+
+-- Per-engineer coverage: assignments joined to imported projects and NX data
+CREATE VIEW IF NOT EXISTS engineer_coverage_view AS
+SELECT 
+    a.person,
+    a.role,
+    a.project_name,
+    it.task_index,
+    it.business_unit,
+    nx.line_coverage,
+    nx.fsm_coverage,
+    nx.interface_toggle_coverage,
+    nx.toggle_coverage,
+    nx.to_date
+FROM imported_assignments a
+JOIN imported_it_data it ON it.project_name = a.project_name
+LEFT JOIN nx_regression_data nx ON nx.project_name = a.project_name;
+
+-- IP lineage closure of the imported IT data, including a (ip, ip) row for
+-- every imported IP. Rebuilt by utils/database.py on every import.
+CREATE TABLE IF NOT EXISTS imported_ip_lineage (
+    ancestor VARCHAR(100) NOT NULL,
+    descendant VARCHAR(100) NOT NULL,
+    
+    PRIMARY KEY (ancestor, descendant)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_imported_ip_lineage_descendant ON imported_ip_lineage(descendant, ancestor);
+
+-- Coverage of every project along each IP's lineage
+CREATE VIEW IF NOT EXISTS ip_lineage_coverage_view AS
+SELECT 
+    l.ancestor,
+    l.descendant,
+    it.project_name,
+    it.task_index,
+    nx.line_coverage,
+    nx.fsm_coverage,
+    nx.interface_toggle_coverage,
+    nx.toggle_coverage,
+    nx.to_date
+FROM imported_ip_lineage l
+JOIN imported_it_data it ON TRIM(it.ip) = l.descendant
+LEFT JOIN nx_regression_data nx ON nx.project_name = it.project_name;
+
+CREATE INDEX IF NOT EXISTS idx_imported_business_unit ON imported_it_data(business_unit);
+
+-- Data generations: a per-table counter bumped by every write that
+-- changes the table, so caches of derived data (dashboard metrics) can be
+-- keyed on it. Tables only the app writes are bumped by its database
+-- writers, once per write job; tables filled from outside the app keep
+-- per-row triggers so those writes are seen too.
+CREATE TABLE IF NOT EXISTS data_generation (
+    table_name VARCHAR(50) PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO data_generation (table_name, generation) VALUES ('imported_it_data', 0);
+INSERT OR IGNORE INTO data_generation (table_name, generation) VALUES ('nx_regression_data', 0);
+
+-- imported_it_data is only written by the NX writer; per-row triggers
+-- slowed its bulk imports
+DROP TRIGGER IF EXISTS bump_generation_imported_insert;
+DROP TRIGGER IF EXISTS bump_generation_imported_update;
+DROP TRIGGER IF EXISTS bump_generation_imported_delete;
+
+-- nx_regression_data is filled by the external regression collectors
+CREATE TRIGGER IF NOT EXISTS bump_generation_nx_regression_insert
+AFTER INSERT ON nx_regression_data
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'nx_regression_data';
+END;
+
+CREATE TRIGGER IF NOT EXISTS bump_generation_nx_regression_update
+AFTER UPDATE ON nx_regression_data
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'nx_regression_data';
+END;
+
+CREATE TRIGGER IF NOT EXISTS bump_generation_nx_regression_delete
+AFTER DELETE ON nx_regression_data
+BEGIN
+    UPDATE data_generation SET generation = generation + 1 WHERE table_name = 'nx_regression_data';
+END;
@@ -17,15 +17,39 @@ from utils.database import (
     add_it_project_complete,
     add_it_project_minimal,
     get_it_projects_complete,
-    get_it_projects_minimal,
     get_it_export_data_minimal,
-    delete_it_project,
     validate_project_data_complete,
-    validate_project_data_minimal
+    validate_project_data_minimal,
+    validate_projects_frame,
+    get_table_schema,
+    get_engineer_workload,
+    get_projects_for_engineer,
+    get_ip_ancestors,
+    get_ip_lineage_projects,
+    would_create_ip_cycle,
+    get_it_project_names,
+    get_data_generation,
+    preview_project_merge,
+    apply_project_merge,
+    update_it_projects_bulk,
+    get_it_projects_by_ids,
+    delete_it_projects,
+    search_it_projects,
+    count_it_projects,
+    get_it_stats,
+    compact_dataframe,
+    ASSIGNMENT_ROLES,
+    IT_PROJECT_FIELDS,
+    MERGE_STRATEGIES
 )
 from utils.excel_handler import ExcelHandler
 from utils.json_manager import JSONManager
 from utils.data_converter import DataConverter
+from utils.duplicate_detector import DuplicateDetector
+from utils.parallel_import import ParallelImporter
+from utils.live_updates import watch_data_changes
+from utils.paged_table import display_paged_table
+from utils.memory_budget import memory_budget, current_session_id, MemoryBudgetError, ServerBusyError
 
 # Page configuration
 st.set_page_config(
@@ -34,6 +58,136 @@ st.set_page_config(
     layout="wide"
 )
 
+# Number of JSON files listed per page in the import tab
+JSON_FILES_PER_PAGE = 20
+
+# Columns shown in the minimal view, and columns that can't be edited inline
+MINIMAL_VIEW_COLUMNS = ['id', 'task_index', 'project_name', 'dv_engineer', 'business_unit', 'ip', 'spip_url', 'created_at']
+READ_ONLY_COLUMNS = ['id', 'task_index', 'created_at', 'updated_at']
+
+# Projects listed per page in the delete picker
+DELETE_PICKER_PAGE_SIZE = 50
+
+def has_pending_edits() -> bool:
+    """Whether the project editor holds edits that aren't saved yet."""
+    editor_key = f"it_projects_editor_{st.session_state.get('it_editor_version', 0)}"
+    return bool(st.session_state.get(editor_key, {}).get('edited_rows'))
+
+
+def load_project_table() -> pd.DataFrame:
+    """Get the complete project table, reusing the copy kept in the session.
+    
+    The copy is held in the session's memory budget and reloaded when it was
+    evicted, or when the IT data changed since it was loaded, e.g. through
+    another session or another app replica, unless the editor has unsaved
+    edits made against it.
+    """
+    session_id = current_session_id()
+    projects_df = memory_budget.get(session_id, 'it_projects')
+    generation = get_data_generation('it')
+    if (projects_df is None
+            or (st.session_state.get('it_projects_generation') != generation
+                and not has_pending_edits())):
+        projects_df = memory_budget.hold(session_id, 'it_projects', get_it_projects_complete())
+        st.session_state.it_projects_generation = generation
+    return projects_df
+
+
+def invalidate_project_table(project_ids: list = None):
+    """Refresh the session copy of the project table.
+    
+    Args:
+        project_ids: Refetch only these rows, or None to drop the whole copy
+    """
+    session_id = current_session_id()
+    projects_df = memory_budget.get(session_id, 'it_projects')
+    if project_ids is None or projects_df is None or projects_df.empty:
+        memory_budget.release(session_id, 'it_projects')
+        return
+    
+    fresh_rows = get_it_projects_by_ids(project_ids)
+    kept_rows = projects_df[~projects_df['id'].isin(project_ids)]
+    # Categoricals with differing categories concatenate as plain text; re-compact
+    memory_budget.hold(session_id, 'it_projects', compact_dataframe(
+        pd.concat([kept_rows, fresh_rows]).sort_values('task_index', ignore_index=True)
+    ))
+    # The refetched rows cover this session's own write
+    st.session_state.it_projects_generation = get_data_generation('it')
+
+
+def display_project_editor(projects_df: pd.DataFrame):
+    """Display the project table as an editor and save only the changed cells."""
+    version = st.session_state.setdefault('it_editor_version', 0)
+    editor_key = f"it_projects_editor_{version}"
+    # Personnel stay free text in the editor; categoricals would only offer known names.
+    # Object, not str: pandas 2 turns missing values into the text "nan" under astype(str)
+    personnel = {role: object for role in ASSIGNMENT_ROLES if role in projects_df.columns}
+    # Edits are kept by row position, so remember which rows the editor showed
+    # when editing began; the session copy may be reloaded in between
+    frame_key = f"{editor_key}_frame"
+    frame = (st.session_state.get('it_projects_generation'), projects_df['id'].tolist())
+    if not has_pending_edits() or frame_key not in st.session_state:
+        st.session_state[frame_key] = frame
+    drawn_generation, drawn_ids = st.session_state[frame_key]
+    st.data_editor(
+        projects_df.astype(personnel),
+        use_container_width=True,
+        height=400,
+        hide_index=True,
+        disabled=[col for col in READ_ONLY_COLUMNS if col in projects_df.columns],
+        key=editor_key
+    )
+    
+    edited_rows = st.session_state.get(editor_key, {}).get('edited_rows', {})
+    if edited_rows and frame != (drawn_generation, drawn_ids):
+        st.warning("The project table was reloaded while you were editing, "
+                   "so your edits may no longer line up with their rows.")
+        if st.button("Discard Edits"):
+            st.session_state.pop(frame_key, None)
+            st.session_state.it_editor_version = version + 1
+            st.rerun()
+        return
+    
+    drawn_df = projects_df.set_index('id', drop=False)
+    changes = {}
+    for position, cells in edited_rows.items():
+        original = drawn_df.loc[drawn_ids[int(position)]]
+        changed = {}
+        for col, value in cells.items():
+            if pd.isna(original[col]):
+                if value not in (None, ''):
+                    changed[col] = value
+            elif value != original[col]:
+                changed[col] = value
+        if changed:
+            changes[int(original['id'])] = changed
+    
+    if not changes:
+        return
+    
+    st.info(f"{len(changes)} projects edited.")
+    if st.button("💾 Save Changes", type="primary"):
+        # Validate the edited rows as they would be stored
+        edited_df = projects_df.set_index('id').loc[list(changes)].astype(object)
+        for project_id, cells in changes.items():
+            for col, value in cells.items():
+                edited_df.at[project_id, col] = value
+        invalid_rows = validate_projects_frame(edited_df.reset_index())
+        if not invalid_rows.empty:
+            for row_errors in invalid_rows['errors']:
+                for error in row_errors:
+                    st.error(error)
+            return
+        
+        if update_it_projects_bulk(changes):
+            invalidate_project_table(list(changes))
+            st.session_state.pop(frame_key, None)
+            st.session_state.it_editor_version = version + 1
+            st.rerun()
+        else:
+            st.error("Failed to save changes. Project names must be unique and IP lineage acyclic.")
+
+
 def display_project_table():
     """Display all projects with option to view complete or minimal fields."""
     st.subheader("📋 Current Projects")
@@ -46,46 +200,117 @@ def display_project_table():
     )
     
     # Get projects data based on view mode
-    if "Complete" in view_mode:
-        projects_df = get_it_projects_complete()
-    else:
-        projects_df = get_it_projects_minimal()
+    projects_df = load_project_table()
+    if "Complete" not in view_mode and not projects_df.empty:
+        projects_df = projects_df[[col for col in MINIMAL_VIEW_COLUMNS if col in projects_df.columns]]
     
     if projects_df.empty:
         st.info("No projects found. Add a project to get started.")
         return
     
     # Show basic stats
+    stats = get_it_stats()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Projects", len(projects_df))
+        st.metric("Total Projects", stats['total_projects'])
     with col2:
-        cn_count = len(projects_df[projects_df['business_unit'] == 'CN']) if 'business_unit' in projects_df.columns else 0
-        st.metric("CN Projects", cn_count)
+        st.metric("CN Projects", stats['cn_projects'])
     with col3:
-        pc_count = len(projects_df[projects_df['business_unit'] == 'PC']) if 'business_unit' in projects_df.columns else 0
-        st.metric("PC Projects", pc_count)
+        st.metric("PC Projects", stats['pc_projects'])
     with col4:
-        reuse_count = len(projects_df[projects_df.get('reuse_ip', '') == 'Y']) if 'reuse_ip' in projects_df.columns else 0
-        st.metric("Reused IPs", reuse_count)
+        st.metric("Reused IPs", stats['reused_ips'])
+    
+    # Display table; edits are written back in one batch
+    display_project_editor(projects_df)
     
-    # Display table
-    st.dataframe(projects_df, use_container_width=True, height=400)
+    display_engineer_workload()
+    display_ip_lineage(projects_df)
     
     # Delete functionality
     if not projects_df.empty:
-        st.subheader("🗑️ Delete Project")
-        project_options = {f"{row['project_name']} ({row['task_index']})": row['id'] 
-                          for _, row in projects_df.iterrows()}
+        display_delete_projects()
+
+
+def display_delete_projects():
+    """Display a searchable, paginated picker that deletes the selected projects in one batch."""
+    st.subheader("🗑️ Delete Projects")
+    
+    # Selections persist across searches and pages as {id: label}
+    selected = st.session_state.setdefault('it_delete_selected', {})
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        prefix = st.text_input("Search by project name prefix:", key="it_delete_prefix").strip()
+    total = count_it_projects(prefix)
+    total_pages = max((total - 1) // DELETE_PICKER_PAGE_SIZE + 1, 1)
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, value=1,
+                               key=f"it_delete_page_{prefix}")
+    
+    page_df = search_it_projects(prefix, DELETE_PICKER_PAGE_SIZE, (page - 1) * DELETE_PICKER_PAGE_SIZE)
+    labels = dict(selected)
+    labels.update({
+        int(project_id): f"{name} ({task_index})"
+        for project_id, task_index, name in page_df[['id', 'task_index', 'project_name']].itertuples(index=False)
+    })
+    
+    st.caption(f"{total} matching projects, page {page} of {total_pages}")
+    picked = st.multiselect(
+        "Select projects to delete:",
+        options=list(labels),
+        default=list(selected),
+        format_func=labels.get,
+        key=f"it_delete_pick_{prefix}_{page}"
+    )
+    st.session_state.it_delete_selected = {project_id: labels[project_id] for project_id in picked}
+    
+    if picked and st.button(f"Delete {len(picked)} Selected Projects", type="secondary"):
+        if delete_it_projects(picked):
+            st.session_state.it_delete_selected = {}
+            invalidate_project_table()
+            st.success(f"Deleted {len(picked)} projects")
+            st.rerun()
+        else:
+            st.error("Failed to delete projects")
+
+
+def display_engineer_workload():
+    """Display project counts per engineer from the normalized assignments."""
+    with st.expander("👥 Engineer Workload"):
+        role = st.selectbox("Role:", ["All"] + ASSIGNMENT_ROLES, key="workload_role")
+        workload_df = get_engineer_workload(None if role == "All" else role)
         
-        selected_project = st.selectbox("Select project to delete:", [""] + list(project_options.keys()))
+        if workload_df.empty:
+            st.info("No engineer assignments found.")
+            return
         
-        if selected_project and st.button("Delete Selected Project", type="secondary"):
-            if delete_it_project(project_options[selected_project]):
-                st.success(f"Deleted project: {selected_project}")
-                st.rerun()
-            else:
-                st.error("Failed to delete project")
+        st.dataframe(workload_df, use_container_width=True, hide_index=True)
+        
+        person = st.selectbox("Show projects for:", [""] + sorted(workload_df['person'].unique()),
+                              key="workload_person")
+        if person:
+            st.dataframe(
+                get_projects_for_engineer(person, None if role == "All" else role),
+                use_container_width=True, hide_index=True
+            )
+
+
+def display_ip_lineage(projects_df: pd.DataFrame):
+    """Display the inheritance lineage of a selected IP."""
+    with st.expander("🧬 IP Lineage"):
+        if 'ip' not in projects_df.columns:
+            st.info("Switch to the complete view to browse IP lineage.")
+            return
+        
+        ips = sorted(ip for ip in projects_df['ip'].dropna().astype(str).str.strip().unique() if ip)
+        selected_ip = st.selectbox("IP:", [""] + ips, key="lineage_ip")
+        if not selected_ip:
+            return
+        
+        ancestors = get_ip_ancestors(selected_ip)
+        st.write(f"**Inherits from:** {', '.join(ancestors) if ancestors else 'None'}")
+        st.write("**Projects on this IP and its derivatives:**")
+        st.dataframe(get_ip_lineage_projects(selected_ip), use_container_width=True, hide_index=True)
 
 
 def display_add_project():
@@ -224,6 +449,9 @@ def display_add_project():
             
             # Validate data
             errors = validate_project_data_complete(project_data)
+            if would_create_ip_cycle(project_data['ip'], project_data['inherit_from_ip']):
+                errors.append(f"IP '{project_data['ip']}' cannot inherit from its own descendant "
+                              f"'{project_data['inherit_from_ip']}'")
             
             if errors:
                 for error in errors:
@@ -231,12 +459,87 @@ def display_add_project():
             else:
                 # Add project
                 if add_it_project_complete(project_data):
+                    invalidate_project_table()
                     st.success(f"Successfully added project: {project_name}")
                     st.rerun()
                 else:
                     st.error("Failed to add project. Project name might already exist.")
 
 
+def display_multi_file_import():
+    """Parse several files in parallel and merge them into IT projects in one transaction."""
+    st.write("Columns must be named like the IT Domain fields (as in an IT Domain export).")
+    
+    uploaded_files = st.file_uploader(
+        "Choose CSV or Excel files",
+        type=['csv', 'xlsx', 'xls', 'xlsm'],
+        accept_multiple_files=True,
+        key="it_multi_upload"
+    )
+    if not uploaded_files:
+        return
+    
+    all_sheets = st.checkbox("Import all sheets of each workbook", value=False, key="it_multi_all_sheets")
+    merge_strategy = st.selectbox(
+        "Merge Strategy:",
+        MERGE_STRATEGIES,
+        help="How to handle existing records",
+        key="it_multi_strategy"
+    )
+    
+    if st.button("Import Files", type="primary"):
+        try:
+            # Only a few parses run at once across all sessions; wait for a slot
+            with memory_budget.heavy_work("IT multi-file import", current_session_id()):
+                import_uploaded_files(uploaded_files, all_sheets, merge_strategy)
+        except ServerBusyError as e:
+            st.error(str(e))
+
+
+def import_uploaded_files(uploaded_files: list, all_sheets: bool, merge_strategy: str):
+    """Parse uploaded files in parallel and merge them into IT projects."""
+    progress = st.progress(0.0, text="Parsing files...")
+    files = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+    
+    # Parse stage: one worker process per file
+    results = []
+    parsed_files = set()
+    for result in ParallelImporter().parse_files(files, get_table_schema('it_domain_projects'), all_sheets):
+        results.append(result)
+        parsed_files.add(result['file'])
+        progress.progress(len(parsed_files) / len(files),
+                          text=f"Parsed {len(parsed_files)} of {len(files)} files")
+    
+    report = ParallelImporter.report(results)
+    st.dataframe(report, use_container_width=True, hide_index=True)
+    if (report['status'] == "Error").any():
+        st.error("Some files could not be parsed. Fix or remove them and import again.")
+        return
+    
+    frames = [ParallelImporter.to_frame(result) for result in results]
+    combined = pd.concat(frames, ignore_index=True).astype(object)
+    if 'project_name' not in combined.columns:
+        st.error("No project_name column found in the uploaded files.")
+        return
+    combined = combined[[col for col in IT_PROJECT_FIELDS if col in combined.columns]]
+    
+    # Load stage: validate, then a single merge transaction
+    invalid_rows = validate_projects_frame(combined)
+    valid_df = combined.drop(index=invalid_rows.index)
+    success, counts = apply_project_merge(valid_df, merge_strategy)
+    invalidate_project_table()
+    
+    if success:
+        st.success(
+            f"Import completed! {counts['inserted']} added, {counts['updated']} updated, "
+            f"{counts['deleted']} deleted, {counts['unchanged']} unchanged, {counts['skipped']} skipped."
+        )
+    else:
+        st.error("Import failed. No changes were written.")
+    if not invalid_rows.empty:
+        st.warning(f"{len(invalid_rows)} projects failed validation and were skipped.")
+
+
 def display_import():
     """Display import functionality for Excel and JSON files."""
     st.subheader("📥 Import Data")
@@ -244,7 +547,7 @@ def display_import():
     # Import type selection
     import_type = st.radio(
         "Select import type:",
-        ["Excel File", "JSON File"],
+        ["Excel File", "Multiple Files", "JSON File"],
         horizontal=True
     )
     
@@ -253,7 +556,10 @@ def display_import():
     json_manager = JSONManager()
     data_converter = DataConverter()
     
-    if import_type == "Excel File":
+    if import_type == "Multiple Files":
+        display_multi_file_import()
+    
+    elif import_type == "Excel File":
         uploaded_file = st.file_uploader(
             "Choose an Excel file",
             type=['xlsx', 'xls', 'xlsm'],
@@ -261,22 +567,28 @@ def display_import():
         )
         
         if uploaded_file is not None:
-            # Save temporary file
-            temp_path = excel_handler.save_temp_file(uploaded_file, uploaded_file.name)
+            # Parse the upload from memory; nothing is written to disk
+            upload = excel_handler.open_upload(uploaded_file)
             
             # Validate file
-            is_valid, message = excel_handler.validate_excel_file(temp_path)
+            is_valid, message = excel_handler.validate_excel_file(upload)
             if not is_valid:
                 st.error(f"Invalid file: {message}")
                 return
             
             # Get sheet names
             try:
-                sheet_names = excel_handler.get_sheet_names(temp_path)
+                sheet_names = excel_handler.get_sheet_names(upload)
                 selected_sheet = st.selectbox("Select sheet:", sheet_names)
                 
-                # Read data
-                df = excel_handler.read_excel_data(temp_path, selected_sheet)
+                # Read data; the parsed sheet is held in the session's memory budget
+                df = memory_budget.get_or_load(
+                    current_session_id(), 'it_excel_upload', (upload.content_hash, selected_sheet),
+                    lambda: excel_handler.read_excel_data(
+                        upload, selected_sheet, get_table_schema('it_domain_projects'), cache=False
+                    ),
+                    heavy="IT Excel parse"
+                )
                 
                 # Show preview
                 st.write(f"Found {len(df)} records in the file")
@@ -310,6 +622,19 @@ def display_import():
                         if mapped_col:
                             column_mapping[field] = mapped_col
                 
+                # Flag likely duplicates before anything is written
+                if column_mapping.get('project_name'):
+                    names_df = pd.DataFrame(
+                        {field: df[column_mapping[field]] for field in DuplicateDetector.NAME_FIELDS
+                         if column_mapping.get(field)}
+                    )
+                    existing_names = get_it_project_names().set_index('id')
+                    duplicates = DuplicateDetector().find_duplicates(names_df, existing_names)
+                    if not duplicates.empty:
+                        st.warning(f"Found {len(duplicates)} likely duplicate names in this file.")
+                        with st.expander("View Likely Duplicates"):
+                            st.dataframe(duplicates, use_container_width=True, hide_index=True)
+                
                 # Import options
                 st.subheader("Import Options")
                 merge_strategy = st.selectbox(
@@ -329,85 +654,103 @@ def display_import():
                     help="Save imported data as JSON file for backup"
                 )
                 
+                # Map columns
+                mapped_df = pd.DataFrame(
+                    {field: df[excel_col] for field, excel_col in column_mapping.items()}
+                )
+                
+                # Split DV engineers if requested
+                if split_dv_engineers and 'dv_engineer' in column_mapping:
+                    mapped_df = excel_handler.split_comma_separated_values(
+                        mapped_df, 'dv_engineer'
+                    )
+                
+                # Validate required fields
+                if 'project_name' not in column_mapping or not column_mapping['project_name']:
+                    st.warning("Map the project_name field to preview the import.")
+                    return
+                
+                # Validate all rows column-wise so only known-good rows reach SQLite
+                invalid_rows = validate_projects_frame(mapped_df)
+                valid_df = mapped_df.drop(index=invalid_rows.index)
+                
+                # Show what the selected strategy would change
+                st.subheader("Merge Preview")
+                merge_diff = preview_project_merge(valid_df)
+                updates = merge_strategy != "Add New Only"
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("New", len(merge_diff['insert']))
+                with col2:
+                    st.metric("Updated", len(merge_diff['update']) if updates else 0)
+                with col3:
+                    st.metric("Unchanged", len(merge_diff['unchanged']))
+                with col4:
+                    st.metric("Deleted", len(merge_diff['delete']) if merge_strategy == "Replace All" else 0)
+                if not updates and not merge_diff['update'].empty:
+                    st.caption(f"{len(merge_diff['update'])} changed projects are skipped; "
+                               f"Add New Only keeps stored projects as they are.")
+                
+                for label, key in [("New Projects", 'insert'), ("Changed Projects", 'update'),
+                                   ("Projects Not in File", 'delete')]:
+                    if not merge_diff[key].empty:
+                        with st.expander(f"{label} ({len(merge_diff[key])})"):
+                            st.dataframe(merge_diff[key], use_container_width=True, hide_index=True)
+                
+                if not invalid_rows.empty:
+                    st.warning(f"{len(invalid_rows)} rows fail validation and will be skipped.")
+                
                 # Import button
                 if st.button("Import Data", type="primary"):
                     try:
-                        # Map columns
-                        mapped_df = pd.DataFrame()
-                        for field, excel_col in column_mapping.items():
-                            if excel_col:
-                                mapped_df[field] = df[excel_col]
-                            else:
-                                mapped_df[field] = ''
-                        
-                        # Split DV engineers if requested
-                        if split_dv_engineers and 'dv_engineer' in column_mapping:
-                            mapped_df = excel_handler.split_comma_separated_values(
-                                mapped_df, 'dv_engineer'
-                            )
-                        
-                        # Validate required fields
-                        if 'project_name' not in column_mapping or not column_mapping['project_name']:
-                            st.error("Project name mapping is required!")
-                            return
-                        
                         # Save to JSON if requested
                         if save_to_json:
                             json_filename = f"it_import_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
                             data_converter.excel_to_json(mapped_df, json_filename)
                             st.info(f"Data saved to JSON: {json_filename}.json")
                         
-                        # Import to database
-                        success_count = 0
-                        error_count = 0
-                        errors = []
-                        
-                        for _, row in mapped_df.iterrows():
-                            project_data = row.to_dict()
-                            # Clean empty strings
-                            project_data = {k: v if v != '' else None for k, v in project_data.items()}
-                            
-                            # Validate
-                            validation_errors = validate_project_data_complete(project_data)
-                            if validation_errors:
-                                error_count += 1
-                                errors.extend(validation_errors)
-                                continue
-                            
-                            # Add to database
-                            if merge_strategy == "Replace All" and success_count == 0:
-                                # Clear existing data (implement this in database.py if needed)
-                                pass
-                            
-                            if add_it_project_complete(project_data):
-                                success_count += 1
-                            else:
-                                error_count += 1
-                                errors.append(f"Failed to add project: {project_data.get('project_name', 'Unknown')}")
+                        # Apply the merge in a single transaction
+                        success, counts = apply_project_merge(valid_df, merge_strategy)
+                        invalidate_project_table()
                         
                         # Show results
-                        st.success(f"Import completed! Successfully imported {success_count} projects.")
-                        if error_count > 0:
-                            st.warning(f"{error_count} projects failed to import.")
+                        if success:
+                            st.success(
+                                f"Import completed! {counts['inserted']} added, {counts['updated']} updated, "
+                                f"{counts['deleted']} deleted, {counts['unchanged']} unchanged, {counts['skipped']} skipped."
+                            )
+                        else:
+                            st.error("Import failed. No changes were written.")
+                        if not invalid_rows.empty:
+                            st.warning(f"{len(invalid_rows)} projects failed validation.")
                             with st.expander("View Errors"):
-                                for error in errors[:20]:  # Show first 20 errors
-                                    st.error(error)
-                        
-                        # Clean up temp file
-                        excel_handler.clean_temp_files(0)
-                        
+                                for row_errors in invalid_rows['errors'][:20]:  # Show first 20 rows
+                                    for error in row_errors:
+                                        st.error(error)
+                    
                     except Exception as e:
                         st.error(f"Import failed: {str(e)}")
             
+            except (MemoryBudgetError, ServerBusyError) as e:
+                st.error(str(e))
             except Exception as e:
                 st.error(f"Error reading file: {str(e)}")
     
     else:  # JSON File
-        # List available JSON files
-        json_files = json_manager.list_json_files()
+        # List available JSON files, one page at a time
+        total_files = json_manager.count_json_files()
         
-        if json_files:
-            st.write("Available JSON files:")
+        if total_files:
+            st.write(f"Available JSON files ({total_files}):")
+            
+            total_pages = (total_files - 1) // JSON_FILES_PER_PAGE + 1
+            page = 1
+            if total_pages > 1:
+                page = st.number_input("Page", min_value=1, max_value=total_pages, value=1,
+                                       key="it_json_page")
+            json_files = json_manager.list_json_files(
+                limit=JSON_FILES_PER_PAGE, offset=(page - 1) * JSON_FILES_PER_PAGE
+            )
             
             # Create selection table
             selected_file = None
@@ -428,15 +771,20 @@ def display_import():
                     # Load JSON data
                     df = data_converter.json_to_dataframe(selected_file)
                     
-                    # Import to database
+                    # Import only rows that pass validation
+                    invalid_rows = validate_projects_frame(df)
+                    valid_df = df.drop(index=invalid_rows.index)
+                    
                     success_count = 0
-                    for _, row in df.iterrows():
-                        project_data = row.to_dict()
+                    for project_data in valid_df.to_dict(orient='records'):
                         if add_it_project_complete(project_data):
                             success_count += 1
+                    invalidate_project_table()
                     
                     st.success(f"Successfully imported {success_count} projects from {selected_file}")
-                    
+                    if len(invalid_rows) > 0:
+                        st.warning(f"{len(invalid_rows)} projects failed validation and were skipped.")
+                
                 except Exception as e:
                     st.error(f"Import failed: {str(e)}")
         
@@ -444,6 +792,14 @@ def display_import():
             st.info("No JSON files found. Import an Excel file first to create JSON backups.")
 
 
+def to_excel_bytes(df: pd.DataFrame) -> bytes:
+    """Write a frame to an in-memory Excel workbook."""
+    from io import BytesIO
+    excel_buffer = BytesIO()
+    df.to_excel(excel_buffer, index=False, engine='openpyxl')
+    return excel_buffer.getvalue()
+
+
 def display_export():
     """Display export functionality."""
     st.subheader("📤 Export Data")
@@ -457,21 +813,22 @@ def display_export():
     # Show export preview
     st.write(f"Found {len(export_data)} projects to export")
     with st.expander("Preview Export Data"):
-        st.dataframe(export_data)
+        display_paged_table('export_view', key="it_export_table")
     
     # Export options
     st.subheader("Export Options")
     save_json_backup = st.checkbox("Save JSON backup", value=True, 
                                   help="Save a JSON backup in addition to downloading")
     
-    # Export buttons
+    # Export buttons; payloads are built on click, a few at a time across sessions
+    session_id = current_session_id()
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        csv_data = export_data.to_csv(index=False)
         st.download_button(
             label="📊 Download CSV",
-            data=csv_data,
+            data=memory_budget.deferred("IT CSV export", lambda: get_it_export_data_minimal().to_csv(index=False),
+                                        session_id),
             file_name=f"it_domain_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
             mime="text/csv"
         )
@@ -480,13 +837,10 @@ def display_export():
         # Excel export if openpyxl is available
         try:
             import openpyxl
-            from io import BytesIO
-            excel_buffer = BytesIO()
-            export_data.to_excel(excel_buffer, index=False, engine='openpyxl')
-            excel_buffer = excel_buffer.getvalue()
             st.download_button(
                 label="📈 Download Excel",
-                data=excel_buffer,
+                data=memory_budget.deferred("IT Excel export", lambda: to_excel_bytes(get_it_export_data_minimal()),
+                                            session_id),
                 file_name=f"it_domain_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
@@ -496,11 +850,13 @@ def display_export():
     with col3:
         # JSON export
         data_converter = DataConverter()
-        json_data = data_converter.excel_to_json(export_data)
-        json_str = json.dumps(json_data, indent=2, default=str)
         st.download_button(
             label="📋 Download JSON",
-            data=json_str,
+            data=memory_budget.deferred(
+                "IT JSON export",
+                lambda: json.dumps(data_converter.excel_to_json(get_it_export_data_minimal()), indent=2, default=str),
+                session_id
+            ),
             file_name=f"it_domain_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
             mime="application/json"
         )
@@ -528,6 +884,12 @@ def main():
             ["View Projects", "Add Project", "Import Data", "Export Data"],
             help="Choose what you want to do"
         )
+        
+        # Pick up changes from other sessions without reloading by hand
+        if mode in ("View Projects", "Export Data"):
+            st.markdown("---")
+            if st.toggle("Live updates", value=True, help="Refresh when projects change elsewhere"):
+                watch_data_changes('it', ('it_domain_projects',), key='it_projects', hold=has_pending_edits)
     
     # Main content based on mode
     if mode == "View Projects":
@@ -14,15 +14,26 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from utils.database import (
     import_it_data_to_nx_complete,
+    import_it_data_to_nx_chunked,
     import_it_data_to_nx_minimal,
     get_nx_imported_data,
     get_nx_to_summary,
     get_nx_coverage_analysis,
-    get_nx_stats
+    get_nx_stats,
+    get_to_summary_stats,
+    get_coverage_quality_counts,
+    get_table_schema,
+    get_engineer_coverage,
+    get_ip_lineage_coverage
 )
-from utils.excel_handler import ExcelHandler
+from utils.excel_handler import ExcelHandler, ExcelUpload
+from utils.csv_handler import CSVHandler
+from utils.parallel_import import ParallelImporter
 from utils.json_manager import JSONManager
 from utils.data_converter import DataConverter
+from utils.live_updates import watch_data_changes
+from utils.paged_table import display_paged_table
+from utils.memory_budget import memory_budget, current_session_id, MemoryBudgetError, ServerBusyError
 
 # Page configuration
 st.set_page_config(
@@ -31,6 +42,127 @@ st.set_page_config(
     layout="wide"
 )
 
+# Number of JSON files listed per page in the import tab
+JSON_FILES_PER_PAGE = 20
+
+# Tables each view reads, watched for live updates
+MODE_TABLES = {
+    "Summary": ('imported_it_data', 'nx_regression_data'),
+    "View IT Data": ('imported_it_data',),
+    "TO Summary (33 Fields)": ('imported_it_data', 'nx_regression_data'),
+    "Coverage Analysis": ('imported_it_data', 'nx_regression_data'),
+}
+
+# Coverage percentages are formatted by the table, keeping them numeric
+COVERAGE_COLUMN_CONFIG = {
+    col: st.column_config.NumberColumn(format="%.1f%%")
+    for col in ['line_coverage', 'fsm_coverage', 'interface_toggle_coverage', 'toggle_coverage', 'avg_coverage']
+}
+
+# Workbooks at least this large default to streaming import
+STREAMING_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+
+def display_streaming_excel_import(excel_handler: ExcelHandler, upload: ExcelUpload, sheet_name: str):
+    """Preview and import a large Excel sheet chunk by chunk."""
+    column_types = get_table_schema('imported_it_data')
+    estimated_rows = excel_handler.estimate_sheet_rows(upload, sheet_name)
+    preview = excel_handler.preview_excel_stream(upload, sheet_name, 20, column_types)
+    
+    row_note = f"~{estimated_rows} rows" if estimated_rows else "row count unknown"
+    st.success(f"✅ Excel file opened for streaming ({row_note})")
+    
+    # Preview comes from the first chunk only
+    with st.expander("Preview Excel Data (first rows)"):
+        st.dataframe(preview)
+    
+    st.write("**Available columns:**")
+    st.write("\n".join(f"• {col}" for col in preview.columns))
+    
+    st.info("JSON backup is not available for streamed imports.")
+    
+    if st.button("🔄 Import Data to NX Domain", type="primary"):
+        progress = st.progress(0.0, text="Importing data...")
+        
+        def tracked_chunks():
+            imported = 0
+            for chunk in excel_handler.iter_excel_chunks(upload, sheet_name,
+                                                         column_types=column_types):
+                imported += len(chunk)
+                if estimated_rows:
+                    progress.progress(min(imported / estimated_rows, 1.0),
+                                      text=f"Importing data... {imported} rows")
+                yield chunk
+        
+        try:
+            with memory_budget.heavy_work("NX streaming Excel import", current_session_id()):
+                success, row_count = import_it_data_to_nx_chunked(tracked_chunks())
+        except ServerBusyError as e:
+            st.error(f"❌ {e}")
+            return
+        if success:
+            st.success(f"✅ Successfully imported {row_count} projects to NX Domain")
+            st.rerun()
+        else:
+            st.error("❌ Failed to import data. Check that project_name column exists.")
+
+def display_multi_file_import():
+    """Parse several CSV/Excel exports in parallel and import them as one refresh."""
+    st.write("Upload CSV or Excel files exported from IT Domain:")
+    
+    uploaded_files = st.file_uploader(
+        "Choose files from IT Domain export",
+        type=['csv', 'xlsx', 'xls', 'xlsm'],
+        accept_multiple_files=True,
+        help="All files are combined and replace the imported IT data"
+    )
+    if not uploaded_files:
+        return
+    
+    all_sheets = st.checkbox("Import all sheets of each workbook", value=False)
+    st.write(f"{len(uploaded_files)} files selected")
+    
+    if st.button("🔄 Import Files to NX Domain", type="primary"):
+        try:
+            # Only a few parses run at once across all sessions; wait for a slot
+            with memory_budget.heavy_work("NX multi-file import", current_session_id()):
+                import_uploaded_files(uploaded_files, all_sheets)
+        except ServerBusyError as e:
+            st.error(f"❌ {e}")
+
+
+def import_uploaded_files(uploaded_files: list, all_sheets: bool):
+    """Parse uploaded files in parallel and import them as one refresh."""
+    progress = st.progress(0.0, text="Parsing files...")
+    column_types = get_table_schema('imported_it_data')
+    files = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+    
+    # Parse stage: one worker process per file
+    results = []
+    parsed_files = set()
+    for result in ParallelImporter().parse_files(files, column_types, all_sheets):
+        results.append(result)
+        parsed_files.add(result['file'])
+        progress.progress(len(parsed_files) / len(files),
+                          text=f"Parsed {len(parsed_files)} of {len(files)} files")
+    
+    report = ParallelImporter.report(results)
+    st.dataframe(report, use_container_width=True, hide_index=True)
+    if (report['status'] == "Error").any():
+        st.error("❌ Some files could not be parsed. Fix or remove them and import again.")
+        return
+    
+    # Load stage: a single writer replaces the imported data in one transaction
+    with st.spinner("Loading data..."):
+        success, row_count = import_it_data_to_nx_chunked(
+            ParallelImporter.to_frame(result) for result in results
+        )
+    if success:
+        st.success(f"✅ Successfully imported {row_count} projects from {len(files)} files to NX Domain")
+    else:
+        st.error("❌ Failed to import data. Check that project_name column exists.")
+
+
 def display_import_data():
     """Display CSV and Excel import functionality."""
     st.subheader("📥 Import IT Domain Data")
@@ -38,7 +170,7 @@ def display_import_data():
     # File type selection
     file_type = st.radio(
         "Select file type:",
-        ["CSV File", "Excel File", "JSON File"],
+        ["CSV File", "Excel File", "Multiple Files", "JSON File"],
         horizontal=True,
         help="Choose the type of file to import"
     )
@@ -59,36 +191,57 @@ def display_import_data():
         
         if uploaded_file is not None:
             try:
-                # Read CSV data
-                csv_data = pd.read_csv(uploaded_file)
+                # Profile the upload; cached by content hash across reruns
+                csv_handler = CSVHandler()
+                content = uploaded_file.getvalue()
+                column_types = get_table_schema('imported_it_data')
+                profile = csv_handler.profile_csv(content, column_types)
                 
-                st.success(f"✅ CSV file loaded successfully ({len(csv_data)} rows)")
+                row_note = f"~{profile['rows']}" if profile['sampled'] else f"{profile['rows']}"
+                st.success(f"✅ CSV file loaded successfully ({row_note} rows)")
                 
                 # Show preview
-                with st.expander("Preview CSV Data"):
-                    st.dataframe(csv_data)
+                with st.expander("Preview CSV Data (first rows)"):
+                    st.dataframe(profile['preview'])
                 
                 # Show column information
                 st.write("**Available columns:**")
-                cols_info = []
-                for col in csv_data.columns:
-                    non_empty = csv_data[col].notna().sum()
-                    cols_info.append(f"• {col} ({non_empty} non-empty values)")
-                st.write("\n".join(cols_info))
+                approx = "~" if profile['sampled'] else ""
+                st.write("\n".join(
+                    f"• {col} ({approx}{count} non-empty values)"
+                    for col, count in profile['non_empty'].items()
+                ))
                 
                 # Import button
                 if st.button("🔄 Import Data to NX Domain", type="primary"):
-                    with st.spinner("Importing data..."):
-                        if import_it_data_to_nx_complete(csv_data):
-                            st.success(f"✅ Successfully imported {len(csv_data)} projects to NX Domain")
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to import data. Check that project_name column exists.")
+                    progress = st.progress(0.0, text="Importing data...")
+                    
+                    def tracked_chunks():
+                        imported = 0
+                        for chunk in csv_handler.iter_csv_chunks(content, column_types):
+                            imported += len(chunk)
+                            if profile['rows']:
+                                progress.progress(min(imported / profile['rows'], 1.0),
+                                                  text=f"Importing data... {imported} rows")
+                            yield chunk
+                    
+                    with memory_budget.heavy_work("NX CSV import", current_session_id()):
+                        success, row_count = import_it_data_to_nx_chunked(tracked_chunks())
+                    if success:
+                        st.success(f"✅ Successfully imported {row_count} projects to NX Domain")
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to import data. Check that project_name column exists.")
             
+            except ServerBusyError as e:
+                st.error(f"❌ {e}")
             except Exception as e:
                 st.error(f"❌ Error reading CSV file: {str(e)}")
                 st.write("Please ensure the file is a valid CSV exported from IT Domain.")
     
+    elif file_type == "Multiple Files":
+        display_multi_file_import()
+    
     elif file_type == "Excel File":
         st.write("Upload Excel file exported from IT Domain:")
         
@@ -100,21 +253,39 @@ def display_import_data():
         
         if uploaded_file is not None:
             try:
-                # Save temporary file
-                temp_path = excel_handler.save_temp_file(uploaded_file, uploaded_file.name)
+                # Parse the upload from memory; nothing is written to disk
+                upload = excel_handler.open_upload(uploaded_file)
                 
                 # Validate file
-                is_valid, message = excel_handler.validate_excel_file(temp_path)
+                is_valid, message = excel_handler.validate_excel_file(upload)
                 if not is_valid:
                     st.error(f"Invalid file: {message}")
                     return
                 
                 # Get sheet names
-                sheet_names = excel_handler.get_sheet_names(temp_path)
+                sheet_names = excel_handler.get_sheet_names(upload)
                 selected_sheet = st.selectbox("Select sheet:", sheet_names)
                 
-                # Read data
-                excel_data = excel_handler.read_excel_data(temp_path, selected_sheet)
+                # Stream very large workbooks instead of loading the whole sheet
+                file_ext = Path(uploaded_file.name).suffix.lower()
+                if file_ext in ExcelHandler.STREAMING_EXTENSIONS:
+                    stream_workbook = st.checkbox(
+                        "Stream large workbook (read-only, chunked)",
+                        value=uploaded_file.size >= STREAMING_THRESHOLD_BYTES,
+                        help="Reads the sheet in chunks to keep memory low; the preview shows the first rows only"
+                    )
+                    if stream_workbook:
+                        display_streaming_excel_import(excel_handler, upload, selected_sheet)
+                        return
+                
+                # Read data; the parsed sheet is held in the session's memory budget
+                excel_data = memory_budget.get_or_load(
+                    current_session_id(), 'nx_excel_upload', (upload.content_hash, selected_sheet),
+                    lambda: excel_handler.read_excel_data(
+                        upload, selected_sheet, get_table_schema('imported_it_data'), cache=False
+                    ),
+                    heavy="NX Excel parse"
+                )
                 
                 st.success(f"✅ Excel file loaded successfully ({len(excel_data)} rows)")
                 
@@ -153,10 +324,9 @@ def display_import_data():
                             st.rerun()
                         else:
                             st.error("❌ Failed to import data. Check that project_name column exists.")
-                        
-                        # Clean up temp file
-                        excel_handler.clean_temp_files(0)
             
+            except (MemoryBudgetError, ServerBusyError) as e:
+                st.error(f"❌ {e}")
             except Exception as e:
                 st.error(f"❌ Error reading Excel file: {str(e)}")
                 st.write("Please ensure the file is a valid Excel file exported from IT Domain.")
@@ -164,11 +334,20 @@ def display_import_data():
     else:  # JSON File
         st.write("Import from JSON backup files:")
         
-        # List available JSON files
-        json_files = json_manager.list_json_files()
+        # List available JSON files, one page at a time
+        total_files = json_manager.count_json_files()
         
-        if json_files:
-            st.write("Available JSON files:")
+        if total_files:
+            st.write(f"Available JSON files ({total_files}):")
+            
+            total_pages = (total_files - 1) // JSON_FILES_PER_PAGE + 1
+            page = 1
+            if total_pages > 1:
+                page = st.number_input("Page", min_value=1, max_value=total_pages, value=1,
+                                       key="nx_json_page")
+            json_files = json_manager.list_json_files(
+                limit=JSON_FILES_PER_PAGE, offset=(page - 1) * JSON_FILES_PER_PAGE
+            )
             
             # Create selection interface
             selected_file = None
@@ -207,43 +386,40 @@ def display_view_data():
     """Display imported data in simple table format."""
     st.subheader("📊 View Imported Data")
     
-    # Get imported data
-    imported_data = get_nx_imported_data()
+    # Counted in SQL; the table below fetches a page at a time
+    stats = get_to_summary_stats()
     
-    if imported_data.empty:
+    if not stats['total_projects']:
         st.info("No data imported yet. Import CSV data from IT Domain first.")
         return
     
     # Show basic stats
-    stats = get_nx_stats()
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Projects", stats.get('imported_projects', 0))
+        st.metric("Total Projects", stats['total_projects'])
     
     with col2:
-        if 'business_unit' in imported_data.columns:
-            cn_count = len(imported_data[imported_data['business_unit'] == 'CN'])
-            st.metric("CN Projects", cn_count)
+        st.metric("CN Projects", stats['cn_projects'])
     
     with col3:
-        if 'business_unit' in imported_data.columns:
-            pc_count = len(imported_data[imported_data['business_unit'] == 'PC'])
-            st.metric("PC Projects", pc_count)
+        st.metric("PC Projects", stats['pc_projects'])
     
-    # Display data table
-    st.dataframe(imported_data, use_container_width=True)
+    # Display data table, a page at a time
+    display_paged_table('imported_it_view', key="nx_imported_table")
     
     # Export functionality
     st.subheader("📤 Export Data")
     
+    # Payloads are built on click, a few at a time across sessions
+    session_id = current_session_id()
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        csv_data = imported_data.to_csv(index=False)
         st.download_button(
             label="📊 Download as CSV",
-            data=csv_data,
+            data=memory_budget.deferred("NX CSV export", lambda: get_nx_imported_data().to_csv(index=False),
+                                        session_id),
             file_name=f"nx_domain_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
             mime="text/csv"
         )
@@ -252,13 +428,10 @@ def display_view_data():
         # Excel export if available
         try:
             import openpyxl
-            from io import BytesIO
-            excel_buffer = BytesIO()
-            imported_data.to_excel(excel_buffer, index=False, engine='openpyxl')
-            excel_buffer = excel_buffer.getvalue()
             st.download_button(
                 label="📈 Download as Excel",
-                data=excel_buffer,
+                data=memory_budget.deferred("NX Excel export", lambda: to_excel_bytes(get_nx_imported_data()),
+                                            session_id),
                 file_name=f"nx_domain_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
@@ -269,52 +442,61 @@ def display_view_data():
         # JSON export
         import json
         data_converter = DataConverter()
-        json_data = data_converter.excel_to_json(imported_data)
-        json_str = json.dumps(json_data, indent=2, default=str)
         st.download_button(
             label="📋 Download as JSON",
-            data=json_str,
+            data=memory_budget.deferred(
+                "NX JSON export",
+                lambda: json.dumps(data_converter.excel_to_json(get_nx_imported_data()), indent=2, default=str),
+                session_id
+            ),
             file_name=f"nx_domain_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
             mime="application/json"
         )
 
 
+def to_excel_bytes(df: pd.DataFrame) -> bytes:
+    """Write a frame to an in-memory Excel workbook."""
+    from io import BytesIO
+    excel_buffer = BytesIO()
+    df.to_excel(excel_buffer, index=False, engine='openpyxl')
+    return excel_buffer.getvalue()
+
+
 def display_to_summary():
     """Display complete TO Summary with all 33 fields."""
     st.subheader("📊 TO Summary Report (All 33 Fields)")
     
-    to_summary = get_nx_to_summary()
+    stats = get_to_summary_stats()
     
-    if to_summary.empty:
+    if not stats['total_projects']:
         st.info("No TO Summary data available. Import IT data and add NX regression data first.")
         return
     
     # Show summary statistics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Projects", len(to_summary))
+        st.metric("Total Projects", stats['total_projects'])
     with col2:
-        projects_with_nx = len(to_summary[to_summary['line_coverage'].notna()])
-        st.metric("With NX Data", projects_with_nx)
+        st.metric("With NX Data", stats['with_nx_data'])
     with col3:
-        avg_coverage = to_summary['line_coverage'].mean()
-        st.metric("Avg Line Coverage", f"{avg_coverage:.1f}%" if pd.notna(avg_coverage) else "N/A")
+        avg_coverage = stats['avg_line_coverage']
+        st.metric("Avg Line Coverage", f"{avg_coverage:.1f}%" if avg_coverage is not None else "N/A")
     with col4:
-        complete_projects = len(to_summary[to_summary['to_date'].notna()])
-        st.metric("TO Scheduled", complete_projects)
+        st.metric("TO Scheduled", stats['to_scheduled'])
     
-    # Display complete TO Summary table
-    st.dataframe(to_summary, use_container_width=True, height=400)
+    # Display complete TO Summary table, a page at a time
+    display_paged_table('to_summary_view', key="nx_to_summary_table", column_config=COVERAGE_COLUMN_CONFIG)
     
-    # Export TO Summary
+    # Export TO Summary; payloads are built on click
     st.subheader("📤 Export TO Summary")
+    session_id = current_session_id()
     col1, col2 = st.columns(2)
     
     with col1:
-        csv_data = to_summary.to_csv(index=False)
         st.download_button(
             label="📊 Download Complete TO Summary (CSV)",
-            data=csv_data,
+            data=memory_budget.deferred("TO Summary CSV export", lambda: get_nx_to_summary().to_csv(index=False),
+                                        session_id),
             file_name=f"to_summary_33_fields_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
             mime="text/csv"
         )
@@ -322,13 +504,10 @@ def display_to_summary():
     with col2:
         try:
             import openpyxl
-            from io import BytesIO
-            excel_buffer = BytesIO()
-            to_summary.to_excel(excel_buffer, index=False, engine='openpyxl')
-            excel_buffer = excel_buffer.getvalue()
             st.download_button(
                 label="📈 Download TO Summary (Excel)",
-                data=excel_buffer,
+                data=memory_budget.deferred("TO Summary Excel export", lambda: to_excel_bytes(get_nx_to_summary()),
+                                            session_id),
                 file_name=f"to_summary_33_fields_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
@@ -340,15 +519,14 @@ def display_coverage_analysis():
     """Display coverage analysis and quality assessment."""
     st.subheader("📈 Coverage Analysis & Quality Assessment")
     
-    coverage_data = get_nx_coverage_analysis()
+    quality_counts = get_coverage_quality_counts()
     
-    if coverage_data.empty:
+    if not quality_counts:
         st.info("No coverage data available. NX regression data needs to be collected first.")
         return
     
     # Coverage quality overview
     col1, col2, col3, col4 = st.columns(4)
-    quality_counts = coverage_data['coverage_quality'].value_counts()
     
     with col1:
         excellent = quality_counts.get('Excellent', 0)
@@ -366,19 +544,29 @@ def display_coverage_analysis():
     # Coverage details table
     st.subheader("Coverage Details by Project")
     
-    # Format coverage columns for better display
-    display_df = coverage_data.copy()
-    for col in ['line_coverage', 'fsm_coverage', 'interface_toggle_coverage', 'toggle_coverage', 'avg_coverage']:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "N/A")
-    
-    st.dataframe(display_df, use_container_width=True, height=400)
-    
-    # Export coverage analysis
-    csv_data = coverage_data.to_csv(index=False)
+    display_paged_table('coverage_analysis_view', key="nx_coverage_table", column_config=COVERAGE_COLUMN_CONFIG)
+    
+    # Coverage aggregated along engineer assignments
+    st.subheader("Coverage by Engineer")
+    engineer_df = get_engineer_coverage()
+    if engineer_df.empty:
+        st.info("No engineer assignments in the imported IT data.")
+    else:
+        st.dataframe(engineer_df, use_container_width=True, hide_index=True)
+    
+    # Coverage aggregated over each IP and its derivatives
+    st.subheader("Coverage by IP Lineage")
+    lineage_df = get_ip_lineage_coverage()
+    if lineage_df.empty:
+        st.info("No IP lineage in the imported IT data.")
+    else:
+        st.dataframe(lineage_df, use_container_width=True, hide_index=True)
+    
+    # Export coverage analysis, built on click
     st.download_button(
         label="📊 Download Coverage Analysis",
-        data=csv_data,
+        data=memory_budget.deferred("Coverage CSV export", lambda: get_nx_coverage_analysis().to_csv(index=False),
+                                    current_session_id()),
         file_name=f"coverage_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
         mime="text/csv"
     )
@@ -389,7 +577,7 @@ def display_summary():
     st.subheader("📋 Enhanced System Summary")
     
     stats = get_nx_stats()
-    imported_data = get_nx_imported_data()
+    summary_stats = get_to_summary_stats()
     
     # Enhanced statistics display
     col1, col2, col3, col4 = st.columns(4)
@@ -426,14 +614,13 @@ def display_summary():
     st.write(f"• **IT Domain Projects**: {stats.get('imported_projects', 0)} imported")
     st.write(f"• **NX Domain Projects**: {stats.get('nx_projects_with_data', 0)} with regression data")
     
-    if not imported_data.empty and 'import_date' in imported_data.columns:
-        st.write(f"• **Last Import**: {imported_data['import_date'].max()}")
+    if summary_stats['last_import'] is not None:
+        st.write(f"• **Last Import**: {summary_stats['last_import']}")
         
         # Business unit breakdown
-        if 'business_unit' in imported_data.columns:
-            bu_counts = imported_data['business_unit'].value_counts()
-            if len(bu_counts) > 0:
-                st.write("• **Business Units**: " + ", ".join([f"{bu}: {count}" for bu, count in bu_counts.items() if bu]))
+        bu_counts = summary_stats['business_units']
+        if bu_counts:
+            st.write("• **Business Units**: " + ", ".join([f"{bu}: {count}" for bu, count in bu_counts.items()]))
     
     if stats.get('nx_projects_with_data', 0) == 0:
         st.info("💡 Import IT data and add NX regression data to see full TO Summary capabilities.")
@@ -455,6 +642,12 @@ def main():
             help="Choose what you want to do"
         )
         
+        # Pick up changes from other sessions without reloading by hand
+        if mode in MODE_TABLES:
+            st.markdown("---")
+            if st.toggle("Live updates", value=True, help="Refresh when NX data changes elsewhere"):
+                watch_data_changes('nx', MODE_TABLES[mode], key=f"nx_{mode}")
+        
         # Production note
         st.markdown("---")
         st.info("**Production Note**: NX regression data will be auto-collected from external MySQL database populated by regression scripts.")
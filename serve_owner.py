@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Entrypoint of the database owner in a replicated deployment
+
+Streamlit only imports utils.database when a session runs a page, so on
+its own the owner would create the databases and accept routed writes only
+once a browser happened to reach it. This imports utils.database first,
+which creates and upgrades the databases and, with DV_DB_ROLE=owner,
+starts the write server, and then runs Streamlit in the same process, so
+the pages share that module and its write server.
+
+Usage: python serve_owner.py [streamlit run options]
+"""
+
+import sys
+
+from streamlit.web import cli
+
+import utils.database  # noqa: F401  (databases and write server come up on import)
+
+if __name__ == "__main__":
+    sys.argv = ["streamlit", "run", "app.py", *sys.argv[1:]]
+    sys.exit(cli.main())
@@ -60,6 +60,38 @@ try:
     else:
         print("❌ Invalid data detection failed")
     
+    # Test batch validation matches the per-row validator
+    from utils.database import validate_projects_frame
+    batch = [test_data, invalid_data, {'project_name': 'TEST002', 'business_unit': 'XX', 'wiki_url': 'wiki'}]
+    batch_errors = validate_projects_frame(pd.DataFrame(batch))
+    if all(validate_project_data_minimal(row) == batch_errors['errors'].get(i, [])
+           for i, row in enumerate(batch)):
+        print("✅ Batch validation parity test passed")
+    else:
+        print("❌ Batch validation parity failed")
+    
+    # Test writes from outside the app move the nx_regression_data generation
+    import sqlite3
+    from utils.database import get_table_generations
+    before = get_table_generations('nx', ('nx_regression_data',))
+    with sqlite3.connect(db_manager.nx_db_path) as conn:
+        conn.execute("INSERT INTO nx_regression_data (project_name) VALUES ('GENERATION_TEST')")
+        conn.execute("DELETE FROM nx_regression_data WHERE project_name = 'GENERATION_TEST'")
+    conn.close()
+    if get_table_generations('nx', ('nx_regression_data',)) != before:
+        print("✅ External write generation test passed")
+    else:
+        print("❌ External write to nx_regression_data left its generation unchanged")
+    
+    # Test duplicate detection treats differing numbers as different names
+    from utils.duplicate_detector import DuplicateDetector
+    duplicates = DuplicateDetector().find_duplicates(pd.DataFrame({'project_name': ['RLE1339']}),
+                                                     pd.DataFrame({'project_name': ['RLE1338', 'RLE-1339 ']}))
+    if duplicates['match_name'].tolist() == ['RLE-1339 ']:
+        print("✅ Duplicate detection test passed")
+    else:
+        print(f"❌ Duplicate detection failed: {duplicates['match_name'].tolist()}")
+    
     print("\n🎉 All tests passed! Minimal system is ready to use.")
     print("\n📋 System Summary:")
     print("   • 3 essential dependencies (streamlit, pandas, openpyxl)")
@@ -0,0 +1,263 @@
+import gzip
+import hashlib
+import json
+import os
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterator
+
+
+class BackupStore:
+    """Compressed, chunk-deduplicated snapshot store with a retention policy
+    
+    Each backup is a small manifest listing the SHA-256 digests of the chunks
+    that make up the original file. Chunks are stored gzip-compressed under
+    ``chunks/`` and shared between snapshots, so consecutive backups of a
+    mostly unchanged JSON file only add the chunks that actually changed.
+    """
+    
+    MANIFEST_SUFFIX = ".backup.json"
+    FORMAT_VERSION = 1
+    
+    # Chunk boundaries are content-defined on line granularity, which suits
+    # pretty-printed JSON: an inserted record shifts offsets but not lines.
+    CHUNK_BOUNDARY_MASK = 0x3F      # ~64 lines per chunk on average
+    MIN_CHUNK_BYTES = 1024
+    MAX_CHUNK_BYTES = 256 * 1024
+    
+    # Unreferenced chunks younger than this are left alone by garbage
+    # collection, since a concurrent create() may not have written its
+    # manifest yet.
+    GC_GRACE_SECONDS = 3600
+    
+    def __init__(self, backup_dir: str = "data/backups", keep_last: int = 10,
+                 keep_daily_days: int = 30):
+        """
+        Args:
+            backup_dir: Directory holding manifests and the chunk store
+            keep_last: Number of most recent backups kept per source file
+            keep_daily_days: Keep the newest backup of each day for this many days
+        """
+        self.backup_dir = backup_dir
+        self.chunk_dir = os.path.join(backup_dir, "chunks")
+        self.keep_last = keep_last
+        self.keep_daily_days = keep_daily_days
+        os.makedirs(self.chunk_dir, exist_ok=True)
+    
+    def _iter_chunks(self, data: bytes) -> Iterator[bytes]:
+        """Split data into content-defined chunks on line boundaries"""
+        chunk: List[bytes] = []
+        size = 0
+        for line in data.splitlines(keepends=True):
+            chunk.append(line)
+            size += len(line)
+            at_boundary = (zlib.crc32(line) & self.CHUNK_BOUNDARY_MASK) == 0
+            if (at_boundary and size >= self.MIN_CHUNK_BYTES) or size >= self.MAX_CHUNK_BYTES:
+                yield b"".join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield b"".join(chunk)
+    
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunk_dir, digest[:2], f"{digest}.gz")
+    
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        """Write data to path through a private temp file and os.replace
+        
+        Sessions are threads of one process, so the temp file name must be
+        unique per call, not per process.
+        """
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "xb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _write_chunk(self, digest: str, chunk: bytes) -> bool:
+        """Store a chunk unless it already exists; returns True if written"""
+        path = self._chunk_path(digest)
+        if os.path.exists(path):
+            # Refresh mtime so garbage collection treats it as in use
+            os.utime(path)
+            return False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._atomic_write(path, gzip.compress(chunk, compresslevel=6, mtime=0))
+        return True
+    
+    def _read_chunk(self, digest: str) -> bytes:
+        """Read a chunk and verify it against its digest"""
+        path = self._chunk_path(digest)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Backup chunk missing: {digest}")
+        with open(path, "rb") as f:
+            chunk = gzip.decompress(f.read())
+        if hashlib.sha256(chunk).hexdigest() != digest:
+            raise ValueError(f"Backup chunk failed checksum: {digest}")
+        return chunk
+    
+    def _manifest_path(self, backup_name: str) -> str:
+        if not backup_name.endswith(self.MANIFEST_SUFFIX):
+            backup_name += self.MANIFEST_SUFFIX
+        return os.path.join(self.backup_dir, backup_name)
+    
+    def load_manifest(self, backup_name: str) -> Dict[str, Any]:
+        """Load a backup manifest by name"""
+        manifest_path = self._manifest_path(backup_name)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"Backup not found: {backup_name}")
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def create(self, source_path: str) -> str:
+        """Snapshot a file into the store and apply the retention policy
+        
+        Returns:
+            Path of the new backup manifest
+        """
+        with open(source_path, "rb") as f:
+            data = f.read()
+        
+        digests = []
+        new_chunks = 0
+        for chunk in self._iter_chunks(data):
+            digest = hashlib.sha256(chunk).hexdigest()
+            if self._write_chunk(digest, chunk):
+                new_chunks += 1
+            digests.append(digest)
+        
+        source = os.path.basename(source_path)
+        created = datetime.now()
+        manifest = {
+            "format": self.FORMAT_VERSION,
+            "source": source,
+            "created": created.isoformat(),
+            "size": len(data),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "chunks": digests,
+            "new_chunks": new_chunks
+        }
+        
+        backup_name = f"{os.path.splitext(source)[0]}_{created.strftime('%Y%m%d_%H%M%S_%f')}"
+        manifest_path = self._manifest_path(backup_name)
+        self._atomic_write(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+        
+        self.prune(source)
+        return manifest_path
+    
+    def restore(self, backup_name: str, target_path: str) -> str:
+        """Reassemble a backup into target_path after verifying its checksums"""
+        manifest = self.load_manifest(backup_name)
+        
+        digest = hashlib.sha256()
+        # Unique per call: concurrent sessions may restore to the same target
+        tmp_path = f"{target_path}.{uuid.uuid4().hex}.restore"
+        try:
+            with open(tmp_path, "xb") as f:
+                for chunk_digest in manifest["chunks"]:
+                    chunk = self._read_chunk(chunk_digest)
+                    digest.update(chunk)
+                    f.write(chunk)
+            if digest.hexdigest() != manifest["sha256"]:
+                raise ValueError(f"Backup failed checksum: {backup_name}")
+            os.replace(tmp_path, target_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return target_path
+    
+    def verify(self, backup_name: str) -> bool:
+        """Check that every chunk of a backup is present and intact"""
+        manifest = self.load_manifest(backup_name)
+        digest = hashlib.sha256()
+        try:
+            for chunk_digest in manifest["chunks"]:
+                digest.update(self._read_chunk(chunk_digest))
+        except (FileNotFoundError, ValueError, OSError):
+            return False
+        return digest.hexdigest() == manifest["sha256"]
+    
+    def list_backups(self, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List backups, newest first, optionally for a single source file"""
+        backups = []
+        for filename in os.listdir(self.backup_dir):
+            if not filename.endswith(self.MANIFEST_SUFFIX):
+                continue
+            try:
+                manifest = self.load_manifest(filename)
+            except (OSError, ValueError):
+                continue
+            if source and manifest.get("source") != source:
+                continue
+            backups.append({
+                "backup_name": filename,
+                "source": manifest.get("source"),
+                "created": manifest.get("created"),
+                "size": manifest.get("size"),
+                "chunks": len(manifest.get("chunks", []))
+            })
+        return sorted(backups, key=lambda x: x["created"] or "", reverse=True)
+    
+    def prune(self, source: Optional[str] = None) -> int:
+        """Apply the retention policy and drop chunks no backup references
+        
+        Keeps the ``keep_last`` newest backups of each source file plus the
+        newest backup of each day within the last ``keep_daily_days`` days.
+        
+        Returns:
+            Number of backups removed
+        """
+        by_source = defaultdict(list)
+        for backup in self.list_backups(source):
+            by_source[backup["source"]].append(backup)
+        
+        daily_cutoff = (datetime.now() - timedelta(days=self.keep_daily_days)).date().isoformat()
+        removed = 0
+        for backups in by_source.values():
+            keep = {b["backup_name"] for b in backups[:self.keep_last]}
+            seen_days = set()
+            for backup in backups:
+                day = (backup["created"] or "")[:10]
+                if day >= daily_cutoff and day not in seen_days:
+                    seen_days.add(day)
+                    keep.add(backup["backup_name"])
+            for backup in backups:
+                if backup["backup_name"] not in keep:
+                    os.remove(self._manifest_path(backup["backup_name"]))
+                    removed += 1
+        
+        if removed:
+            self._collect_garbage()
+        return removed
+    
+    def _collect_garbage(self) -> int:
+        """Delete chunks that are not referenced by any manifest"""
+        referenced = set()
+        for filename in os.listdir(self.backup_dir):
+            if filename.endswith(self.MANIFEST_SUFFIX):
+                try:
+                    referenced.update(self.load_manifest(filename).get("chunks", []))
+                except (OSError, ValueError):
+                    # Keep everything if a manifest can't be read
+                    return 0
+        
+        grace_cutoff = datetime.now().timestamp() - self.GC_GRACE_SECONDS
+        deleted = 0
+        for prefix in os.listdir(self.chunk_dir):
+            prefix_dir = os.path.join(self.chunk_dir, prefix)
+            if not os.path.isdir(prefix_dir):
+                continue
+            for filename in os.listdir(prefix_dir):
+                if not filename.endswith(".gz") or filename[:-3] in referenced:
+                    continue
+                chunk_path = os.path.join(prefix_dir, filename)
+                if os.path.getmtime(chunk_path) < grace_cutoff:
+                    os.remove(chunk_path)
+                    deleted += 1
+        return deleted
@@ -0,0 +1,111 @@
+import pandas as pd
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Optional, Any, Iterator
+from .schema_converter import SchemaConverter
+
+
+class CSVHandler:
+    """Reads CSV uploads in chunks with schema-derived dtypes
+    
+    Profiles of uploads (row count, per-column non-empty counts and a
+    preview of the first rows) are cached by content hash, so Streamlit
+    reruns don't re-parse an unchanged file.
+    """
+    
+    DEFAULT_CHUNK_ROWS = 50000
+    PREVIEW_ROWS = 100
+    
+    # Files larger than this are profiled from their first rows instead of
+    # a full pass, with counts scaled to the file's line count
+    PROFILE_FULL_SCAN_BYTES = 100 * 1024 * 1024
+    PROFILE_SAMPLE_ROWS = 200000
+    
+    MAX_CACHED_PROFILES = 8
+    _profile_cache: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+    
+    def _read_options(self, column_types: Optional[Dict[str, str]]) -> Dict[str, Any]:
+        dtypes = SchemaConverter(column_types).read_dtypes() if column_types else None
+        return {"dtype": dtypes, "skipinitialspace": True}
+    
+    def iter_csv_chunks(self, content: bytes, column_types: Optional[Dict[str, str]] = None,
+                        chunk_size: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames of at most chunk_size rows from CSV content
+        
+        Args:
+            content: Raw CSV bytes
+            column_types: Target table schema; its columns are read with
+                matching dtypes instead of being inferred per chunk
+            chunk_size: Rows per chunk
+        """
+        try:
+            with pd.read_csv(BytesIO(content), chunksize=chunk_size,
+                             **self._read_options(column_types)) as reader:
+                for chunk in reader:
+                    chunk.columns = chunk.columns.str.strip()
+                    yield chunk
+        except Exception as e:
+            raise Exception(f"Error reading CSV file: {str(e)}")
+    
+    def profile_csv(self, content: bytes, column_types: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Profile CSV content in one chunked pass, cached by content hash
+        
+        Returns:
+            Dict with 'rows', 'columns', 'non_empty' (Series of non-empty
+            counts per column), 'preview' (first PREVIEW_ROWS rows) and
+            'sampled' (True if only the first PROFILE_SAMPLE_ROWS rows were
+            read and the counts are estimates)
+        """
+        cache_key = (
+            self.content_hash(content),
+            tuple(sorted(column_types.items())) if column_types else None
+        )
+        with self._cache_lock:
+            profile = self._profile_cache.get(cache_key)
+            if profile is not None:
+                self._profile_cache.move_to_end(cache_key)
+                return profile
+        
+        sampled = len(content) > self.PROFILE_FULL_SCAN_BYTES
+        rows = 0
+        non_empty = None
+        preview = None
+        for chunk in self.iter_csv_chunks(content, column_types):
+            if preview is None:
+                preview = chunk.head(self.PREVIEW_ROWS)
+            counts = chunk.notna().sum()
+            non_empty = counts if non_empty is None else non_empty.add(counts, fill_value=0)
+            rows += len(chunk)
+            if sampled and rows >= self.PROFILE_SAMPLE_ROWS:
+                break
+        
+        if preview is None:
+            preview = pd.read_csv(BytesIO(content), nrows=0)
+            non_empty = pd.Series(0, index=preview.columns)
+        
+        if sampled and rows:
+            # Count lines for the total (exact unless fields contain newlines)
+            # and scale the sampled counts to it
+            total_rows = max(content.count(b"\n") - (0 if content.endswith(b"\n") else -1) - 1, rows)
+            non_empty = (non_empty * (total_rows / rows)).round()
+            rows = total_rows
+        
+        profile = {
+            "rows": rows,
+            "columns": list(preview.columns),
+            "non_empty": non_empty.astype(int),
+            "preview": preview,
+            "sampled": sampled
+        }
+        with self._cache_lock:
+            self._profile_cache[cache_key] = profile
+            while len(self._profile_cache) > self.MAX_CACHED_PROFILES:
+                self._profile_cache.popitem(last=False)
+        return profile
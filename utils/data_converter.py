@@ -210,6 +210,12 @@ class DataConverter:
         for col in df.columns:
             if pd.api.types.is_datetime64_any_dtype(df[col]):
                 df[col] = df[col].apply(lambda x: x.isoformat() if pd.notna(x) else None)
+            elif isinstance(df[col].dtype, pd.CategoricalDtype):
+                # Categoricals can't hold the None used for missing values below
+                df[col] = df[col].astype(object)
+            elif df[col].dtype in ('float32', 'Float32'):
+                # Widen through the shortest decimal text so 85.3 stays 85.3
+                df[col] = pd.to_numeric(df[col].astype(str), errors='coerce')
         
         # Replace NaN with None for better JSON representation
         df = df.where(pd.notna(df), None)
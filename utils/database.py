@@ -3,12 +3,21 @@ Minimal database utilities for simplified DV Management System.
 Focuses on core functionality: input → export → import → view
 """
 
+import os
+import copy
 import sqlite3
+import uuid
+import functools
 import pandas as pd
+from multiprocessing import AuthenticationError
 import streamlit as st
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Iterable, Tuple, Callable
 import logging
+from .validation_rules import RuleEngine
+from .snapshot_cache import SnapshotCache
+from .db_writer import DatabaseWriter
+from .write_router import WriteClient, WriteServer, parse_address
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,6 +27,104 @@ logger = logging.getLogger(__name__)
 IT_DB_PATH = Path(__file__).parent.parent / "database" / "it_domain.db"
 NX_DB_PATH = Path(__file__).parent.parent / "database" / "nx_domain.db"
 
+# Shared snapshots live next to the databases, on the volume every
+# Streamlit process mounts
+SNAPSHOT_DIR = Path(__file__).parent.parent / "database" / "snapshots"
+
+# Deployment role of this process: 'standalone' (the default) owns the
+# databases alone; with several replicas, one 'owner' performs every write
+# and 'replica' processes open the databases read-only and route their
+# writes to the owner at DV_WRITE_ADDRESS (host:port), authenticated with
+# DV_WRITE_AUTHKEY, waiting at most DV_WRITE_TIMEOUT seconds for it.
+DB_ROLE = os.environ.get("DV_DB_ROLE", "standalone")
+WRITE_ADDRESS = os.environ.get("DV_WRITE_ADDRESS", "")
+WRITE_AUTHKEY = os.environ.get("DV_WRITE_AUTHKEY", "").encode()
+WRITE_TIMEOUT = float(os.environ.get("DV_WRITE_TIMEOUT", "300"))
+
+
+# Personnel columns normalized into assignment tables
+ASSIGNMENT_ROLES = ['dv_engineer', 'digital_designer', 'analog_designer']
+
+
+def _explode_assignments(df: pd.DataFrame, key_column: str) -> pd.DataFrame:
+    """Split comma-separated personnel columns into (key, role, person) rows."""
+    roles = [role for role in ASSIGNMENT_ROLES if role in df.columns]
+    if df.empty or not roles:
+        return pd.DataFrame(columns=[key_column, 'role', 'person'])
+    
+    assignments = df[[key_column] + roles].astype(object).melt(
+        id_vars=key_column, var_name='role', value_name='person'
+    )
+    assignments = assignments[assignments['person'].notna()]
+    assignments['person'] = assignments['person'].astype(str).str.split(',')
+    assignments = assignments.explode('person')
+    assignments['person'] = assignments['person'].str.strip()
+    assignments = assignments[assignments['person'] != '']
+    return assignments[[key_column, 'role', 'person']].drop_duplicates()
+
+
+def _sync_project_assignments(conn: sqlite3.Connection, project_ids: Optional[list] = None):
+    """
+    Rebuild project_assignments rows from it_domain_projects.
+    
+    Runs inside the caller's transaction; the caller commits.
+    
+    Args:
+        conn: IT domain connection
+        project_ids: Projects to resync, or None to rebuild the whole table
+    """
+    query = f"SELECT id AS project_id, {', '.join(ASSIGNMENT_ROLES)} FROM it_domain_projects"
+    if project_ids is None:
+        conn.execute("DELETE FROM project_assignments")
+        projects = pd.read_sql_query(query, conn)
+    else:
+        if not project_ids:
+            return
+        placeholders = ", ".join("?" * len(project_ids))
+        conn.execute(f"DELETE FROM project_assignments WHERE project_id IN ({placeholders})",
+                     tuple(project_ids))
+        projects = pd.read_sql_query(f"{query} WHERE id IN ({placeholders})", conn,
+                                     params=tuple(project_ids))
+    
+    assignments = _explode_assignments(projects, 'project_id')
+    conn.executemany(
+        "INSERT OR IGNORE INTO project_assignments (project_id, role, person) VALUES (?, ?, ?)",
+        assignments.itertuples(index=False, name=None)
+    )
+
+
+def _rebuild_ip_lineage(conn: sqlite3.Connection):
+    """
+    Rebuild ip_lineage_edges and the ip_lineage closure from it_domain_projects.
+    
+    Triggers keep both tables current as projects change; this is only
+    needed for projects stored before the tables existed. Edges that would
+    close a cycle are skipped and logged. The caller commits.
+    """
+    conn.execute("DELETE FROM ip_lineage")
+    conn.execute("DELETE FROM ip_lineage_edges")
+    
+    edges = conn.execute("""
+        SELECT TRIM(inherit_from_ip), TRIM(ip), COUNT(*)
+        FROM it_domain_projects
+        WHERE TRIM(COALESCE(inherit_from_ip, '')) NOT IN ('', TRIM(COALESCE(ip, '')))
+          AND TRIM(COALESCE(ip, '')) <> ''
+        GROUP BY TRIM(inherit_from_ip), TRIM(ip)
+    """).fetchall()
+    
+    for parent_ip, child_ip, project_count in edges:
+        cycle = conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM ip_lineage WHERE ancestor = ? AND descendant = ?)",
+            (child_ip, parent_ip)
+        ).fetchone()[0]
+        if cycle:
+            logger.warning(f"Skipping IP lineage edge {parent_ip} -> {child_ip}: it would create a cycle")
+            continue
+        conn.execute(
+            "INSERT INTO ip_lineage_edges (parent_ip, child_ip, project_count) VALUES (?, ?, ?)",
+            (parent_ip, child_ip, project_count)
+        )
+
 
 class MinimalDatabaseManager:
     """Simplified database manager for core workflow only."""
@@ -25,14 +132,64 @@ class MinimalDatabaseManager:
     def __init__(self):
         self.it_db_path = IT_DB_PATH
         self.nx_db_path = NX_DB_PATH
-        self._ensure_databases_exist()
+        if DB_ROLE not in ('standalone', 'owner', 'replica'):
+            raise ValueError(f"Unknown DV_DB_ROLE: {DB_ROLE}")
+        if DB_ROLE != 'standalone' and not (WRITE_ADDRESS and WRITE_AUTHKEY):
+            raise ValueError("DV_WRITE_ADDRESS and DV_WRITE_AUTHKEY are required with replicas")
+        # Replicas never write; the owner creates and upgrades the databases
+        self.read_only = DB_ROLE == 'replica'
+        if not self.read_only:
+            self._ensure_databases_exist()
     
     def _ensure_databases_exist(self):
-        """Create databases if they don't exist."""
+        """Create databases if they don't exist, then apply schema upgrades."""
         if not self.it_db_path.exists():
             self._create_it_database()
         if not self.nx_db_path.exists():
             self._create_nx_database()
+        self._apply_upgrades(self.it_db_path, "it_domain_upgrades.sql")
+        self._apply_upgrades(self.nx_db_path, "nx_domain_upgrades.sql")
+        self._backfill_it_database()
+    
+    def _apply_upgrades(self, db_path: Path, upgrades_file: str):
+        """Apply idempotent schema upgrades to an existing database."""
+        upgrades_path = db_path.parent / upgrades_file
+        if not db_path.exists() or not upgrades_path.exists():
+            return
+        
+        with open(upgrades_path, 'r') as f:
+            upgrades_sql = f.read()
+        
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.executescript(upgrades_sql)
+        finally:
+            conn.close()
+    
+    def _backfill_it_database(self):
+        """Populate derived IT tables for projects added before they existed."""
+        if not self.it_db_path.exists():
+            return
+        
+        conn = sqlite3.connect(self.it_db_path)
+        try:
+            has_projects = conn.execute("SELECT EXISTS (SELECT 1 FROM it_domain_projects)").fetchone()[0]
+            has_assignments = conn.execute("SELECT EXISTS (SELECT 1 FROM project_assignments)").fetchone()[0]
+            if has_projects and not has_assignments:
+                _sync_project_assignments(conn)
+                conn.commit()
+                logger.info("Backfilled project assignments")
+            
+            has_inheritance = conn.execute(
+                "SELECT EXISTS (SELECT 1 FROM it_domain_projects WHERE TRIM(COALESCE(inherit_from_ip, '')) <> '')"
+            ).fetchone()[0]
+            has_edges = conn.execute("SELECT EXISTS (SELECT 1 FROM ip_lineage_edges)").fetchone()[0]
+            if has_inheritance and not has_edges:
+                _rebuild_ip_lineage(conn)
+                conn.commit()
+                logger.info("Backfilled IP lineage")
+        finally:
+            conn.close()
     
     def _create_it_database(self):
         """Create IT domain database from schema."""
@@ -58,80 +215,455 @@ class MinimalDatabaseManager:
             conn.close()
             logger.info(f"Created NX domain database: {self.nx_db_path}")
     
+    def _connect(self, db_path: Path) -> sqlite3.Connection:
+        """Open a shared connection, read-only on replicas."""
+        if self.read_only:
+            return sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True,
+                                   check_same_thread=False)
+        return sqlite3.connect(db_path, check_same_thread=False)
+    
     @st.cache_resource
     def get_it_connection(_self):
         """Get cached connection to IT domain database."""
-        return sqlite3.connect(_self.it_db_path, check_same_thread=False)
+        return _self._connect(_self.it_db_path)
     
     @st.cache_resource
     def get_nx_connection(_self):
         """Get cached connection to NX domain database."""
-        return sqlite3.connect(_self.nx_db_path, check_same_thread=False)
+        return _self._connect(_self.nx_db_path)
+    
+    @st.cache_resource
+    def get_it_writer(_self) -> DatabaseWriter:
+        """Get the process-wide writer that serializes IT domain writes."""
+        if _self.read_only:
+            raise RuntimeError("Replicas route writes to the owner")
+        return DatabaseWriter(_self.it_db_path, name="it-writer", generation_table="data_generation")
+    
+    @st.cache_resource
+    def get_nx_writer(_self) -> DatabaseWriter:
+        """Get the process-wide writer that serializes NX domain writes."""
+        if _self.read_only:
+            raise RuntimeError("Replicas route writes to the owner")
+        return DatabaseWriter(_self.nx_db_path, name="nx-writer", generation_table="data_generation")
 
 
 # Global database manager instance
 db_manager = MinimalDatabaseManager()
 
+# Write helpers the owner runs on behalf of replicas, by name
+_routed_writes: Dict[str, Callable[..., Any]] = {}
+
+
+def routed_write(failure: Any):
+    """
+    Register a write helper that replicas run on the owner process.
+    
+    On standalone and owner processes the helper runs locally. On replicas
+    the call and its arguments are sent to the owner; exceptions raised
+    there are re-raised here. A replica waits at most WRITE_TIMEOUT seconds
+    for the owner and then returns failure.
+    
+    Args:
+        failure: Value returned when the owner can't be reached, matching
+            the helper's own failure result
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        _routed_writes[func.__name__] = func
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not db_manager.read_only:
+                return func(*args, **kwargs)
+            try:
+                return WriteClient(parse_address(WRITE_ADDRESS), WRITE_AUTHKEY, timeout=WRITE_TIMEOUT).call(
+                    func.__name__, *args, **kwargs
+                )
+            except TimeoutError as e:
+                logger.error(f"Routed {func.__name__} timed out, it may still complete on the owner: {e}")
+                return copy.deepcopy(failure)
+            except (OSError, EOFError, AuthenticationError) as e:
+                logger.error(f"Could not route {func.__name__} to the owner: {e}")
+                return copy.deepcopy(failure)
+        return wrapper
+    return decorator
+
 
 def execute_it_query(query: str, params: Optional[tuple] = None) -> sqlite3.Cursor:
-    """Execute query on IT domain database."""
+    """Execute a write query on IT domain database through its writer and wait for the commit."""
     try:
-        conn = db_manager.get_it_connection()
-        if params:
-            cursor = conn.execute(query, params)
-        else:
-            cursor = conn.execute(query)
-        conn.commit()
-        return cursor
+        return db_manager.get_it_writer().execute(lambda conn: conn.execute(query, params or ()))
     except Exception as e:
         logger.error(f"IT domain query failed: {query}, Error: {e}")
         raise
 
 
 def execute_nx_query(query: str, params: Optional[tuple] = None) -> sqlite3.Cursor:
-    """Execute query on NX domain database."""
+    """Execute a write query on NX domain database through its writer and wait for the commit."""
     try:
-        conn = db_manager.get_nx_connection()
-        if params:
-            cursor = conn.execute(query, params)
-        else:
-            cursor = conn.execute(query)
-        conn.commit()
-        return cursor
+        return db_manager.get_nx_writer().execute(lambda conn: conn.execute(query, params or ()))
     except Exception as e:
         logger.error(f"NX domain query failed: {query}, Error: {e}")
         raise
 
 
-def fetch_it_dataframe(query: str, params: Optional[tuple] = None) -> pd.DataFrame:
-    """Fetch data from IT domain as pandas DataFrame."""
+def get_writer_metrics() -> Dict[str, Dict[str, float]]:
+    """
+    Get queue depth and commit latency of both domain writers.
+    
+    Returns:
+        Dict mapping 'it' and 'nx' to DatabaseWriter.metrics(); empty on
+        replicas, whose writes run on the owner
+    """
+    if db_manager.read_only:
+        return {}
+    return {
+        'it': db_manager.get_it_writer().metrics(),
+        'nx': db_manager.get_nx_writer().metrics(),
+    }
+
+
+# Dtype policy for fetched frames. Heavily repeated text becomes categorical;
+# columns with a CHECK-constrained domain always carry every allowed value,
+# so selectboxes built from the categories offer all of them.
+CATEGORY_COLUMNS: Dict[str, List[str]] = {
+    'business_unit': ['', 'CN', 'PC'],
+    'ip_subtype': ['', 'default', 'gen2x1'],
+    'reuse_ip': ['', 'N', 'Y'],
+    'coverage_quality': ['Excellent', 'Good', 'Fair', 'Poor', 'No Data'],
+    'role': list(ASSIGNMENT_ROLES),
+    'data_source': [],
+    'dv_engineer': [],
+    'digital_designer': [],
+    'analog_designer': [],
+    'person': [],
+}
+
+# Percentages stored as DECIMAL(5,2) fit float32 without visible loss
+COVERAGE_COLUMNS = [
+    'line_coverage', 'fsm_coverage', 'interface_toggle_coverage', 'toggle_coverage',
+    'avg_coverage', 'avg_line_coverage', 'avg_fsm_coverage',
+    'avg_interface_toggle_coverage', 'avg_toggle_coverage',
+]
+
+TIMESTAMP_COLUMNS = [
+    'created_at', 'updated_at', 'import_date', 'last_updated',
+    'rtl_last_update', 'to_report_creation', 'to_date',
+]
+
+# Running totals of what compact_dataframe saved, for the status page
+_memory_savings = {'frames': 0, 'bytes_before': 0, 'bytes_after': 0}
+
+
+def _compact_column(col: str, series: pd.Series) -> pd.Series:
+    """Convert one column according to the dtype policy, or return it unchanged."""
+    if col in CATEGORY_COLUMNS:
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        allowed = CATEGORY_COLUMNS[col]
+        extra = sorted(set(series.dropna().unique()) - set(allowed), key=str)
+        return series.astype(pd.CategoricalDtype(allowed + extra))
+    if col in COVERAGE_COLUMNS:
+        if series.dtype == 'Float32':
+            return series
+        return series.astype('Float32')
+    if col in TIMESTAMP_COLUMNS:
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series
+        return pd.to_datetime(series, format='ISO8601', errors='coerce')
+    return series
+
+
+def compact_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply the dtype policy to a fetched frame and record the memory saved.
+    
+    Columns the policy doesn't name, or that fail to convert, are kept as
+    they are, so the result is always safe to use in place of df.
+    """
+    columns = [col for col in df.columns
+               if col in CATEGORY_COLUMNS or col in COVERAGE_COLUMNS or col in TIMESTAMP_COLUMNS]
+    if df.empty or not columns:
+        return df
+    
+    df = df.copy(deep=False)
+    before = after = 0
+    for col in columns:
+        series = df[col]
+        try:
+            compact = _compact_column(col, series)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Kept dtype of column {col}: {e}")
+            continue
+        if compact is series:
+            continue
+        before += series.memory_usage(index=False, deep=True)
+        after += compact.memory_usage(index=False, deep=True)
+        df[col] = compact
+    
+    _memory_savings['frames'] += 1
+    _memory_savings['bytes_before'] += int(before)
+    _memory_savings['bytes_after'] += int(after)
+    logger.debug(f"Compacted {len(df)} rows: {before} -> {after} bytes")
+    return df
+
+
+def get_memory_savings() -> Dict[str, int]:
+    """
+    Get the memory saved by the dtype policy since the process started.
+    
+    Returns:
+        Dict with frames, bytes_before, bytes_after and bytes_saved
+    """
+    savings = dict(_memory_savings)
+    savings['bytes_saved'] = savings['bytes_before'] - savings['bytes_after']
+    return savings
+
+
+def fetch_it_dataframe(query: str, params: Optional[tuple] = None,
+                       compact: bool = True) -> pd.DataFrame:
+    """Fetch data from IT domain as pandas DataFrame, compacted unless compact is False."""
     try:
         conn = db_manager.get_it_connection()
         if params:
             df = pd.read_sql_query(query, conn, params=params)
         else:
             df = pd.read_sql_query(query, conn)
-        return df
+        return compact_dataframe(df) if compact else df
     except Exception as e:
         logger.error(f"IT domain dataframe fetch failed: {query}, Error: {e}")
         return pd.DataFrame()
 
 
-def fetch_nx_dataframe(query: str, params: Optional[tuple] = None) -> pd.DataFrame:
-    """Fetch data from NX domain as pandas DataFrame."""
+def fetch_nx_dataframe(query: str, params: Optional[tuple] = None,
+                       compact: bool = True) -> pd.DataFrame:
+    """Fetch data from NX domain as pandas DataFrame, compacted unless compact is False."""
     try:
         conn = db_manager.get_nx_connection()
         if params:
             df = pd.read_sql_query(query, conn, params=params)
         else:
             df = pd.read_sql_query(query, conn)
-        return df
+        return compact_dataframe(df) if compact else df
     except Exception as e:
         logger.error(f"NX domain dataframe fetch failed: {query}, Error: {e}")
         return pd.DataFrame()
 
 
+# Tables each domain database owns, for schema lookups
+TABLE_DOMAINS = {
+    'it_domain_projects': 'it',
+    'imported_it_data': 'nx',
+    'nx_regression_data': 'nx',
+}
+
+_table_schema_cache: Dict[str, Dict[str, str]] = {}
+
+
+def get_table_schema(table_name: str) -> Dict[str, str]:
+    """
+    Get the declared column types of a domain table via PRAGMA table_info.
+    
+    Args:
+        table_name: One of the tables in TABLE_DOMAINS
+    
+    Returns:
+        Dict mapping column name to declared SQL type
+    """
+    if table_name not in TABLE_DOMAINS:
+        raise ValueError(f"Unknown table: {table_name}")
+    
+    if table_name not in _table_schema_cache:
+        if TABLE_DOMAINS[table_name] == 'it':
+            conn = db_manager.get_it_connection()
+        else:
+            conn = db_manager.get_nx_connection()
+        rows = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+        # Row layout: cid, name, type, notnull, dflt_value, pk
+        _table_schema_cache[table_name] = {row[1]: row[2] for row in rows}
+    
+    return dict(_table_schema_cache[table_name])
+
+
+# Last data_generation read per domain, with the data_version it was read at
+_generation_cache: Dict[str, Tuple[int, Tuple[Tuple[str, int], ...]]] = {}
+
+
+def get_data_generation(domain: str) -> Tuple[Tuple[str, int], ...]:
+    """
+    Get the write generation of every table in a domain database.
+    
+    The domain writer bumps a table's generation once per write job that
+    changes it, and triggers bump tables filled from outside the app
+    (nx_regression_data) on every row, so the result changes whenever the
+    domain's data does and can be used as a cache key. The table is only
+    re-read when PRAGMA data_version reports a commit by another connection
+    (the writer, or another process), so polling this is cheap.
+    
+    Args:
+        domain: 'it' or 'nx'
+    
+    Returns:
+        Tuple of (table_name, generation) pairs ordered by table name
+    """
+    conn = db_manager.get_it_connection() if domain == 'it' else db_manager.get_nx_connection()
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    cached = _generation_cache.get(domain)
+    if cached is not None and cached[0] == data_version:
+        return cached[1]
+    
+    rows = tuple(conn.execute("SELECT table_name, generation FROM data_generation ORDER BY table_name").fetchall())
+    _generation_cache[domain] = (data_version, rows)
+    return rows
+
+
+def get_table_generations(domain: str, tables: Iterable[str]) -> Tuple[Tuple[str, int], ...]:
+    """
+    Get the write generation of some tables of a domain database.
+    
+    Keys caches of data read from only these tables, so writes to other
+    tables of the domain leave them valid.
+    
+    Args:
+        domain: 'it' or 'nx'
+        tables: Table names tracked in data_generation
+    
+    Returns:
+        Tuple of (table_name, generation) pairs ordered by table name
+    """
+    wanted = set(tables)
+    return tuple(pair for pair in get_data_generation(domain) if pair[0] in wanted)
+
+
+snapshot_cache = SnapshotCache(str(SNAPSHOT_DIR))
+
+
+# Tables and views the paged table can browse: their domain and the tables
+# they read, whose generations key the cached pages
+PAGED_SOURCES = {
+    'it_domain_projects': ('it', ('it_domain_projects',)),
+    'export_view': ('it', ('it_domain_projects',)),
+    'imported_it_view': ('nx', ('imported_it_data',)),
+    'to_summary_view': ('nx', ('imported_it_data', 'nx_regression_data')),
+    'coverage_analysis_view': ('nx', ('nx_regression_data',)),
+}
+
+_source_columns_cache: Dict[str, List[str]] = {}
+
+
+def get_source_columns(source: str) -> List[str]:
+    """
+    Get the column names of a paged source, in declaration order.
+    
+    Args:
+        source: One of the tables or views in PAGED_SOURCES
+    """
+    if source not in PAGED_SOURCES:
+        raise ValueError(f"Unknown paged source: {source}")
+    
+    if source not in _source_columns_cache:
+        domain = PAGED_SOURCES[source][0]
+        conn = db_manager.get_it_connection() if domain == 'it' else db_manager.get_nx_connection()
+        rows = conn.execute(f"PRAGMA table_info({source})").fetchall()
+        _source_columns_cache[source] = [row[1] for row in rows]
+    
+    return list(_source_columns_cache[source])
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _fetch_page(source: str, generation: Tuple[Tuple[str, int], ...], columns: Tuple[str, ...],
+                search_column: Optional[str], search: str, sort_column: Optional[str],
+                descending: bool, limit: int, offset: int) -> Tuple[pd.DataFrame, int]:
+    """Run the page and count queries; cached per generation of the source's tables."""
+    domain = PAGED_SOURCES[source][0]
+    conn = db_manager.get_it_connection() if domain == 'it' else db_manager.get_nx_connection()
+    
+    where = ""
+    params: List[Any] = []
+    if search_column and search:
+        escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        where = f"""WHERE CAST("{search_column}" AS TEXT) LIKE ? ESCAPE '\\'"""
+        params.append(f"%{escaped}%")
+    order = ""
+    if sort_column:
+        order = f"""ORDER BY "{sort_column}" {'DESC' if descending else 'ASC'} NULLS LAST"""
+    
+    total = conn.execute(f"SELECT COUNT(*) FROM {source} {where}", params).fetchone()[0]
+    selected = ", ".join(f'"{col}"' for col in columns)
+    page = pd.read_sql_query(
+        f"SELECT {selected} FROM {source} {where} {order} LIMIT ? OFFSET ?",
+        conn, params=params + [limit, offset]
+    )
+    return page, int(total)
+
+
+def fetch_table_page(source: str, columns: Optional[List[str]] = None,
+                     search_column: Optional[str] = None, search: str = "",
+                     sort_column: Optional[str] = None, descending: bool = False,
+                     limit: int = 100, offset: int = 0) -> Tuple[pd.DataFrame, int]:
+    """
+    Fetch one window of a table or view, filtered and sorted in SQL.
+    
+    Only the requested rows leave the database, so tables of any size can be
+    browsed without loading them whole. Pages are cached until a table the
+    source reads changes.
+    
+    Args:
+        source: One of the tables or views in PAGED_SOURCES
+        columns: Columns to return, all by default
+        search_column: Column to filter on, or None for no filter
+        search: Case-insensitive substring the filter column must contain
+        sort_column: Column to sort by, or None for the source's own order
+        descending: Sort in descending order; missing values always sort last
+        limit: Most rows to return
+        offset: Matching rows to skip
+    
+    Returns:
+        Tuple of (page DataFrame, number of rows matching the filter);
+        an empty page and 0 if the query fails
+    """
+    known = get_source_columns(source)
+    columns = columns or known
+    for col in list(columns) + [search_column, sort_column]:
+        if col is not None and col not in known:
+            raise ValueError(f"Unknown column for {source}: {col}")
+    
+    try:
+        generation = get_table_generations(PAGED_SOURCES[source][0], PAGED_SOURCES[source][1])
+        page, total = _fetch_page(source, generation, tuple(columns), search_column, search,
+                                  sort_column, descending, limit, offset)
+        return page, total
+    except Exception as e:
+        logger.error(f"Failed to fetch page of {source}: {e}")
+        return pd.DataFrame(columns=columns), 0
+
+
+def _fetch_snapshot(name: str, domain: str, tables: Tuple[str, ...], query: str) -> pd.DataFrame:
+    """
+    Fetch a whole-table query through the shared snapshot cache.
+    
+    The snapshot key combines the database file's identity with the
+    generations of the tables the query reads, so the first process to read
+    after one of them changes rebuilds the snapshot and every other process
+    maps it instead of querying.
+    
+    Args:
+        name: Snapshot name
+        domain: 'it' or 'nx', the database the query runs on
+        tables: Tables the query reads
+        query: Query producing the frame
+    """
+    fetch = fetch_it_dataframe if domain == 'it' else fetch_nx_dataframe
+    try:
+        db_path = db_manager.it_db_path if domain == 'it' else db_manager.nx_db_path
+        key = SnapshotCache.key_for(Path(db_path).stat().st_ino, get_table_generations(domain, tables))
+        return snapshot_cache.get(name, key, lambda: fetch(query))
+    except Exception as e:
+        logger.warning(f"Snapshot {name} unavailable, querying directly: {e}")
+        return fetch(query)
+
+
 # IT Domain Functions (Complete)
+@routed_write(failure=False)
 def add_it_project_complete(project_data: Dict[str, Any]) -> bool:
     """
     Add new project to IT domain with all 17 fields.
@@ -175,10 +707,14 @@ def add_it_project_complete(project_data: Dict[str, Any]) -> bool:
             project_data.get('reuse_ip', '')
         )
         
-        execute_it_query(query, params)
+        def insert(conn: sqlite3.Connection):
+            cursor = conn.execute(query, params)
+            _sync_project_assignments(conn, [cursor.lastrowid])
+        
+        db_manager.get_it_writer().execute(insert)
         logger.info(f"Added IT project: {project_data['project_name']}")
         return True
-        
+    
     except Exception as e:
         logger.error(f"Failed to add IT project: {e}")
         return False
@@ -200,6 +736,11 @@ def get_it_projects_complete() -> pd.DataFrame:
     FROM it_domain_projects
     ORDER BY task_index
     """
+    return _fetch_snapshot('it_projects', 'it', ('it_domain_projects',), query)
+
+def get_it_project_names() -> pd.DataFrame:
+    """Get id, project_name and alternative_name of every IT project."""
+    query = "SELECT id, project_name, alternative_name FROM it_domain_projects"
     return fetch_it_dataframe(query)
 
 # Backward compatibility function
@@ -220,6 +761,7 @@ def get_it_export_data_minimal() -> pd.DataFrame:
     return fetch_it_dataframe(query)
 
 
+@routed_write(failure=False)
 def delete_it_project(project_id: int) -> bool:
     """Delete IT domain project by ID."""
     try:
@@ -232,50 +774,636 @@ def delete_it_project(project_id: int) -> bool:
         return False
 
 
-# NX Domain Functions (Simplified)
-def import_it_data_to_nx_complete(csv_data: pd.DataFrame) -> bool:
+# Fields a project import can set; task_index and timestamps are managed by triggers
+IT_PROJECT_FIELDS = [
+    'project_name', 'spip_ip', 'ip', 'ip_postfix', 'ip_subtype', 'alternative_name',
+    'dv_engineer', 'digital_designer', 'analog_designer', 'business_unit',
+    'spip_url', 'wiki_url', 'spec_version', 'spec_path', 'inherit_from_ip', 'reuse_ip'
+]
+
+MERGE_STRATEGIES = ["Add New Only", "Update Existing", "Replace All"]
+
+
+def _stage_projects(conn: sqlite3.Connection, df: pd.DataFrame) -> List[str]:
     """
-    Import complete IT domain CSV data to NX domain (all 17 fields).
+    Load projects into the temp.staging_projects table, keyed by project_name.
+    
+    Empty strings become NULL and the last row wins for repeated names.
+    
+    Returns:
+        The staged project fields other than project_name
+    """
+    columns = [col for col in IT_PROJECT_FIELDS if col in df.columns]
+    if 'project_name' not in columns:
+        raise ValueError("project_name column is required")
+    
+    staged = df[columns].astype(object)
+    staged = staged.where(staged.notna() & (staged != ''), None)
+    staged['project_name'] = staged['project_name'].map(
+        lambda name: str(name).strip() if name is not None else None
+    )
+    staged = staged[staged['project_name'].notna()].drop_duplicates('project_name', keep='last')
+    
+    # Same column types as the target, so staged values get the stored
+    # values' affinity: COALESCE() in the diff conditions would otherwise
+    # compare e.g. a staged 1.2 unequal to a stored '1.2'
+    conn.execute("DROP TABLE IF EXISTS temp.staging_projects")
+    conn.execute(
+        f"CREATE TEMP TABLE staging_projects AS SELECT {', '.join(columns)} FROM it_domain_projects WHERE 0"
+    )
+    conn.execute("CREATE UNIQUE INDEX temp.idx_staging_project_name ON staging_projects (project_name)")
+    conn.executemany(
+        f"INSERT INTO temp.staging_projects ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))})",
+        staged.itertuples(index=False, name=None)
+    )
+    return [col for col in columns if col != 'project_name']
+
+
+def _changed_condition(fields: List[str]) -> str:
+    """SQL condition that is true when any staged field differs from the stored one."""
+    if not fields:
+        return "0"
+    return " OR ".join(f"COALESCE(s.{col}, '') <> COALESCE(p.{col}, '')" for col in fields)
+
+
+def _diff_staged_projects(conn: sqlite3.Connection, fields: List[str]) -> Dict[str, pd.DataFrame]:
+    """Classify staged projects against it_domain_projects with indexed joins."""
+    changed = _changed_condition(fields)
+    changed_columns = " || ".join(
+        f"CASE WHEN COALESCE(s.{col}, '') <> COALESCE(p.{col}, '') THEN '{col}, ' ELSE '' END"
+        for col in fields
+    ) or "''"
+    
+    return {
+        'insert': pd.read_sql_query("""
+            SELECT s.* FROM temp.staging_projects s
+            LEFT JOIN it_domain_projects p ON p.project_name = s.project_name
+            WHERE p.id IS NULL
+        """, conn),
+        'update': pd.read_sql_query(f"""
+            SELECT p.id, p.task_index, s.project_name,
+                   RTRIM({changed_columns}, ', ') AS changed_columns
+            FROM temp.staging_projects s
+            JOIN it_domain_projects p ON p.project_name = s.project_name
+            WHERE {changed}
+        """, conn),
+        'unchanged': pd.read_sql_query(f"""
+            SELECT p.id, p.task_index, s.project_name
+            FROM temp.staging_projects s
+            JOIN it_domain_projects p ON p.project_name = s.project_name
+            WHERE NOT ({changed})
+        """, conn),
+        'delete': pd.read_sql_query("""
+            SELECT p.id, p.task_index, p.project_name
+            FROM it_domain_projects p
+            WHERE p.project_name NOT IN (SELECT project_name FROM temp.staging_projects)
+        """, conn)
+    }
+
+
+def preview_project_merge(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Compute what merging df into it_domain_projects would change.
     
     Args:
-        csv_data: DataFrame with complete IT domain project data
+        df: Mapped import data with a project_name column
     
     Returns:
-        bool: Success status
+        Dict of 'insert', 'update', 'unchanged' and 'delete' DataFrames.
+        'delete' lists the projects only "Replace All" would remove.
     """
+    # A private connection: the cached one is shared by all sessions, which
+    # would see and replace each other's staging table
+    conn = db_manager._connect(db_manager.it_db_path)
     try:
-        conn = db_manager.get_nx_connection()
-        
-        # Clear existing data
-        conn.execute("DELETE FROM imported_it_data")
+        fields = _stage_projects(conn, df)
+        return _diff_staged_projects(conn, fields)
+    finally:
+        conn.close()
+
+
+@routed_write(failure=(False, {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'skipped': 0}))
+def apply_project_merge(df: pd.DataFrame, strategy: str) -> Tuple[bool, Dict[str, int]]:
+    """
+    Merge df into it_domain_projects in a single transaction.
+    
+    Strategies:
+        Add New Only: insert projects whose name is not stored yet
+        Update Existing: also overwrite the imported fields of matching projects
+        Replace All: also delete projects that are not in df
+    
+    Fields that are not columns of df are left untouched on matching projects.
+    
+    Args:
+        df: Mapped, validated import data with a project_name column
+        strategy: One of MERGE_STRATEGIES
+    
+    Returns:
+        Tuple of (success, counts of inserted, updated, deleted, unchanged and
+        skipped projects); skipped ones differ but "Add New Only" keeps them as stored
+    """
+    if strategy not in MERGE_STRATEGIES:
+        raise ValueError(f"Unknown merge strategy: {strategy}")
+    
+    counts = {'inserted': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0, 'skipped': 0}
+    
+    def merge(conn: sqlite3.Connection):
+        fields = _stage_projects(conn, df)
+        changed = _changed_condition(fields)
         
-        # All 17 IT domain columns
-        required_cols = [
-            'task_index', 'project_name', 'spip_ip', 'ip', 'ip_postfix', 'ip_subtype', 'alternative_name',
-            'dv_engineer', 'digital_designer', 'analog_designer', 'business_unit',
-            'spip_url', 'wiki_url', 'spec_version', 'spec_path', 'inherit_from_ip', 'reuse_ip'
-        ]
-        available_cols = [col for col in required_cols if col in csv_data.columns]
+        # Classified before the update below makes changed projects match
+        matched, differing = conn.execute(f"""
+            SELECT COUNT(*), COALESCE(SUM({changed}), 0) FROM temp.staging_projects s
+            JOIN it_domain_projects p ON p.project_name = s.project_name
+        """).fetchone()
+        counts['unchanged'] = matched - differing
         
-        if 'project_name' not in available_cols:
-            raise ValueError("project_name column is required")
+        if strategy == "Replace All":
+            counts['deleted'] = conn.execute("""
+                DELETE FROM it_domain_projects
+                WHERE project_name NOT IN (SELECT project_name FROM temp.staging_projects)
+            """).rowcount
         
-        # Select only available columns
-        import_data = csv_data[available_cols].copy()
+        if strategy in ("Update Existing", "Replace All") and fields:
+            # Only matching projects that actually differ are written
+            touched = [row[0] for row in conn.execute(f"""
+                SELECT p.id FROM temp.staging_projects s
+                JOIN it_domain_projects p ON p.project_name = s.project_name
+                WHERE {changed}
+            """)]
+            counts['updated'] = conn.execute(f"""
+                UPDATE it_domain_projects AS p
+                SET {', '.join(f'{col} = s.{col}' for col in fields)}
+                FROM temp.staging_projects AS s
+                WHERE s.project_name = p.project_name AND ({changed})
+            """).rowcount
+        else:
+            touched = []
         
-        # Clean data - replace NaN with empty strings
-        import_data = import_data.fillna('')
+        # AUTOINCREMENT ids only grow, so new rows are the ones above this
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM it_domain_projects").fetchone()[0]
+        columns = ['project_name'] + fields
+        inserted = conn.execute(f"""
+            INSERT INTO it_domain_projects ({', '.join(columns)})
+            SELECT {', '.join(f's.{col}' for col in columns)}
+            FROM temp.staging_projects s
+            WHERE NOT EXISTS (SELECT 1 FROM it_domain_projects p WHERE p.project_name = s.project_name)
+        """).rowcount
+        counts['inserted'] = inserted
+        if inserted:
+            touched += [row[0] for row in conn.execute(
+                "SELECT id FROM it_domain_projects WHERE id > ?", (last_id,)
+            )]
         
-        # Insert new data
-        import_data.to_sql('imported_it_data', conn, if_exists='append', index=False)
-        conn.commit()
+        counts['skipped'] = differing - counts['updated']
         
-        logger.info(f"Imported {len(import_data)} IT projects to NX domain with {len(available_cols)} fields")
+        _sync_project_assignments(conn, touched)
+        conn.execute("DROP TABLE temp.staging_projects")
+    
+    try:
+        db_manager.get_it_writer().execute(merge)
+        logger.info(f"Merged IT projects ({strategy}): {counts}")
+        return True, counts
+    
+    except Exception as e:
+        logger.error(f"Failed to merge IT projects: {e}")
+        return False, {key: 0 for key in counts}
+
+
+@routed_write(failure=False)
+def update_it_projects_bulk(changes: Dict[int, Dict[str, Any]]) -> bool:
+    """
+    Write edited cells of several IT projects in one transaction.
+    
+    Rows that changed the same set of columns share one executemany
+    statement. updated_at is set by the statement itself, so the timestamp
+    trigger does not run a second UPDATE per row.
+    
+    Args:
+        changes: Mapping of project id to {column: new value} for changed cells only
+    
+    Returns:
+        True if all changes were written, False otherwise (nothing is written)
+    """
+    changes = {project_id: cells for project_id, cells in changes.items() if cells}
+    if not changes:
+        return True
+    
+    batches: Dict[Tuple[str, ...], List[tuple]] = {}
+    for project_id, cells in changes.items():
+        unknown = set(cells) - set(IT_PROJECT_FIELDS)
+        if unknown:
+            raise ValueError(f"Columns cannot be edited: {', '.join(sorted(unknown))}")
+        columns = tuple(sorted(cells))
+        values = tuple(
+            None if value is None or (isinstance(value, float) and pd.isna(value)) else value
+            for value in (cells[col] for col in columns)
+        )
+        batches.setdefault(columns, []).append(values + (int(project_id),))
+    
+    personnel_changed = [
+        int(project_id) for project_id, cells in changes.items()
+        if set(cells) & set(ASSIGNMENT_ROLES)
+    ]
+    
+    def update(conn: sqlite3.Connection):
+        for columns, rows in batches.items():
+            assignments = ", ".join(f"{col} = ?" for col in columns)
+            conn.executemany(
+                f"UPDATE it_domain_projects SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                rows
+            )
+        _sync_project_assignments(conn, personnel_changed)
+    
+    try:
+        db_manager.get_it_writer().execute(update)
+        logger.info(f"Updated {len(changes)} IT projects")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Failed to update IT projects: {e}")
+        return False
+
+
+@st.cache_data(show_spinner=False)
+def _compute_it_stats(generation: Tuple[Tuple[str, int], ...]) -> Dict[str, Any]:
+    """Compute IT dashboard metrics; cached per data generation."""
+    by_unit = fetch_it_dataframe("""
+        SELECT COALESCE(business_unit, '') AS business_unit,
+               COUNT(*) AS projects,
+               SUM(reuse_ip = 'Y') AS reused
+        FROM it_domain_projects
+        GROUP BY business_unit
+    """)
+    units = dict(zip(by_unit['business_unit'], by_unit['projects'].astype(int)))
+    return {
+        'total_projects': int(by_unit['projects'].sum()),
+        'cn_projects': units.get('CN', 0),
+        'pc_projects': units.get('PC', 0),
+        'reused_ips': int(by_unit['reused'].fillna(0).sum())
+    }
+
+
+def get_it_stats() -> Dict[str, Any]:
+    """
+    Get headline IT metrics from one grouped aggregate query.
+    
+    Returns:
+        Dict with total_projects, cn_projects, pc_projects and reused_ips
+    """
+    try:
+        return dict(_compute_it_stats(get_data_generation('it')))
+    except Exception as e:
+        logger.error(f"Failed to get IT stats: {e}")
+        return {'total_projects': 0, 'cn_projects': 0, 'pc_projects': 0, 'reused_ips': 0}
+
+
+def get_it_projects_by_ids(project_ids: List[int]) -> pd.DataFrame:
+    """Get the complete rows of the given IT projects."""
+    if not project_ids:
+        return pd.DataFrame()
+    query = f"""
+    SELECT 
+        id, task_index, project_name, spip_ip, ip, ip_postfix, ip_subtype, alternative_name,
+        dv_engineer, digital_designer, analog_designer, business_unit,
+        spip_url, wiki_url, spec_version, spec_path, inherit_from_ip, reuse_ip,
+        created_at, updated_at
+    FROM it_domain_projects
+    WHERE id IN ({', '.join('?' * len(project_ids))})
+    """
+    return fetch_it_dataframe(query, tuple(int(project_id) for project_id in project_ids))
+
+
+# Bound parameter lists well below SQLite's host parameter limit
+SQL_BATCH_SIZE = 500
+
+
+@routed_write(failure=False)
+def delete_it_projects(project_ids: List[int]) -> bool:
+    """
+    Delete several IT domain projects in one transaction.
+    
+    Args:
+        project_ids: IDs of the projects to delete
+    
+    Returns:
+        True if every batch was deleted, False otherwise (nothing is deleted)
+    """
+    project_ids = [int(project_id) for project_id in project_ids]
+    if not project_ids:
+        return True
+    
+    def delete(conn: sqlite3.Connection) -> int:
+        deleted = 0
+        for start in range(0, len(project_ids), SQL_BATCH_SIZE):
+            batch = project_ids[start:start + SQL_BATCH_SIZE]
+            deleted += conn.execute(
+                f"DELETE FROM it_domain_projects WHERE id IN ({', '.join('?' * len(batch))})",
+                batch
+            ).rowcount
+        return deleted
+    
+    try:
+        deleted = db_manager.get_it_writer().execute(delete)
+        logger.info(f"Deleted {deleted} IT projects")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Failed to delete IT projects: {e}")
+        return False
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """Bounds of a project_name range scan matching prefix (case-sensitive)."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def search_it_projects(prefix: str = "", limit: int = 50, offset: int = 0) -> pd.DataFrame:
+    """
+    Get one page of projects whose name starts with prefix.
+    
+    Uses a range scan on the project_name index rather than LIKE, so the
+    cost depends on the page size, not on the number of projects.
+    
+    Args:
+        prefix: Project name prefix (case-sensitive); empty matches all
+        limit: Page size
+        offset: Number of matching projects to skip
+    
+    Returns:
+        DataFrame with id, task_index and project_name ordered by project_name
+    """
+    query = "SELECT id, task_index, project_name FROM it_domain_projects"
+    params: tuple = ()
+    if prefix:
+        query += " WHERE project_name >= ? AND project_name < ?"
+        params = _prefix_range(prefix)
+    query += " ORDER BY project_name LIMIT ? OFFSET ?"
+    return fetch_it_dataframe(query, params + (int(limit), int(offset)))
+
+
+def count_it_projects(prefix: str = "") -> int:
+    """Count projects whose name starts with prefix, using the project_name index."""
+    query = "SELECT COUNT(*) AS count FROM it_domain_projects"
+    params: tuple = ()
+    if prefix:
+        query += " WHERE project_name >= ? AND project_name < ?"
+        params = _prefix_range(prefix)
+    df = fetch_it_dataframe(query, params or None)
+    return int(df.iloc[0]['count']) if not df.empty else 0
+
+
+@routed_write(failure=False)
+def rebuild_project_assignments() -> bool:
+    """Rebuild the whole project_assignments table from the personnel columns."""
+    try:
+        db_manager.get_it_writer().execute(lambda conn: _sync_project_assignments(conn))
+        return True
+    except Exception as e:
+        logger.error(f"Failed to rebuild project assignments: {e}")
+        return False
+
+
+def get_engineer_workload(role: Optional[str] = None) -> pd.DataFrame:
+    """
+    Get the number of projects assigned to each person.
+    
+    Args:
+        role: Restrict to one of ASSIGNMENT_ROLES, or None for all roles
+    
+    Returns:
+        DataFrame with person, role and project_count, busiest first
+    """
+    query = """
+    SELECT person, role, COUNT(*) AS project_count
+    FROM project_assignments
+    {where}
+    GROUP BY person, role
+    ORDER BY project_count DESC, person
+    """
+    if role:
+        return fetch_it_dataframe(query.format(where="WHERE role = ?"), (role,))
+    return fetch_it_dataframe(query.format(where=""))
+
+
+def get_projects_for_engineer(person: str, role: Optional[str] = None) -> pd.DataFrame:
+    """Get all IT projects a person is assigned to, via the person index."""
+    query = """
+    SELECT a.role, p.id, p.task_index, p.project_name, p.ip, p.business_unit
+    FROM project_assignments a
+    JOIN it_domain_projects p ON p.id = a.project_id
+    WHERE a.person = ?
+    """
+    params: tuple = (person,)
+    if role:
+        query += " AND a.role = ?"
+        params += (role,)
+    return fetch_it_dataframe(query + " ORDER BY p.task_index", params)
+
+
+@routed_write(failure=False)
+def rebuild_ip_lineage() -> bool:
+    """Rebuild the IP lineage closure from the inherit_from_ip column."""
+    try:
+        db_manager.get_it_writer().execute(lambda conn: _rebuild_ip_lineage(conn))
         return True
+    except Exception as e:
+        logger.error(f"Failed to rebuild IP lineage: {e}")
+        return False
+
+
+def get_ip_descendants(ip: str) -> List[str]:
+    """Get every IP that directly or transitively inherits from ip."""
+    df = fetch_it_dataframe(
+        "SELECT descendant FROM ip_lineage WHERE ancestor = ? ORDER BY descendant",
+        (ip.strip(),)
+    )
+    return df['descendant'].tolist() if not df.empty else []
+
+
+def get_ip_ancestors(ip: str) -> List[str]:
+    """Get every IP that ip directly or transitively inherits from."""
+    df = fetch_it_dataframe(
+        "SELECT ancestor FROM ip_lineage WHERE descendant = ? ORDER BY ancestor",
+        (ip.strip(),)
+    )
+    return df['ancestor'].tolist() if not df.empty else []
+
+
+def get_ip_lineage_projects(ip: str) -> pd.DataFrame:
+    """Get the projects on ip and on every IP descending from it."""
+    query = """
+    SELECT p.id, p.task_index, p.project_name, p.ip, p.inherit_from_ip, p.reuse_ip, p.business_unit
+    FROM it_domain_projects p
+    WHERE TRIM(p.ip) = ?
+       OR TRIM(p.ip) IN (SELECT descendant FROM ip_lineage WHERE ancestor = ?)
+    ORDER BY p.ip, p.task_index
+    """
+    ip = ip.strip()
+    return fetch_it_dataframe(query, (ip, ip))
+
+
+def would_create_ip_cycle(ip: str, inherit_from_ip: str) -> bool:
+    """Check whether a project on ip inheriting from inherit_from_ip closes a cycle."""
+    ip, inherit_from_ip = (ip or '').strip(), (inherit_from_ip or '').strip()
+    if not ip or not inherit_from_ip or ip == inherit_from_ip:
+        return False
+    return inherit_from_ip in get_ip_descendants(ip)
+
+
+# NX Domain Functions (Simplified)
+# All 17 IT domain columns accepted by imported_it_data
+NX_IMPORT_COLUMNS = [
+    'task_index', 'project_name', 'spip_ip', 'ip', 'ip_postfix', 'ip_subtype', 'alternative_name',
+    'dv_engineer', 'digital_designer', 'analog_designer', 'business_unit',
+    'spip_url', 'wiki_url', 'spec_version', 'spec_path', 'inherit_from_ip', 'reuse_ip'
+]
+
+
+def _prepare_nx_import_frame(csv_data: pd.DataFrame) -> pd.DataFrame:
+    """Select the importable IT columns and blank out missing values."""
+    available_cols = [col for col in NX_IMPORT_COLUMNS if col in csv_data.columns]
+    
+    if 'project_name' not in available_cols:
+        raise ValueError("project_name column is required")
+    
+    # Select only available columns
+    import_data = csv_data[available_cols].copy()
+    
+    # Categorical columns can't take '' as a fill value
+    for col in import_data.select_dtypes(include=['category']).columns:
+        import_data[col] = import_data[col].astype(object)
+    
+    # Clean data - replace NaN with empty strings
+    import_data = import_data.fillna('')
+    
+    # SQLite can't bind pandas timestamps
+    for col in import_data.select_dtypes(include=['datetime', 'datetimetz']).columns:
+        import_data[col] = import_data[col].astype(str)
+    
+    return import_data
+
+
+def import_it_data_to_nx_complete(csv_data: pd.DataFrame) -> bool:
+    """
+    Import complete IT domain CSV data to NX domain (all 17 fields).
+    
+    Args:
+        csv_data: DataFrame with complete IT domain project data
+    
+    Returns:
+        bool: Success status
+    """
+    success, _ = import_it_data_to_nx_chunked([csv_data])
+    return success
+
+
+def _rebuild_imported_ip_lineage(conn: sqlite3.Connection):
+    """
+    Rebuild imported_ip_lineage from imported_it_data in one recursive query.
+    
+    The imported data is replaced wholesale, so the closure is recomputed
+    rather than maintained. UNION discards repeated pairs, which also stops
+    the recursion on cyclic input.
+    """
+    conn.execute("DELETE FROM imported_ip_lineage")
+    conn.execute("""
+        INSERT INTO imported_ip_lineage (ancestor, descendant)
+        WITH RECURSIVE
+            edges(parent_ip, child_ip) AS (
+                SELECT DISTINCT TRIM(inherit_from_ip), TRIM(ip)
+                FROM imported_it_data
+                WHERE TRIM(COALESCE(inherit_from_ip, '')) NOT IN ('', TRIM(COALESCE(ip, '')))
+                  AND TRIM(COALESCE(ip, '')) <> ''
+            ),
+            lineage(ancestor, descendant) AS (
+                SELECT DISTINCT TRIM(ip), TRIM(ip) FROM imported_it_data
+                WHERE TRIM(COALESCE(ip, '')) <> ''
+                UNION
+                SELECT l.ancestor, e.child_ip
+                FROM lineage l JOIN edges e ON e.parent_ip = l.descendant
+            )
+        SELECT ancestor, descendant FROM lineage
+    """)
+
+
+@routed_write(failure=(False, 0))
+def import_it_data_to_nx_chunked(chunks: Iterable[pd.DataFrame]) -> Tuple[bool, int]:
+    """
+    Replace NX imported IT data from a stream of DataFrame chunks.
+    
+    Each chunk is staged in temp tables of the NX writer's connection as it
+    arrives; a final write job swaps the staged rows into imported_it_data.
+    A failure part-way through leaves the old data intact, and other
+    sessions' writes are not held up while the chunks are read.
+    
+    Args:
+        chunks: Iterable of DataFrames with IT domain project columns
+    
+    Returns:
+        Tuple of (success status, number of rows imported)
+    """
+    writer = db_manager.get_nx_writer()
+    suffix = uuid.uuid4().hex
+    staging = f"nx_import_{suffix}"
+    staging_assignments = f"nx_import_assignments_{suffix}"
+    columns: List[str] = []
+    total_rows = 0
+    
+    def create_staging(conn: sqlite3.Connection):
+        conn.execute(f"CREATE TEMP TABLE {staging} AS SELECT * FROM imported_it_data WHERE 0")
+        conn.execute(f"CREATE TEMP TABLE {staging_assignments} (project_name TEXT, role TEXT, person TEXT)")
+    
+    def stage_chunk(import_data: pd.DataFrame):
+        def stage(conn: sqlite3.Connection):
+            placeholders = ", ".join("?" * len(import_data.columns))
+            conn.executemany(
+                f"INSERT INTO temp.{staging} ({', '.join(import_data.columns)}) VALUES ({placeholders})",
+                import_data.itertuples(index=False, name=None)
+            )
+            conn.executemany(
+                f"INSERT INTO temp.{staging_assignments} VALUES (?, ?, ?)",
+                _explode_assignments(import_data, 'project_name').itertuples(index=False, name=None)
+            )
+        return stage
+    
+    def replace_imported(conn: sqlite3.Connection):
+        # Clear existing data
+        conn.execute("DELETE FROM imported_it_data")
+        conn.execute("DELETE FROM imported_assignments")
+        if columns:
+            column_list = ", ".join(columns)
+            conn.execute(f"INSERT INTO imported_it_data ({column_list}) SELECT {column_list} FROM temp.{staging}")
+            conn.execute(f"""
+                INSERT OR IGNORE INTO imported_assignments (project_name, role, person)
+                SELECT project_name, role, person FROM temp.{staging_assignments}
+            """)
+        _rebuild_imported_ip_lineage(conn)
+        drop_staging(conn)
+    
+    def drop_staging(conn: sqlite3.Connection):
+        conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        conn.execute(f"DROP TABLE IF EXISTS temp.{staging_assignments}")
+    
+    try:
+        writer.execute(create_staging)
+        for chunk in chunks:
+            import_data = _prepare_nx_import_frame(chunk)
+            if import_data.empty:
+                continue
+            columns += [col for col in import_data.columns if col not in columns]
+            writer.execute(stage_chunk(import_data))
+            total_rows += len(import_data)
         
+        writer.execute(replace_imported)
+        logger.info(f"Imported {total_rows} IT projects to NX domain")
+        return True, total_rows
+    
     except Exception as e:
+        writer.submit(drop_staging)
         logger.error(f"Failed to import IT data to NX: {e}")
-        return False
+        return False, 0
 
 # Backward compatibility function
 def import_it_data_to_nx_minimal(csv_data: pd.DataFrame) -> bool:
@@ -286,19 +1414,152 @@ def import_it_data_to_nx_minimal(csv_data: pd.DataFrame) -> bool:
 def get_nx_imported_data() -> pd.DataFrame:
     """Get all imported IT data from NX domain."""
     query = "SELECT * FROM imported_it_view"
-    return fetch_nx_dataframe(query)
+    return _fetch_snapshot('imported_it_data', 'nx', ('imported_it_data',), query)
 
 
 def get_nx_to_summary() -> pd.DataFrame:
     """Get complete TO Summary with all 33 fields (IT + NX)."""
     query = "SELECT * FROM to_summary_view"
-    return fetch_nx_dataframe(query)
+    return _fetch_snapshot('to_summary', 'nx', ('imported_it_data', 'nx_regression_data'), query)
+
+
+@st.cache_data(show_spinner=False)
+def _compute_to_summary_stats(generation: Tuple[Tuple[str, int], ...]) -> Dict[str, Any]:
+    """Compute TO Summary dashboard metrics; cached per data generation."""
+    by_unit = fetch_nx_dataframe("""
+        SELECT COALESCE(it.business_unit, '') AS business_unit,
+               COUNT(*) AS projects,
+               COUNT(nx.line_coverage) AS with_nx_data,
+               SUM(nx.line_coverage) AS line_coverage_sum,
+               COUNT(nx.to_date) AS to_scheduled
+        FROM imported_it_data it
+        LEFT JOIN nx_regression_data nx ON it.project_name = nx.project_name
+        GROUP BY it.business_unit
+    """)
+    last_import = fetch_nx_dataframe("SELECT MAX(import_date) AS last_import FROM imported_it_data")['last_import']
+    last_import = last_import.iloc[0] if not last_import.empty and pd.notna(last_import.iloc[0]) else None
+    units = dict(zip(by_unit['business_unit'], by_unit['projects'].astype(int)))
+    with_nx_data = int(by_unit['with_nx_data'].sum())
+    return {
+        'total_projects': int(by_unit['projects'].sum()),
+        'cn_projects': units.get('CN', 0),
+        'pc_projects': units.get('PC', 0),
+        'business_units': {unit: count for unit, count in units.items() if unit},
+        'with_nx_data': with_nx_data,
+        'avg_line_coverage': (float(by_unit['line_coverage_sum'].sum()) / with_nx_data
+                              if with_nx_data else None),
+        'to_scheduled': int(by_unit['to_scheduled'].sum()),
+        'last_import': last_import
+    }
+
+
+def get_to_summary_stats() -> Dict[str, Any]:
+    """
+    Get headline TO Summary metrics from one grouped aggregate query.
+    
+    Rows are counted as in to_summary_view (imported projects left-joined
+    to their NX regression data).
+    
+    Returns:
+        Dict with total_projects, cn_projects, pc_projects, business_units
+        (project count per non-empty business unit), with_nx_data,
+        avg_line_coverage (None without NX data), to_scheduled and
+        last_import (latest import_date, None without imported data)
+    """
+    try:
+        return dict(_compute_to_summary_stats(get_data_generation('nx')))
+    except Exception as e:
+        logger.error(f"Failed to get TO Summary stats: {e}")
+        return {'total_projects': 0, 'cn_projects': 0, 'pc_projects': 0, 'business_units': {},
+                'with_nx_data': 0, 'avg_line_coverage': None, 'to_scheduled': 0, 'last_import': None}
 
 
 def get_nx_coverage_analysis() -> pd.DataFrame:
     """Get coverage analysis with quality assessment."""
     query = "SELECT * FROM coverage_analysis_view"
-    return fetch_nx_dataframe(query)
+    return _fetch_snapshot('coverage_analysis', 'nx', ('nx_regression_data',), query)
+
+
+@st.cache_data(show_spinner=False)
+def _compute_coverage_quality_counts(generation: Tuple[Tuple[str, int], ...]) -> Dict[str, int]:
+    """Count projects per coverage quality; cached per data generation."""
+    counts = fetch_nx_dataframe("""
+        SELECT coverage_quality, COUNT(*) AS projects
+        FROM coverage_analysis_view
+        GROUP BY coverage_quality
+    """)
+    return dict(zip(counts['coverage_quality'], counts['projects'].astype(int)))
+
+
+def get_coverage_quality_counts() -> Dict[str, int]:
+    """
+    Get the number of projects in each coverage quality band.
+    
+    Returns:
+        Dict mapping coverage_quality (e.g. 'Excellent') to project count;
+        empty without coverage data
+    """
+    try:
+        return dict(_compute_coverage_quality_counts(get_table_generations('nx', ('nx_regression_data',))))
+    except Exception as e:
+        logger.error(f"Failed to get coverage quality counts: {e}")
+        return {}
+
+
+def get_engineer_coverage(person: Optional[str] = None) -> pd.DataFrame:
+    """
+    Get coverage aggregated per engineer and role from engineer_coverage_view.
+    
+    Args:
+        person: Restrict to one person, or None for everyone
+    
+    Returns:
+        DataFrame with person, role, project count and average coverages
+    """
+    query = """
+    SELECT person, role,
+           COUNT(DISTINCT project_name) AS project_count,
+           COUNT(line_coverage) AS projects_with_nx_data,
+           ROUND(AVG(line_coverage), 1) AS avg_line_coverage,
+           ROUND(AVG(fsm_coverage), 1) AS avg_fsm_coverage,
+           ROUND(AVG(toggle_coverage), 1) AS avg_toggle_coverage
+    FROM engineer_coverage_view
+    {where}
+    GROUP BY person, role
+    ORDER BY person, role
+    """
+    if person:
+        return fetch_nx_dataframe(query.format(where="WHERE person = ?"), (person,))
+    return fetch_nx_dataframe(query.format(where=""))
+
+
+def get_ip_lineage_coverage(ip: Optional[str] = None) -> pd.DataFrame:
+    """
+    Get coverage aggregated over each IP and all of its derivatives.
+    
+    Args:
+        ip: Restrict to the lineage rooted at this IP, or None for every IP
+    
+    Returns:
+        DataFrame with one row per root IP and its average coverages
+    """
+    query = """
+    SELECT ancestor AS ip,
+           COUNT(DISTINCT descendant) AS ip_count,
+           COUNT(DISTINCT project_name) AS project_count,
+           COUNT(line_coverage) AS projects_with_nx_data,
+           ROUND(AVG(line_coverage), 1) AS avg_line_coverage,
+           ROUND(AVG(fsm_coverage), 1) AS avg_fsm_coverage,
+           ROUND(AVG(interface_toggle_coverage), 1) AS avg_interface_toggle_coverage,
+           ROUND(AVG(toggle_coverage), 1) AS avg_toggle_coverage
+    FROM ip_lineage_coverage_view
+    {where}
+    GROUP BY ancestor
+    ORDER BY ip_count DESC, ancestor
+    """
+    if ip:
+        return fetch_nx_dataframe(query.format(where="WHERE ancestor = ?"), (ip.strip(),))
+    return fetch_nx_dataframe(query.format(where=""))
 
 
 def get_nx_stats() -> Dict[str, Any]:
@@ -315,10 +1576,8 @@ def get_nx_stats() -> Dict[str, Any]:
         stats['nx_projects_with_data'] = nx_count
         
         # Coverage quality breakdown
-        coverage_df = get_nx_coverage_analysis()
-        if not coverage_df.empty:
-            quality_counts = coverage_df['coverage_quality'].value_counts().to_dict()
-            stats.update({f'coverage_{k.lower().replace(" ", "_")}': v for k, v in quality_counts.items()})
+        quality_counts = get_coverage_quality_counts()
+        stats.update({f'coverage_{k.lower().replace(" ", "_")}': v for k, v in quality_counts.items()})
         
         # Average coverage
         avg_coverage = fetch_nx_dataframe("""
@@ -339,39 +1598,112 @@ def get_nx_stats() -> Dict[str, Any]:
 
 
 # Validation Functions (Complete)
+# Column rules mirroring validate_project_data_complete and the CHECK
+# constraints in it_domain_schema.sql, with identical messages
+PROJECT_VALIDATION_RULES = {
+    'project_name': {
+        'required': True,
+        'messages': {'required': "Project name is required"}
+    },
+    'business_unit': {
+        'allowed_values': ['CN', 'PC', ''],
+        'allow_empty': True,
+        'messages': {'allowed_values': "Business unit must be 'CN', 'PC', or empty"}
+    },
+    'ip_subtype': {
+        'allowed_values': ['default', 'gen2x1'],
+        'allow_empty': True,
+        'messages': {'allowed_values': "IP subtype must be 'default' or 'gen2x1'"}
+    },
+    'reuse_ip': {
+        'allowed_values': ['Y', 'N', ''],
+        'allow_empty': True,
+        'messages': {'allowed_values': "Reuse IP must be 'Y', 'N', or empty"}
+    },
+    'spip_url': {
+        'prefix': 'http',
+        'allow_empty': True,
+        'messages': {'prefix': "SPIP URL must start with 'http' or be empty"}
+    },
+    'wiki_url': {
+        'prefix': 'http',
+        'allow_empty': True,
+        'messages': {'prefix': "Wiki URL must start with 'http' or be empty"}
+    },
+}
+
+_project_rule_engine = RuleEngine(PROJECT_VALIDATION_RULES)
+
+
+def _as_text(value: Any) -> str:
+    """Treat None and NaN as empty text, stringify anything else."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ''
+    return str(value)
+
+
 def validate_project_data_complete(data: Dict[str, Any]) -> list:
     """Validate complete project data for all 17 IT Domain fields."""
     errors = []
     
     # Required field validation
-    if not data.get('project_name', '').strip():
+    if not _as_text(data.get('project_name')).strip():
         errors.append("Project name is required")
     
     # Enum field validations
-    business_unit = data.get('business_unit', '')
+    business_unit = _as_text(data.get('business_unit'))
     if business_unit and business_unit not in ['CN', 'PC', '']:
         errors.append("Business unit must be 'CN', 'PC', or empty")
     
-    ip_subtype = data.get('ip_subtype', '')
+    ip_subtype = _as_text(data.get('ip_subtype'))
     if ip_subtype and ip_subtype not in ['default', 'gen2x1']:
         errors.append("IP subtype must be 'default' or 'gen2x1'")
     
-    reuse_ip = data.get('reuse_ip', '')
+    reuse_ip = _as_text(data.get('reuse_ip'))
     if reuse_ip and reuse_ip not in ['Y', 'N', '']:
         errors.append("Reuse IP must be 'Y', 'N', or empty")
     
     # URL validations
-    spip_url = data.get('spip_url', '')
+    spip_url = _as_text(data.get('spip_url'))
     if spip_url and not spip_url.startswith('http'):
         errors.append("SPIP URL must start with 'http' or be empty")
     
-    wiki_url = data.get('wiki_url', '')
+    wiki_url = _as_text(data.get('wiki_url'))
     if wiki_url and not wiki_url.startswith('http'):
         errors.append("Wiki URL must start with 'http' or be empty")
     
     return errors
 
+
+def validate_projects_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validate many projects at once, column-wise.
+    
+    Applies the same rules as validate_project_data_complete with vectorized
+    checks and reports the same messages in the same order for every row.
+    
+    Args:
+        df: DataFrame with IT Domain project columns
+    
+    Returns:
+        DataFrame indexed like df with an 'errors' list per failing row;
+        rows that pass every rule are omitted
+    """
+    if 'project_name' not in df.columns:
+        df = df.assign(project_name=None)
+    return _project_rule_engine.evaluate(df).errors_frame()
+
 # Backward compatibility function
 def validate_project_data_minimal(data: Dict[str, Any]) -> list:
     """Backward compatibility wrapper for validation."""
-    return validate_project_data_complete(data)
\ No newline at end of file
+    return validate_project_data_complete(data)
+
+
+@st.cache_resource
+def _start_write_server() -> WriteServer:
+    """Start the owner's server for replica writes, once per process."""
+    return WriteServer(parse_address(WRITE_ADDRESS), WRITE_AUTHKEY, _routed_writes)
+
+
+if DB_ROLE == 'owner':
+    _start_write_server()
@@ -0,0 +1,263 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+
+WriteJob = Callable[[sqlite3.Connection], Any]
+
+_WRITE_ACTIONS = (sqlite3.SQLITE_INSERT, sqlite3.SQLITE_UPDATE, sqlite3.SQLITE_DELETE)
+
+
+class DatabaseWriter:
+    """Serializes all writes to one SQLite database on a dedicated thread
+    
+    Jobs are functions taking the writer's connection. They are queued by
+    submit(), which returns a Future, and run one after another on the
+    writer thread, so session threads never write concurrently or interleave
+    transactions. Jobs that queue up while a batch runs are group-committed:
+    the next batch runs them in one transaction, each inside its own
+    savepoint, so a failing job is rolled back alone and the others still
+    commit with a single fsync.
+    
+    Jobs must not commit or roll back themselves, and must not wait on other
+    jobs of the same writer. Futures resolve only after their batch commits.
+    Separate processes each run their own writer; they take the database
+    write lock with BEGIN IMMEDIATE and wait up to busy_timeout for it.
+    
+    With a generation_table, each job that changed rows also bumps the
+    generation of every table it wrote to, once per job, so caches keyed on
+    the generations see the change. Written tables are noted by an
+    authorizer as the job's statements are prepared, triggers included.
+    """
+    
+    def __init__(self, db_path: Union[str, Path], max_batch: int = 100,
+                 busy_timeout: float = 30.0, name: Optional[str] = None,
+                 generation_table: Optional[str] = None):
+        """
+        Args:
+            db_path: Database file to write to
+            max_batch: Most jobs committed together in one transaction
+            busy_timeout: Seconds to wait for other processes' write locks
+            name: Thread name, for logs and debugging
+            generation_table: Table of (table_name, generation) counters to
+                bump for the tables each job writes, or None
+        """
+        self.db_path = str(db_path)
+        self.generation_table = generation_table
+        self._written: Set[str] = set()
+        self.max_batch = max_batch
+        self.busy_timeout = busy_timeout
+        self._queue: "queue.Queue[Optional[Tuple[Future, WriteJob, float]]]" = queue.Queue()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "jobs_submitted": 0,
+            "jobs_committed": 0,
+            "jobs_failed": 0,
+            "batches": 0,
+            "commit_ms_total": 0.0,
+            "commit_ms_max": 0.0,
+            "commit_ms_last": 0.0,
+            "latency_ms_total": 0.0,
+        }
+        self._ready = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=name or f"writer:{Path(self.db_path).name}",
+                                        daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: the writer issues BEGIN/COMMIT itself. Without a
+        # statement cache every statement is prepared, and so authorized, again
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout,
+                               isolation_level=None, check_same_thread=False,
+                               cached_statements=0 if self.generation_table else 128)
+        # WAL lets the shared read connections keep reading while a batch commits
+        conn.execute("PRAGMA journal_mode=WAL")
+        if self.generation_table:
+            conn.set_authorizer(self._authorize)
+        return conn
+    
+    def _authorize(self, action: int, arg1: Optional[str], arg2: Optional[str],
+                   db_name: Optional[str], trigger: Optional[str]) -> int:
+        if action in _WRITE_ACTIONS and db_name == "main":
+            self._written.add(arg1)
+        return sqlite3.SQLITE_OK
+    
+    def _bump_generations(self, conn: sqlite3.Connection, changes_before: int):
+        """Bump the generations of the tables the job just run wrote to"""
+        written, self._written = self._written, set()
+        if not written or conn.total_changes == changes_before:
+            return
+        conn.execute(
+            f"UPDATE {self.generation_table} SET generation = generation + 1 "
+            f"WHERE table_name IN ({', '.join('?' * len(written))})",
+            tuple(written)
+        )
+    
+    def submit(self, job: WriteJob) -> Future:
+        """Queue a write job and return a Future for its result"""
+        if not self._thread.is_alive():
+            raise RuntimeError("Database writer is closed")
+        future: Future = Future()
+        with self._metrics_lock:
+            self._metrics["jobs_submitted"] += 1
+        self._queue.put((future, job, time.perf_counter()))
+        return future
+    
+    def execute(self, job: WriteJob, timeout: Optional[float] = None) -> Any:
+        """Run a write job and wait for it to commit; its exception is re-raised"""
+        return self.submit(job).result(timeout)
+    
+    def _run(self):
+        try:
+            conn = self._connect()
+        except BaseException as e:
+            self._startup_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                stop = False
+                while len(batch) < self.max_batch:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                try:
+                    self._run_batch(conn, batch)
+                except BaseException as e:
+                    # A failed BEGIN, SAVEPOINT or ROLLBACK TO must not stop the writer
+                    self._fail_batch(conn, batch, e)
+                if stop:
+                    break
+        finally:
+            conn.close()
+    
+    def _run_batch(self, conn: sqlite3.Connection, batch: List[Tuple[Future, WriteJob, float]]):
+        """Run jobs in one transaction, each isolated by a savepoint"""
+        batch = [item for item in batch if item[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            for future, _, _ in batch:
+                future.set_exception(e)
+            self._record(batch_size=0, failed=len(batch))
+            return
+        
+        succeeded = []
+        failed = 0
+        for future, job, submitted in batch:
+            conn.execute("SAVEPOINT write_job")
+            self._written.clear()
+            changes_before = conn.total_changes
+            try:
+                result = job(conn)
+                if self.generation_table:
+                    self._bump_generations(conn, changes_before)
+                conn.execute("RELEASE write_job")
+                succeeded.append((future, result, submitted))
+            except BaseException as e:
+                conn.execute("ROLLBACK TO write_job")
+                conn.execute("RELEASE write_job")
+                future.set_exception(e)
+                failed += 1
+        
+        commit_started = time.perf_counter()
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for future, _, _ in succeeded:
+                future.set_exception(e)
+            self._record(batch_size=0, failed=failed + len(succeeded))
+            return
+        
+        committed = time.perf_counter()
+        for future, result, _ in succeeded:
+            future.set_result(result)
+        self._record(
+            batch_size=len(succeeded),
+            failed=failed,
+            commit_ms=(committed - commit_started) * 1000,
+            latency_ms=sum((committed - submitted) * 1000 for _, _, submitted in succeeded)
+        )
+    
+    def _fail_batch(self, conn: sqlite3.Connection, batch: List[Tuple[Future, WriteJob, float]],
+                    error: BaseException):
+        """Roll back a batch that broke down and fail its unresolved futures"""
+        try:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+        except sqlite3.Error:
+            pass
+        pending = [future for future, _, _ in batch if not future.done()]
+        for future in pending:
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(error)
+        self._record(batch_size=0, failed=len(pending))
+    
+    def _record(self, batch_size: int, failed: int, commit_ms: Optional[float] = None,
+                latency_ms: float = 0.0):
+        with self._metrics_lock:
+            self._metrics["jobs_committed"] += batch_size
+            self._metrics["jobs_failed"] += failed
+            self._metrics["latency_ms_total"] += latency_ms
+            if commit_ms is not None:
+                self._metrics["batches"] += 1
+                self._metrics["commit_ms_total"] += commit_ms
+                self._metrics["commit_ms_last"] = commit_ms
+                self._metrics["commit_ms_max"] = max(self._metrics["commit_ms_max"], commit_ms)
+    
+    def metrics(self) -> Dict[str, float]:
+        """
+        Get queue and commit statistics
+        
+        Returns:
+            Dict with queue_depth, jobs_submitted, jobs_committed,
+            jobs_failed, batches, avg_batch_size, commit_ms_last,
+            commit_ms_avg, commit_ms_max and latency_ms_avg (submit to
+            commit of committed jobs)
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        batches = metrics.pop("batches")
+        committed = metrics["jobs_committed"]
+        return {
+            "queue_depth": self._queue.qsize(),
+            "jobs_submitted": metrics["jobs_submitted"],
+            "jobs_committed": committed,
+            "jobs_failed": metrics["jobs_failed"],
+            "batches": batches,
+            "avg_batch_size": committed / batches if batches else 0.0,
+            "commit_ms_last": metrics["commit_ms_last"],
+            "commit_ms_avg": metrics["commit_ms_total"] / batches if batches else 0.0,
+            "commit_ms_max": metrics["commit_ms_max"],
+            "latency_ms_avg": metrics["latency_ms_total"] / committed if committed else 0.0,
+        }
+    
+    def close(self, timeout: Optional[float] = None):
+        """Finish the queued jobs and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
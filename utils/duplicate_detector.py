@@ -0,0 +1,141 @@
+import re
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple, Optional
+
+import pandas as pd
+
+
+class DuplicateDetector:
+    """Finds likely duplicate project names with a blocking index
+    
+    Names are normalized (lowercase, letters and digits only) so variants
+    like "RLE1339" and "RLE-1339 " share a key. Names that differ slightly
+    are found through an inverted index of character trigrams: only names
+    sharing enough trigrams are compared, which keeps the number of
+    comparisons close to linear instead of comparing every pair.
+    
+    Numbers are compared exactly: names whose digit runs differ, like
+    sequential "RLE1338" and "RLE1339", are different projects however
+    similar they look. Fuzzy matching only applies to the letters.
+    """
+    
+    NAME_FIELDS = ['project_name', 'alternative_name']
+    NGRAM = 3
+    
+    def __init__(self, threshold: float = 0.85, max_block_size: int = 200):
+        """
+        Args:
+            threshold: Minimum similarity (0-1) for two names to be reported
+            max_block_size: Trigrams shared by more names than this are too
+                common to be useful for blocking and are ignored
+        """
+        self.threshold = threshold
+        self.max_block_size = max_block_size
+    
+    @staticmethod
+    def normalize(name) -> str:
+        """Reduce a name to its blocking key"""
+        if name is None or (isinstance(name, float) and pd.isna(name)):
+            return ""
+        return re.sub(r"[^0-9a-z]", "", str(name).lower())
+    
+    @staticmethod
+    def numbers(key: str) -> Tuple[int, ...]:
+        """Digit runs of a normalized name, as numbers"""
+        return tuple(int(run) for run in re.findall(r"[0-9]+", key))
+    
+    def _ngrams(self, key: str) -> set:
+        padded = f"^{key}$"
+        if len(padded) <= self.NGRAM:
+            return {padded}
+        return {padded[i:i + self.NGRAM] for i in range(len(padded) - self.NGRAM + 1)}
+    
+    def _entries(self, df: pd.DataFrame, source: str) -> List[Tuple[str, object, str, str, str]]:
+        """Collect (source, row, field, name, key) for every non-empty name"""
+        entries = []
+        for field in self.NAME_FIELDS:
+            if field not in df.columns:
+                continue
+            for row, name in df[field].items():
+                key = self.normalize(name)
+                if key:
+                    entries.append((source, row, field, str(name), key))
+        return entries
+    
+    def find_duplicates(self, incoming: pd.DataFrame,
+                        existing: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Find incoming rows that likely duplicate each other or existing rows
+        
+        Args:
+            incoming: Rows about to be imported, with project_name and
+                optionally alternative_name columns
+            existing: Rows already stored, in the same format
+        
+        Returns:
+            DataFrame with one row per likely duplicate pair: the incoming
+            row and name, the matching source ('existing' or 'import'),
+            row and name, and the similarity. Identical normalized names
+            have similarity 1.0.
+        """
+        entries = self._entries(incoming, "import")
+        if existing is not None and not existing.empty:
+            entries += self._entries(existing, "existing")
+        
+        columns = ['row', 'field', 'name', 'match_source', 'match_row',
+                   'match_field', 'match_name', 'similarity']
+        if not entries:
+            return pd.DataFrame(columns=columns)
+        
+        # Blocking index: trigram -> entry positions
+        grams = [self._ngrams(entry[4]) for entry in entries]
+        numbers = [self.numbers(entry[4]) for entry in entries]
+        index: Dict[str, List[int]] = defaultdict(list)
+        same_key: Dict[str, List[int]] = defaultdict(list)
+        for pos, entry_grams in enumerate(grams):
+            same_key[entries[pos][4]].append(pos)
+            for gram in entry_grams:
+                index[gram].append(pos)
+        
+        best: Dict[Tuple, Tuple] = {}
+        for pos, entry in enumerate(entries):
+            if entry[0] != "import":
+                continue
+            
+            shared = Counter()
+            for gram in grams[pos]:
+                block = index[gram]
+                if len(block) <= self.max_block_size:
+                    shared.update(block)
+            # Identical keys always match, even when all their trigrams are common
+            for other_pos in same_key[entry[4]]:
+                shared[other_pos] = len(grams[pos])
+            
+            for other_pos, count in shared.items():
+                other = entries[other_pos]
+                if other_pos == pos or (other[0] == "import" and other[1] == entry[1]):
+                    continue
+                # Both incoming: report each pair once
+                if other[0] == "import" and other_pos < pos:
+                    continue
+                # Names with different numbers are different projects
+                if numbers[pos] != numbers[other_pos]:
+                    continue
+                # Skip pairs sharing too few trigrams to come near the threshold
+                if 2 * count / (len(grams[pos]) + len(grams[other_pos])) < self.threshold - 0.2:
+                    continue
+                
+                if entry[4] == other[4]:
+                    similarity = 1.0
+                else:
+                    similarity = SequenceMatcher(None, entry[4], other[4]).ratio()
+                if similarity < self.threshold:
+                    continue
+                
+                pair = (entry[1], other[0], other[1])
+                if pair not in best or best[pair][-1] < similarity:
+                    best[pair] = (entry[1], entry[2], entry[3], other[0], other[1],
+                                  other[2], other[3], round(similarity, 3))
+        
+        result = pd.DataFrame(list(best.values()), columns=columns)
+        return result.sort_values(['similarity', 'row'], ascending=[False, True], ignore_index=True)
@@ -1,71 +1,288 @@
+import numpy as np
 import pandas as pd
 import os
-from typing import Dict, List, Optional, Tuple, Any
+import re
+import uuid
+import hashlib
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Any, Iterator, Union
 from datetime import datetime
 import openpyxl
+from .schema_converter import SchemaConverter
+from .validation_rules import RuleEngine, ValidationResult
+
+
+class WorkbookSession:
+    """An Excel workbook opened once, keeping its sheet names for reuse"""
+    
+    def __init__(self, content: bytes, content_hash: str):
+        self.content_hash = content_hash
+        self.size = len(content)
+        self._excel_file = pd.ExcelFile(BytesIO(content))
+        self.sheet_names = self._excel_file.sheet_names
+        # pd.ExcelFile is not safe to parse from several threads at once
+        self._lock = threading.Lock()
+    
+    def parse(self, sheet_name: Optional[str] = None) -> pd.DataFrame:
+        """Parse a sheet (the first one by default) into a DataFrame"""
+        with self._lock:
+            return self._excel_file.parse(sheet_name if sheet_name else 0)
+    
+    def close(self):
+        self._excel_file.close()
+
+
+class ExcelUpload:
+    """An uploaded Excel file held in memory, identified by its content hash"""
+    
+    def __init__(self, name: str, content: bytes):
+        self.name = name
+        self.content = content
+        self.size = len(content)
+        self.content_hash = hashlib.sha256(content).hexdigest()
+    
+    def buffer(self) -> BytesIO:
+        """Return a fresh file-like view of the content"""
+        return BytesIO(self.content)
+
+
+ExcelSource = Union[str, ExcelUpload]
+
 
 class ExcelHandler:
     """Handles Excel file operations including reading, validation, and conversion"""
     
     SUPPORTED_EXTENSIONS = ['.xlsx', '.xls', '.xlsm', '.xlsb']
+    STREAMING_EXTENSIONS = ['.xlsx', '.xlsm']
+    DEFAULT_CHUNK_ROWS = 10000
+    
+    # Process-wide LRU caches shared by all handler instances, so that
+    # Streamlit reruns reuse the workbook and sheets parsed on earlier runs.
+    MAX_CACHED_WORKBOOKS = 4
+    MAX_CACHED_SHEETS = 8
+    _workbook_cache: "OrderedDict[str, WorkbookSession]" = OrderedDict()
+    _sheet_cache: "OrderedDict[Tuple[str, str, Any], pd.DataFrame]" = OrderedDict()
+    _file_hashes: Dict[Tuple[str, int, int], str] = {}
+    _cache_lock = threading.Lock()
+    
+    # Reference counts of temp files created by save_temp_file
+    _temp_refs: Dict[str, int] = {}
     
     def __init__(self):
         self.temp_dir = "data/temp"
         os.makedirs(self.temp_dir, exist_ok=True)
     
-    def validate_excel_file(self, file_path: str) -> Tuple[bool, str]:
+    def _hash_file(self, file_path: str) -> Tuple[str, bytes]:
+        """Return the content hash of a file along with its bytes"""
+        with open(file_path, "rb") as f:
+            content = f.read()
+        return hashlib.sha256(content).hexdigest(), content
+    
+    def open_upload(self, uploaded_file) -> ExcelUpload:
+        """Wrap an uploaded file for parsing from memory, without a disk write"""
+        return ExcelUpload(uploaded_file.name, uploaded_file.getvalue())
+    
+    def _cache_session(self, content: bytes, content_hash: str) -> WorkbookSession:
+        """Return the cached session for content, creating it if needed"""
+        with self._cache_lock:
+            session = self._workbook_cache.get(content_hash)
+            if session is not None:
+                self._workbook_cache.move_to_end(content_hash)
+                return session
+        
+        session = WorkbookSession(content, content_hash)
+        
+        with self._cache_lock:
+            self._workbook_cache[content_hash] = session
+            while len(self._workbook_cache) > self.MAX_CACHED_WORKBOOKS:
+                evicted_hash, evicted = self._workbook_cache.popitem(last=False)
+                evicted.close()
+                for key in [k for k in self._sheet_cache if k[0] == evicted_hash]:
+                    del self._sheet_cache[key]
+                for key in [k for k, v in self._file_hashes.items() if v == evicted_hash]:
+                    del self._file_hashes[key]
+        return session
+    
+    def open_workbook(self, source: ExcelSource) -> WorkbookSession:
+        """Open a workbook once and reuse it for files with identical content
+        
+        Sessions are cached by content hash with LRU eviction. The hash of a
+        path is remembered for as long as its size and mtime are unchanged.
+        
+        Args:
+            source: Path to an Excel file, or an in-memory ExcelUpload
+        """
+        if isinstance(source, ExcelUpload):
+            return self._cache_session(source.content, source.content_hash)
+        
+        file_path = source
+        stat = os.stat(file_path)
+        stat_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        
+        with self._cache_lock:
+            content_hash = self._file_hashes.get(stat_key)
+            session = self._workbook_cache.get(content_hash) if content_hash else None
+            if session is not None:
+                self._workbook_cache.move_to_end(content_hash)
+                return session
+        
+        content_hash, content = self._hash_file(file_path)
+        
+        with self._cache_lock:
+            self._file_hashes[stat_key] = content_hash
+        return self._cache_session(content, content_hash)
+    
+    @staticmethod
+    def _source_name(source: ExcelSource) -> str:
+        return source.name if isinstance(source, ExcelUpload) else source
+    
+    @staticmethod
+    def _openpyxl_source(source: ExcelSource):
+        return source.buffer() if isinstance(source, ExcelUpload) else source
+    
+    def validate_excel_file(self, source: ExcelSource) -> Tuple[bool, str]:
         """Validate if the file is a valid Excel file"""
-        if not os.path.exists(file_path):
+        if not isinstance(source, ExcelUpload) and not os.path.exists(source):
             return False, "File does not exist"
         
-        file_ext = os.path.splitext(file_path)[1].lower()
+        file_ext = os.path.splitext(self._source_name(source))[1].lower()
         if file_ext not in self.SUPPORTED_EXTENSIONS:
             return False, f"Unsupported file type. Supported types: {', '.join(self.SUPPORTED_EXTENSIONS)}"
         
         try:
-            # Try to open the file to validate it's a valid Excel
-            pd.read_excel(file_path, nrows=0)
+            # Opening the workbook validates it and caches it for later reads
+            self.open_workbook(source)
             return True, "Valid Excel file"
         except Exception as e:
             return False, f"Invalid Excel file: {str(e)}"
     
-    def read_excel_data(self, file_path: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
-        """Read Excel file and return as DataFrame"""
+    def read_excel_data(self, source: ExcelSource, sheet_name: Optional[str] = None,
+                        column_types: Optional[Dict[str, str]] = None, cache: bool = True) -> pd.DataFrame:
+        """Read Excel file and return as DataFrame
+        
+        Parsed sheets are cached by workbook content hash and sheet name, so
+        repeated reads of an unchanged upload don't re-parse the workbook.
+        
+        Args:
+            source: Path to the Excel file, or an in-memory ExcelUpload
+            sheet_name: Sheet to read (first sheet if None)
+            column_types: Target table schema used for type conversion
+            cache: Keep the parsed sheet in the process-wide cache; callers
+                that hold the frame themselves pass False
+        """
         try:
+            session = self.open_workbook(source)
+            cache_key = (
+                session.content_hash,
+                sheet_name if sheet_name else session.sheet_names[0],
+                tuple(sorted(column_types.items())) if column_types else None
+            )
+            
+            with self._cache_lock:
+                df = self._sheet_cache.get(cache_key)
+                if df is not None:
+                    self._sheet_cache.move_to_end(cache_key)
+                    # Deep copy: without Copy-on-Write, in-place edits would reach the cache
+                    return df.copy(deep=True)
+            
             # Read Excel file
-            if sheet_name:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-            else:
-                df = pd.read_excel(file_path)
+            df = session.parse(sheet_name)
             
             # Clean column names
             df.columns = df.columns.str.strip()
             
             # Convert data types
-            df = self._convert_data_types(df)
+            df = self._convert_data_types(df, column_types)
             
-            return df
+            if not cache:
+                return df
+            
+            with self._cache_lock:
+                self._sheet_cache[cache_key] = df
+                while len(self._sheet_cache) > self.MAX_CACHED_SHEETS:
+                    self._sheet_cache.popitem(last=False)
+            
+            return df.copy(deep=True)
         except Exception as e:
             raise Exception(f"Error reading Excel file: {str(e)}")
     
-    def _convert_data_types(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Convert DataFrame data types appropriately"""
-        for col in df.columns:
-            # Try to convert to numeric if possible
-            if df[col].dtype == 'object':
-                try:
-                    df[col] = pd.to_numeric(df[col], errors='ignore')
-                except:
-                    pass
-            
-            # Convert datetime columns
-            if 'date' in col.lower() or 'time' in col.lower():
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
-                except:
-                    pass
+    def iter_excel_chunks(self, source: ExcelSource, sheet_name: Optional[str] = None,
+                          chunk_size: int = DEFAULT_CHUNK_ROWS,
+                          column_types: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """Stream a sheet as typed DataFrame chunks of at most chunk_size rows
         
-        return df
+        Uses openpyxl in read-only mode so memory stays proportional to the
+        chunk size rather than the sheet size. The first row is the header;
+        fully empty rows are skipped. Column types are decided from the
+        first chunk, driven by the target table's column_types when given,
+        and every later chunk is converted to the same types.
+        """
+        file_ext = os.path.splitext(self._source_name(source))[1].lower()
+        if file_ext not in self.STREAMING_EXTENSIONS:
+            raise ValueError(f"Streaming supports {', '.join(self.STREAMING_EXTENSIONS)} files only")
+        
+        workbook = openpyxl.load_workbook(self._openpyxl_source(source), read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+            rows = worksheet.iter_rows(values_only=True)
+            
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [
+                str(name).strip() if name is not None else f"Unnamed: {i}"
+                for i, name in enumerate(header)
+            ]
+            width = len(columns)
+            converter = SchemaConverter(column_types)
+            
+            def typed(records: List[tuple]) -> pd.DataFrame:
+                df = pd.DataFrame.from_records(records, columns=columns)
+                return converter.convert(df) if converter.fixed_plan is not None else converter.fix_plan(df)
+            
+            buffer = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                # Read-only rows can be ragged; align them to the header
+                if len(row) != width:
+                    row = row[:width] + (None,) * (width - len(row))
+                buffer.append(row)
+                if len(buffer) >= chunk_size:
+                    yield typed(buffer)
+                    buffer = []
+            
+            if buffer:
+                yield typed(buffer)
+        finally:
+            workbook.close()
+    
+    def preview_excel_stream(self, source: ExcelSource, sheet_name: Optional[str] = None,
+                             rows: int = 10,
+                             column_types: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Preview a sheet by streaming only its first rows"""
+        first_chunk = next(
+            self.iter_excel_chunks(source, sheet_name, chunk_size=rows, column_types=column_types),
+            None
+        )
+        return first_chunk if first_chunk is not None else pd.DataFrame()
+    
+    def estimate_sheet_rows(self, source: ExcelSource, sheet_name: Optional[str] = None) -> Optional[int]:
+        """Estimate the data row count from the sheet's recorded dimensions"""
+        workbook = openpyxl.load_workbook(self._openpyxl_source(source), read_only=True)
+        try:
+            worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+            return worksheet.max_row - 1 if worksheet.max_row else None
+        finally:
+            workbook.close()
+    
+    def _convert_data_types(self, df: pd.DataFrame,
+                            column_types: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Convert DataFrame data types, driven by the target schema when given"""
+        return SchemaConverter(column_types).convert(df)
     
     def validate_columns(self, df: pd.DataFrame, required_columns: List[str]) -> Tuple[bool, List[str]]:
         """Validate if DataFrame has all required columns"""
@@ -82,102 +299,151 @@ class ExcelHandler:
     
     def validate_data_quality(self, df: pd.DataFrame, validation_rules: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """Validate data quality based on provided rules"""
-        errors = []
-        
-        for column, rules in validation_rules.items():
-            if column not in df.columns:
-                continue
-            
-            # Check for nulls if not allowed
-            if rules.get('not_null', False):
-                null_count = df[column].isnull().sum()
-                if null_count > 0:
-                    errors.append(f"Column '{column}' has {null_count} null values")
-            
-            # Check data type
-            if 'dtype' in rules:
-                expected_type = rules['dtype']
-                if expected_type == 'numeric':
-                    non_numeric = df[column].apply(lambda x: not isinstance(x, (int, float)) and pd.notna(x)).sum()
-                    if non_numeric > 0:
-                        errors.append(f"Column '{column}' has {non_numeric} non-numeric values")
-            
-            # Check allowed values
-            if 'allowed_values' in rules:
-                invalid_values = df[~df[column].isin(rules['allowed_values'])][column].unique()
-                if len(invalid_values) > 0:
-                    errors.append(f"Column '{column}' has invalid values: {invalid_values[:5]}")
-            
-            # Check value range
-            if 'min_value' in rules:
-                below_min = df[df[column] < rules['min_value']].shape[0]
-                if below_min > 0:
-                    errors.append(f"Column '{column}' has {below_min} values below minimum ({rules['min_value']})")
-            
-            if 'max_value' in rules:
-                above_max = df[df[column] > rules['max_value']].shape[0]
-                if above_max > 0:
-                    errors.append(f"Column '{column}' has {above_max} values above maximum ({rules['max_value']})")
+        result = self.evaluate_data_quality(df, validation_rules)
+        return result.is_valid, result.messages
+    
+    def evaluate_data_quality(self, df: pd.DataFrame, validation_rules: Dict[str, Any]) -> ValidationResult:
+        """Validate data quality and return row-level results
         
-        return len(errors) == 0, errors
+        All rules are compiled into vectorized checks; the result carries a
+        per-row error bitmap as well as the aggregated messages.
+        """
+        return RuleEngine(validation_rules).evaluate(df)
     
     def preview_data(self, df: pd.DataFrame, rows: int = 10) -> pd.DataFrame:
         """Return a preview of the DataFrame"""
         return df.head(rows)
     
-    def get_sheet_names(self, file_path: str) -> List[str]:
+    def get_sheet_names(self, source: ExcelSource) -> List[str]:
         """Get all sheet names from Excel file"""
         try:
-            excel_file = pd.ExcelFile(file_path)
-            return excel_file.sheet_names
+            return self.open_workbook(source).sheet_names
         except Exception as e:
             raise Exception(f"Error reading sheet names: {str(e)}")
     
-    def save_temp_file(self, uploaded_file, filename: str) -> str:
-        """Save uploaded file to temp directory"""
-        temp_path = os.path.join(self.temp_dir, filename)
+    def save_temp_file(self, uploaded_file, filename: str, session_id: str = "shared") -> str:
+        """Save uploaded file to a uniquely named temp file of the session
+        
+        Files live under ``data/temp/<session_id>/`` and are registered with
+        one reference; call release_temp_file when done with them. Prefer
+        open_upload, which parses uploads without writing them to disk.
+        """
+        session_dir = os.path.join(self.temp_dir, self._safe_name(session_id))
+        os.makedirs(session_dir, exist_ok=True)
+        temp_path = os.path.join(session_dir, f"{uuid.uuid4().hex}_{self._safe_name(filename)}")
         with open(temp_path, "wb") as f:
             f.write(uploaded_file.getbuffer())
+        with self._cache_lock:
+            self._temp_refs[temp_path] = 1
         return temp_path
     
-    def clean_temp_files(self, older_than_hours: int = 24):
-        """Clean old temp files"""
+    @staticmethod
+    def _safe_name(name: str) -> str:
+        """Reduce a client-supplied name to a safe single path component"""
+        return re.sub(r"[^A-Za-z0-9._-]", "_", os.path.basename(str(name))) or "upload"
+    
+    def acquire_temp_file(self, temp_path: str):
+        """Add a reference to a temp file so it outlives its creator's release"""
+        with self._cache_lock:
+            if temp_path not in self._temp_refs:
+                raise KeyError(f"Unknown temp file: {temp_path}")
+            self._temp_refs[temp_path] += 1
+    
+    def release_temp_file(self, temp_path: str):
+        """Drop a reference to a temp file, deleting it with the last one"""
+        with self._cache_lock:
+            count = self._temp_refs.get(temp_path, 0) - 1
+            if count > 0:
+                self._temp_refs[temp_path] = count
+                return
+            self._temp_refs.pop(temp_path, None)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        session_dir = os.path.dirname(temp_path)
+        if session_dir != self.temp_dir and not os.listdir(session_dir):
+            os.rmdir(session_dir)
+    
+    @contextmanager
+    def temp_file(self, uploaded_file, filename: str, session_id: str = "shared") -> Iterator[str]:
+        """Save an upload to a session temp file for the duration of a with block"""
+        temp_path = self.save_temp_file(uploaded_file, filename, session_id)
+        try:
+            yield temp_path
+        finally:
+            self.release_temp_file(temp_path)
+    
+    def clean_temp_files(self, older_than_hours: int = 24, session_id: Optional[str] = None):
+        """Clean old temp files that are no longer referenced
+        
+        Args:
+            older_than_hours: Only remove files older than this
+            session_id: Restrict cleanup to one session's directory
+        """
+        root = self.temp_dir
+        if session_id is not None:
+            root = os.path.join(self.temp_dir, self._safe_name(session_id))
+            if not os.path.isdir(root):
+                return
+        
         current_time = datetime.now()
-        for filename in os.listdir(self.temp_dir):
-            file_path = os.path.join(self.temp_dir, filename)
-            if os.path.isfile(file_path):
+        with self._cache_lock:
+            referenced = set(self._temp_refs)
+        for dir_path, _, filenames in os.walk(root, topdown=False):
+            for filename in filenames:
+                file_path = os.path.join(dir_path, filename)
+                if file_path in referenced:
+                    continue
                 file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
                 if (current_time - file_time).total_seconds() > older_than_hours * 3600:
                     os.remove(file_path)
+            if dir_path != self.temp_dir and not os.listdir(dir_path):
+                os.rmdir(dir_path)
     
-    def split_comma_separated_values(self, df: pd.DataFrame, column: str, 
+    def split_comma_separated_values(self, df: pd.DataFrame, column: Union[str, List[str]],
                                    distribute_column: Optional[str] = None) -> pd.DataFrame:
-        """Split comma-separated values in a column into multiple rows"""
-        if column not in df.columns:
+        """Split comma-separated values in one or more columns into multiple rows
+        
+        Each column is split independently, so a row holding two values in one
+        column and three in another becomes six rows. If distribute_column is
+        given, its value is divided by the number of rows the original row
+        was split into.
+        """
+        columns = [column] if isinstance(column, str) else list(column)
+        columns = [col for col in columns if col in df.columns]
+        if not columns:
             return df
         
-        # Create a copy to avoid modifying original
-        result_df = df.copy()
-        
-        # Split the column and expand
-        split_rows = []
-        for idx, row in result_df.iterrows():
-            if pd.notna(row[column]) and ',' in str(row[column]):
-                values = [v.strip() for v in str(row[column]).split(',')]
-                
-                # If distribute_column is specified, divide its value
-                if distribute_column and distribute_column in result_df.columns:
-                    distributed_value = row[distribute_column] / len(values) if len(values) > 0 else row[distribute_column]
-                else:
-                    distributed_value = None
-                
-                for value in values:
-                    new_row = row.copy()
-                    new_row[column] = value
-                    if distributed_value is not None:
-                        new_row[distribute_column] = distributed_value
-                    split_rows.append(new_row)
-            else:
-                split_rows.append(row)
-        
-        return pd.DataFrame(split_rows).reset_index(drop=True)
\ No newline at end of file
+        # Positional index so exploded rows can be traced to their source row
+        result_df = df.reset_index(drop=True)
+        # Number of rows each current row's original row has been split into
+        split_counts = np.ones(len(result_df), dtype=np.int64)
+        
+        for col in columns:
+            values = result_df[col].astype(object)
+            text = values.astype("string")
+            has_comma = text.str.contains(',', regex=False).fillna(False).to_numpy(dtype=bool)
+            if not has_comma.any():
+                continue
+            
+            parts = text[has_comma].str.split(',')
+            split_counts[has_comma] *= parts.str.len().to_numpy(dtype=np.int64)
+            
+            values[has_comma] = parts
+            result_df[col] = values
+            result_df = result_df.explode(col)
+            
+            positions = result_df.index.to_numpy()
+            split_counts = split_counts[positions]
+            from_split = has_comma[positions]
+            result_df = result_df.reset_index(drop=True)
+            
+            # Strip only the values that came out of a split
+            stripped = result_df[col].to_numpy(dtype=object)
+            stripped[from_split] = pd.Series(stripped[from_split], dtype="string").str.strip().to_numpy(dtype=object)
+            result_df[col] = stripped
+        
+        if distribute_column and distribute_column in result_df.columns:
+            divided = result_df[distribute_column] / split_counts
+            result_df[distribute_column] = divided.where(split_counts > 1, result_df[distribute_column])
+        
+        return result_df
@@ -1,24 +1,150 @@
 import json
 import os
 import shutil
+import sqlite3
+import threading
+import time
+from contextlib import closing
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import pandas as pd
 from pathlib import Path
+from .backup_store import BackupStore
 
 class JSONManager:
     """Manages JSON file operations including save, load, update, and backup"""
     
-    def __init__(self):
+    CATALOG_FILENAME = ".catalog.db"
+    
+    # Directory mtimes within this window of a scan's start may also cover
+    # changes made during the scan, so they aren't trusted to skip the next one
+    RACY_MTIME_NS = 2_000_000_000
+    
+    # Directory mtime at the last full catalog refresh, per JSON directory
+    _scanned_mtimes: Dict[str, int] = {}
+    _scan_lock = threading.Lock()
+    
+    def __init__(self, backup_keep_last: int = 10, backup_keep_daily_days: int = 30):
         self.json_dir = "data/json"
         self.backup_dir = "data/backups"
+        self.catalog_path = os.path.join(self.json_dir, self.CATALOG_FILENAME)
         self.ensure_directories()
+        self.backup_store = BackupStore(
+            self.backup_dir,
+            keep_last=backup_keep_last,
+            keep_daily_days=backup_keep_daily_days
+        )
     
     def ensure_directories(self):
         """Ensure required directories exist"""
         os.makedirs(self.json_dir, exist_ok=True)
         os.makedirs(self.backup_dir, exist_ok=True)
     
+    def _connect_catalog(self) -> sqlite3.Connection:
+        """Open the metadata catalog, creating its table on first use"""
+        conn = sqlite3.connect(self.catalog_path, timeout=10)
+        # Truncating instead of deleting the journal keeps catalog writes
+        # from touching the JSON directory's mtime
+        conn.execute("PRAGMA journal_mode=TRUNCATE")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS json_catalog (
+                filename TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                record_count INTEGER,
+                version TEXT,
+                created TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_json_catalog_mtime ON json_catalog(mtime)")
+        return conn
+    
+    def _catalog_upsert(self, conn: sqlite3.Connection, filename: str,
+                        metadata: Optional[Dict] = None):
+        """Record a JSON file's stat and metadata in the catalog
+        
+        If metadata is not supplied it is read from the file itself.
+        """
+        file_path = os.path.join(self.json_dir, filename)
+        stat = os.stat(file_path)
+        
+        if metadata is None:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f).get("metadata", {})
+            except Exception:
+                metadata = {}
+        
+        record_count = metadata.get("record_count")
+        conn.execute(
+            "INSERT OR REPLACE INTO json_catalog (filename, size, mtime, record_count, version, created) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                filename,
+                stat.st_size,
+                stat.st_mtime,
+                record_count if isinstance(record_count, int) else None,
+                metadata.get("version"),
+                metadata.get("created")
+            )
+        )
+    
+    def _update_catalog(self, filename: str, metadata: Optional[Dict] = None):
+        """Update a single catalog entry after a write"""
+        with closing(self._connect_catalog()) as conn, conn:
+            self._catalog_upsert(conn, filename, metadata)
+    
+    def _remove_from_catalog(self, filename: str):
+        """Drop a catalog entry after its file was deleted"""
+        with closing(self._connect_catalog()) as conn, conn:
+            conn.execute("DELETE FROM json_catalog WHERE filename = ?", (filename,))
+    
+    def refresh_catalog(self, force: bool = False):
+        """Bring the catalog in line with the JSON directory
+        
+        Only files whose size or mtime differ from the catalog are re-read,
+        so a scan costs one stat per file and no JSON parsing. The scan is
+        skipped entirely while the directory's mtime is the one seen by the
+        last scan: adding, removing or renaming a file moves it, and files
+        rewritten through this class update the catalog as they are saved.
+        
+        Args:
+            force: Scan even if the directory looks unchanged, e.g. to pick
+                up files edited in place by other tools
+        """
+        key = os.path.abspath(self.json_dir)
+        started = time.time_ns()
+        dir_mtime = os.stat(self.json_dir).st_mtime_ns
+        with self._scan_lock:
+            if not force and self._scanned_mtimes.get(key) == dir_mtime:
+                return
+        
+        with closing(self._connect_catalog()) as conn, conn:
+            known = {
+                row[0]: (row[1], row[2])
+                for row in conn.execute("SELECT filename, size, mtime FROM json_catalog")
+            }
+            
+            present = set()
+            with os.scandir(self.json_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.json') or not entry.is_file():
+                        continue
+                    present.add(entry.name)
+                    stat = entry.stat()
+                    if known.get(entry.name) != (stat.st_size, stat.st_mtime):
+                        self._catalog_upsert(conn, entry.name)
+            
+            stale = [(name,) for name in known if name not in present]
+            if stale:
+                conn.executemany("DELETE FROM json_catalog WHERE filename = ?", stale)
+        
+        with self._scan_lock:
+            if started - dir_mtime > self.RACY_MTIME_NS:
+                self._scanned_mtimes[key] = dir_mtime
+            else:
+                self._scanned_mtimes.pop(key, None)
+    
     def save_to_json(self, data: Any, filename: str, metadata: Optional[Dict] = None) -> str:
         """Save data to JSON file with optional metadata"""
         # Ensure filename has .json extension
@@ -43,13 +169,15 @@ class JSONManager:
         
         # Convert DataFrame to dict if necessary
         if isinstance(data, pd.DataFrame):
-            json_data["data"] = data.to_dict(orient='records')
+            # Object dtype lets missing values of any column become null
+            json_data["data"] = data.astype(object).where(data.notna(), None).to_dict(orient='records')
             json_data["metadata"]["record_count"] = len(data)
         
         # Write to file
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(json_data, f, indent=2, ensure_ascii=False, default=str)
+            self._update_catalog(filename, json_data["metadata"])
             return file_path
         except Exception as e:
             raise Exception(f"Error saving JSON file: {str(e)}")
@@ -156,7 +284,11 @@ class JSONManager:
         return list(existing_map.values())
     
     def create_backup(self, filename: str) -> str:
-        """Create a backup of the JSON file"""
+        """Create a compressed, deduplicated backup of the JSON file
+        
+        Returns:
+            Path of the backup manifest
+        """
         if not filename.endswith('.json'):
             filename += '.json'
         
@@ -164,60 +296,82 @@ class JSONManager:
         if not os.path.exists(source_path):
             raise FileNotFoundError(f"Source file not found: {filename}")
         
-        # Create backup filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"{os.path.splitext(filename)[0]}_{timestamp}.json"
-        backup_path = os.path.join(self.backup_dir, backup_filename)
-        
         try:
-            shutil.copy2(source_path, backup_path)
-            return backup_path
+            return self.backup_store.create(source_path)
         except Exception as e:
             raise Exception(f"Error creating backup: {str(e)}")
     
-    def list_json_files(self) -> List[Dict[str, Any]]:
-        """List all JSON files with metadata"""
-        files = []
-        
-        for filename in os.listdir(self.json_dir):
-            if filename.endswith('.json'):
-                file_path = os.path.join(self.json_dir, filename)
-                
-                # Get file info
-                stat = os.stat(file_path)
-                
-                # Try to load metadata
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        metadata = data.get("metadata", {})
-                except:
-                    metadata = {}
-                
-                files.append({
-                    "filename": filename,
-                    "size": stat.st_size,
-                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "record_count": metadata.get("record_count", "Unknown"),
-                    "version": metadata.get("version", "Unknown"),
-                    "created": metadata.get("created", "Unknown")
-                })
-        
-        return sorted(files, key=lambda x: x["modified"], reverse=True)
+    def list_backups(self, filename: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List backups, newest first, optionally for a single JSON file"""
+        if filename and not filename.endswith('.json'):
+            filename += '.json'
+        return self.backup_store.list_backups(filename)
+    
+    def list_json_files(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """List JSON files with metadata, newest first
+        
+        Args:
+            limit: Maximum number of entries to return (all if None)
+            offset: Number of entries to skip, for pagination
+        """
+        self.refresh_catalog()
+        
+        query = ("SELECT filename, size, mtime, record_count, version, created "
+                 "FROM json_catalog ORDER BY mtime DESC")
+        params: tuple = ()
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = (limit, offset)
+        
+        with closing(self._connect_catalog()) as conn:
+            rows = conn.execute(query, params).fetchall()
+        
+        return [
+            {
+                "filename": filename,
+                "size": size,
+                "modified": datetime.fromtimestamp(mtime).isoformat(),
+                "record_count": record_count if record_count is not None else "Unknown",
+                "version": version or "Unknown",
+                "created": created or "Unknown"
+            }
+            for filename, size, mtime, record_count, version, created in rows
+        ]
+    
+    def count_json_files(self) -> int:
+        """Return the number of cataloged JSON files"""
+        self.refresh_catalog()
+        with closing(self._connect_catalog()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM json_catalog").fetchone()[0]
     
     def restore_from_backup(self, backup_filename: str, target_filename: str) -> str:
-        """Restore a JSON file from backup"""
-        backup_path = os.path.join(self.backup_dir, backup_filename)
-        if not os.path.exists(backup_path):
-            raise FileNotFoundError(f"Backup file not found: {backup_filename}")
+        """Restore a JSON file from backup
         
+        Accepts backup manifests from the backup store as well as plain
+        JSON copies left in the backup directory by older versions.
+        """
         if not target_filename.endswith('.json'):
             target_filename += '.json'
         
         target_path = os.path.join(self.json_dir, target_filename)
         
+        if backup_filename.endswith(BackupStore.MANIFEST_SUFFIX):
+            try:
+                self.backup_store.restore(backup_filename, target_path)
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                raise Exception(f"Error restoring from backup: {str(e)}")
+            self._update_catalog(target_filename)
+            return target_path
+        
+        backup_path = os.path.join(self.backup_dir, backup_filename)
+        if not os.path.exists(backup_path):
+            raise FileNotFoundError(f"Backup file not found: {backup_filename}")
+        
         try:
             shutil.copy2(backup_path, target_path)
+            self._update_catalog(target_filename)
             return target_path
         except Exception as e:
             raise Exception(f"Error restoring from backup: {str(e)}")
@@ -237,6 +391,7 @@ class JSONManager:
         
         try:
             os.remove(file_path)
+            self._remove_from_catalog(filename)
             return True
         except Exception as e:
             raise Exception(f"Error deleting file: {str(e)}")
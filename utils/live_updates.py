@@ -0,0 +1,42 @@
+import streamlit as st
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+
+from .database import get_table_generations
+
+# Seconds between change checks of an open page
+POLL_INTERVAL = 10
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def watch_data_changes(domain: str, tables: Tuple[str, ...], key: str,
+                       hold: Optional[Callable[[], bool]] = None):
+    """
+    Rerun the page when tables it shows change, checking every POLL_INTERVAL.
+    
+    Runs as a fragment, so a check reruns only this function: one PRAGMA
+    data_version query, plus a read of data_generation after a commit. Only
+    when a watched table's generation moved is the whole page rerun; the
+    page's fetches are cached per table generation, so only frames built
+    from the changed tables are queried again.
+    
+    Args:
+        domain: 'it' or 'nx'
+        tables: Tables whose changes the page should pick up
+        key: Page identifier for the last seen generations
+        hold: Returns True while the page must not rerun, e.g. with unsaved
+            edits; the change is then announced instead
+    """
+    state_key = f"live_generation_{key}"
+    generation = get_table_generations(domain, tables)
+    seen = st.session_state.get(state_key)
+    
+    if seen is not None and seen != generation:
+        if hold is not None and hold():
+            st.caption("🟡 Data changed elsewhere; it will load once your edits are saved")
+            return
+        st.session_state[state_key] = generation
+        st.rerun(scope="app")
+    
+    st.session_state[state_key] = generation
+    st.caption(f"🟢 Live · checked {datetime.now().strftime('%H:%M:%S')}")
@@ -0,0 +1,296 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+import pandas as pd
+
+
+class MemoryBudgetError(MemoryError):
+    """Raised when a session can't hold an object within its memory budget"""
+
+
+class ServerBusyError(RuntimeError):
+    """Raised when heavy work waited too long for a free slot"""
+
+
+def current_session_id() -> str:
+    """Id of the Streamlit session running this script, or 'shared' outside one"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except ImportError:
+        ctx = None
+    return ctx.session_id if ctx is not None else "shared"
+
+
+def estimate_bytes(value: Any) -> int:
+    """Approximate memory held by a frame, payload or other object"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("key", "value", "nbytes", "last_used")
+    
+    def __init__(self, key: Hashable, value: Any, nbytes: int):
+        self.key = key
+        self.value = value
+        self.nbytes = nbytes
+        self.last_used = time.time()
+
+
+class MemoryBudget:
+    """Accounts for the large objects each session keeps in memory
+    
+    Sessions hold uploaded frames, cached tables and the like in named
+    slots through hold() or get_or_load() instead of st.session_state.
+    Each session has a byte budget; when a new object would exceed it, the
+    session's least recently used slots are evicted, and the whole process
+    is kept under a total budget the same way across sessions. Evicted
+    slots are simply rebuilt by their loader on next use. An object larger
+    than a session's whole budget is rejected with MemoryBudgetError.
+    
+    Heavy work (parsing uploads, building exports) runs through
+    heavy_work(), which admits a fixed number of jobs at once; the others
+    wait for a slot and give up with ServerBusyError after max_wait.
+    """
+    
+    def __init__(self, session_bytes: int, total_bytes: int, max_heavy_jobs: int = 2,
+                 max_wait: float = 60.0, idle_seconds: float = 1800.0):
+        """
+        Args:
+            session_bytes: Most bytes one session may hold
+            total_bytes: Most bytes all sessions together may hold
+            max_heavy_jobs: Heavy jobs allowed to run at once
+            max_wait: Seconds a heavy job waits for a slot before giving up
+            idle_seconds: Sessions unused this long are dropped entirely
+        """
+        self.session_bytes = session_bytes
+        self.total_bytes = total_bytes
+        self.max_heavy_jobs = max_heavy_jobs
+        self.max_wait = max_wait
+        self.idle_seconds = idle_seconds
+        self._sessions: Dict[str, "OrderedDict[str, _Entry]"] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_heavy_jobs)
+        self._running: Dict[int, Dict[str, Any]] = {}
+        self._waiting = 0
+        self._evictions = 0
+        self._rejections = 0
+    
+    def get(self, session_id: str, name: str) -> Any:
+        """Get the object in a session slot, or None if empty or evicted"""
+        with self._lock:
+            entry = self._sessions.get(session_id, {}).get(name)
+            if entry is None:
+                return None
+            entry.last_used = time.time()
+            self._sessions[session_id].move_to_end(name)
+            return entry.value
+    
+    def hold(self, session_id: str, name: str, value: Any, key: Hashable = None) -> Any:
+        """
+        Put an object in a session slot, evicting older slots to make room
+        
+        Args:
+            session_id: Owning session
+            name: Slot name; a previous object in the slot is released
+            value: Object to hold
+            key: Identifies what the object was built from, for get_or_load
+        
+        Returns:
+            value
+        
+        Raises:
+            MemoryBudgetError: If value alone exceeds the session budget
+        """
+        nbytes = estimate_bytes(value)
+        with self._lock:
+            slots = self._sessions.setdefault(session_id, OrderedDict())
+            slots.pop(name, None)
+            if nbytes > self.session_bytes:
+                self._rejections += 1
+                raise MemoryBudgetError(
+                    f"This data needs about {_format_mb(nbytes)}, more than the "
+                    f"{_format_mb(self.session_bytes)} each session may hold. "
+                    f"Split it into smaller files or use a streaming import."
+                )
+            slots[name] = _Entry(key, value, nbytes)
+            self._drop_idle_sessions()
+            self._evict(session_id)
+        return value
+    
+    def get_or_load(self, session_id: str, name: str, key: Hashable,
+                    load: Callable[[], Any], heavy: Optional[str] = None) -> Any:
+        """
+        Get a slot's object if it was built from key, otherwise load and hold it
+        
+        Args:
+            session_id: Owning session
+            name: Slot name
+            key: Identifies the source, e.g. an upload's content hash
+            load: Builds the object
+            heavy: Label to run load as admitted heavy work, or None
+        """
+        with self._lock:
+            entry = self._sessions.get(session_id, {}).get(name)
+            if entry is not None and entry.key == key:
+                entry.last_used = time.time()
+                self._sessions[session_id].move_to_end(name)
+                return entry.value
+            if entry is not None:
+                # Don't keep the outdated object alive while its replacement loads
+                del self._sessions[session_id][name]
+        
+        if heavy is None:
+            value = load()
+        else:
+            with self.heavy_work(heavy, session_id):
+                value = load()
+        return self.hold(session_id, name, value, key)
+    
+    def deferred(self, label: str, build: Callable[[], Any],
+                 session_id: Optional[str] = None) -> Callable[[], Any]:
+        """Wrap build to run as heavy work whenever it is called, e.g. by a download button"""
+        def run():
+            with self.heavy_work(label, session_id):
+                return build()
+        return run
+    
+    def release(self, session_id: str, name: Optional[str] = None):
+        """Empty one slot of a session, or all of them"""
+        with self._lock:
+            if name is None:
+                self._sessions.pop(session_id, None)
+            else:
+                self._sessions.get(session_id, {}).pop(name, None)
+    
+    def _session_total(self, session_id: str) -> int:
+        return sum(entry.nbytes for entry in self._sessions.get(session_id, {}).values())
+    
+    def _evict(self, session_id: str):
+        """Evict least recently used slots until both budgets are met"""
+        slots = self._sessions[session_id]
+        while self._session_total(session_id) > self.session_bytes and len(slots) > 1:
+            slots.popitem(last=False)
+            self._evictions += 1
+        
+        total = sum(self._session_total(sid) for sid in self._sessions)
+        while total > self.total_bytes:
+            candidates = [
+                (next(iter(s.values())).last_used, sid)
+                for sid, s in self._sessions.items() if s and (sid != session_id or len(s) > 1)
+            ]
+            if not candidates:
+                break
+            _, oldest = min(candidates)
+            _, entry = self._sessions[oldest].popitem(last=False)
+            total -= entry.nbytes
+            self._evictions += 1
+    
+    def _drop_idle_sessions(self):
+        cutoff = time.time() - self.idle_seconds
+        for sid in [sid for sid, slots in self._sessions.items()
+                    if not slots or max(entry.last_used for entry in slots.values()) < cutoff]:
+            del self._sessions[sid]
+    
+    @contextmanager
+    def heavy_work(self, label: str, session_id: Optional[str] = None) -> Iterator[None]:
+        """
+        Run a block as heavy work, waiting for one of max_heavy_jobs slots
+        
+        Raises:
+            ServerBusyError: If no slot freed up within max_wait seconds
+        """
+        with self._lock:
+            self._waiting += 1
+        try:
+            admitted = self._slots.acquire(timeout=self.max_wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not admitted:
+            with self._lock:
+                self._rejections += 1
+            raise ServerBusyError(
+                f"The server is busy with other imports and exports ({self.max_heavy_jobs} run at a time). "
+                f"Please try again in a minute."
+            )
+        
+        job_id = threading.get_ident()
+        with self._lock:
+            self._running[job_id] = {"label": label, "session": session_id or "shared",
+                                     "started": time.time()}
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+            self._slots.release()
+    
+    def usage(self) -> pd.DataFrame:
+        """One row per session: held slots, bytes, share of budget and last use"""
+        with self._lock:
+            self._drop_idle_sessions()
+            rows = [
+                {
+                    "session": sid,
+                    "slots": ", ".join(slots),
+                    "held_mb": self._session_total(sid) / 2**20,
+                    "budget_used": self._session_total(sid) / self.session_bytes,
+                    "last_used": pd.Timestamp(max(entry.last_used for entry in slots.values()), unit="s"),
+                }
+                for sid, slots in self._sessions.items()
+            ]
+        return pd.DataFrame(rows, columns=["session", "slots", "held_mb", "budget_used", "last_used"])
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get process-wide totals
+        
+        Returns:
+            Dict with sessions, held_bytes, total_bytes (budget),
+            heavy_running, heavy_waiting, max_heavy_jobs, evictions,
+            rejections and running (list of label/session/seconds dicts)
+        """
+        now = time.time()
+        with self._lock:
+            running: List[Dict[str, Any]] = [
+                {"label": job["label"], "session": job["session"], "seconds": now - job["started"]}
+                for job in self._running.values()
+            ]
+            return {
+                "sessions": len(self._sessions),
+                "held_bytes": sum(self._session_total(sid) for sid in self._sessions),
+                "total_bytes": self.total_bytes,
+                "heavy_running": len(running),
+                "heavy_waiting": self._waiting,
+                "max_heavy_jobs": self.max_heavy_jobs,
+                "evictions": self._evictions,
+                "rejections": self._rejections,
+                "running": running,
+            }
+
+
+def _format_mb(nbytes: int) -> str:
+    return f"{nbytes / 2**20:.0f} MB"
+
+
+# Process-wide budget, sized for the single app container
+memory_budget = MemoryBudget(
+    session_bytes=int(os.environ.get("DV_SESSION_MEMORY_MB", "256")) * 2**20,
+    total_bytes=int(os.environ.get("DV_TOTAL_MEMORY_MB", "1024")) * 2**20,
+    max_heavy_jobs=int(os.environ.get("DV_HEAVY_JOBS", "2")),
+    max_wait=float(os.environ.get("DV_HEAVY_WAIT_SECONDS", "60")),
+)
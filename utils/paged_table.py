@@ -0,0 +1,75 @@
+import streamlit as st
+from typing import Any, Dict, List, Optional
+
+from .database import fetch_table_page, get_source_columns
+
+# Rows sent to the browser per page
+DEFAULT_PAGE_SIZE = 100
+
+
+@st.fragment
+def display_paged_table(source: str, key: str, columns: Optional[List[str]] = None,
+                        column_config: Optional[Dict[str, Any]] = None,
+                        default_sort: Optional[str] = None, descending: bool = False,
+                        page_size: int = DEFAULT_PAGE_SIZE, height: int = 400):
+    """
+    Display a database table or view one page at a time.
+    
+    Search, sort and paging run in SQL through fetch_table_page, so only
+    the visible rows are fetched and sent to the browser. The table is a
+    fragment: browsing it reruns only the table, not the page. Formatting
+    is left to column_config, so cells keep their values and sort as such.
+    
+    Args:
+        source: One of the tables or views in PAGED_SOURCES
+        key: Widget key prefix, unique on the page
+        columns: Columns to show, all by default
+        column_config: st.dataframe column configuration
+        default_sort: Column sorted by initially
+        descending: Initial sort direction
+        page_size: Rows per page
+        height: Table height in pixels
+    """
+    columns = columns or get_source_columns(source)
+    
+    col1, col2, col3, col4 = st.columns([2, 3, 2, 1])
+    with col1:
+        search_column = st.selectbox("Search in:", columns, key=f"{key}_search_column",
+                                     index=columns.index('project_name') if 'project_name' in columns else 0)
+    with col2:
+        search = st.text_input("Contains:", key=f"{key}_search").strip()
+    with col3:
+        sort_options = ["(none)"] + columns
+        sort_column = st.selectbox(
+            "Sort by:", sort_options, key=f"{key}_sort",
+            index=sort_options.index(default_sort) if default_sort in sort_options else 0
+        )
+    with col4:
+        sort_descending = st.toggle("Desc", value=descending, key=f"{key}_desc")
+    sort_column = None if sort_column == "(none)" else sort_column
+    
+    # A new search or order starts again from the first page
+    view = (search_column, search, sort_column, sort_descending)
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_view") != view:
+        st.session_state[f"{key}_view"] = view
+        st.session_state[page_key] = 1
+    
+    page_number = st.session_state.get(page_key, 1)
+    page, total = fetch_table_page(source, columns, search_column, search, sort_column,
+                                   sort_descending, limit=page_size, offset=(page_number - 1) * page_size)
+    page_count = max((total + page_size - 1) // page_size, 1)
+    if page_number > page_count:
+        # Rows went away since the page was picked
+        page_number = st.session_state[page_key] = page_count
+        page, total = fetch_table_page(source, columns, search_column, search, sort_column,
+                                       sort_descending, limit=page_size, offset=(page_number - 1) * page_size)
+    offset = (page_number - 1) * page_size
+    
+    st.number_input("Page:", min_value=1, max_value=page_count, step=1, key=page_key)
+    st.dataframe(page, use_container_width=True, height=height, hide_index=True,
+                 column_config=column_config)
+    if total:
+        st.caption(f"Rows {offset + 1}–{offset + len(page)} of {total} · page {page_number} of {page_count}")
+    else:
+        st.caption("No matching rows")
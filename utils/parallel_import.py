@@ -0,0 +1,116 @@
+import os
+import multiprocessing
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Any, Iterator
+from .csv_handler import CSVHandler
+from .schema_converter import SchemaConverter
+
+
+def parse_upload(name: str, content: bytes, column_types: Optional[Dict[str, str]] = None,
+                 all_sheets: bool = False) -> List[Dict[str, Any]]:
+    """Parse one uploaded CSV or Excel file into per-sheet column arrays
+    
+    Runs in a worker process, so it only takes and returns picklable
+    values. Each sheet becomes a dict with 'file', 'sheet', 'rows',
+    'columns' (column name -> array; low-cardinality text stays
+    categorical, which pickles as compact codes) and 'error'.
+    
+    Args:
+        name: Original file name, used to pick the reader
+        content: Raw file bytes
+        column_types: Target table schema used for type conversion
+        all_sheets: Parse every sheet of a workbook instead of the first
+    """
+    results = []
+    try:
+        if os.path.splitext(name)[1].lower() == ".csv":
+            chunks = CSVHandler().iter_csv_chunks(content, column_types)
+            sheets = [(None, pd.concat(list(chunks), ignore_index=True))]
+        else:
+            with pd.ExcelFile(BytesIO(content)) as workbook:
+                sheet_names = workbook.sheet_names if all_sheets else workbook.sheet_names[:1]
+                sheets = [(sheet, workbook.parse(sheet)) for sheet in sheet_names]
+    except Exception as e:
+        return [{"file": name, "sheet": None, "rows": 0, "columns": {}, "error": str(e)}]
+    
+    converter = SchemaConverter(column_types)
+    for sheet, df in sheets:
+        try:
+            df.columns = df.columns.astype(str).str.strip()
+            df = converter.convert(df)
+            results.append({
+                "file": name,
+                "sheet": sheet,
+                "rows": len(df),
+                "columns": {col: df[col].array for col in df.columns},
+                "error": None
+            })
+        except Exception as e:
+            results.append({"file": name, "sheet": sheet, "rows": 0, "columns": {}, "error": str(e)})
+    return results
+
+
+class ParallelImporter:
+    """Parses several uploads at once in a process pool
+    
+    Parsing is CPU-bound, so each file is parsed in its own worker process
+    and results are yielded as they finish. Writing stays with the caller,
+    which should load all results through a single connection.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker processes to use (CPU count by default)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+    
+    def parse_files(self, files: List[Tuple[str, bytes]], column_types: Optional[Dict[str, str]] = None,
+                    all_sheets: bool = False) -> Iterator[Dict[str, Any]]:
+        """Parse files in parallel, yielding one result per sheet as files complete
+        
+        Args:
+            files: (file name, content) pairs
+            column_types: Target table schema used for type conversion
+            all_sheets: Parse every sheet of each workbook instead of the first
+        """
+        workers = min(self.max_workers, len(files))
+        if workers <= 1:
+            # Not worth starting processes for a single file or core
+            for name, content in files:
+                yield from parse_upload(name, content, column_types, all_sheets)
+            return
+        
+        # Spawned workers don't inherit the Streamlit server's threads and locks
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {
+                pool.submit(parse_upload, name, content, column_types, all_sheets): name
+                for name, content in files
+            }
+            for future in as_completed(futures):
+                try:
+                    yield from future.result()
+                except Exception as e:
+                    yield {"file": futures[future], "sheet": None, "rows": 0, "columns": {}, "error": str(e)}
+    
+    @staticmethod
+    def to_frame(result: Dict[str, Any]) -> pd.DataFrame:
+        """Rebuild the DataFrame of a parse result"""
+        return pd.DataFrame(result["columns"])
+    
+    @staticmethod
+    def report(results: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Summarize parse results as one row per file and sheet"""
+        return pd.DataFrame([
+            {
+                "file": result["file"],
+                "sheet": result["sheet"] or "",
+                "rows": result["rows"],
+                "status": "Error" if result["error"] else "OK",
+                "error": result["error"] or ""
+            }
+            for result in results
+        ])
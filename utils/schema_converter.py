@@ -0,0 +1,168 @@
+import pandas as pd
+from typing import Dict, Optional
+
+
+class SchemaConverter:
+    """Converts DataFrame columns to the types of a target table schema
+    
+    Columns named in the schema are converted according to their declared
+    SQLite type. Other columns get a type inferred from a sample of their
+    values. Each column is converted with a single vectorized call and the
+    result is assembled in one pass, and low-cardinality text columns can be
+    stored as categoricals.
+    """
+    
+    SAMPLE_SIZE = 500
+    CATEGORY_MIN_ROWS = 50
+    CATEGORY_MAX_RATIO = 0.5
+    
+    def __init__(self, column_types: Optional[Dict[str, str]] = None, categorize: bool = True):
+        """
+        Args:
+            column_types: Mapping of column name to declared SQL type,
+                e.g. from PRAGMA table_info
+            categorize: Cast low-cardinality text columns to category
+        """
+        self.column_types = column_types or {}
+        self.categorize = categorize
+        self.fixed_plan: Optional[Dict[str, str]] = None
+    
+    @staticmethod
+    def affinity(declared_type: str) -> str:
+        """Map a declared SQL type to 'integer', 'real', 'datetime' or 'text'
+        
+        Follows SQLite's type affinity rules, with DATE/TIME types treated as
+        datetimes since that is how the schemas use them.
+        """
+        declared = (declared_type or "").upper()
+        if "INT" in declared:
+            return "integer"
+        if any(token in declared for token in ("CHAR", "CLOB", "TEXT")):
+            return "text"
+        if "DATE" in declared or "TIME" in declared:
+            return "datetime"
+        if any(token in declared for token in ("REAL", "FLOA", "DOUB", "DEC", "NUM")):
+            return "real"
+        return "text"
+    
+    def read_dtypes(self) -> Dict[str, str]:
+        """Map schema columns to dtypes for pd.read_csv
+        
+        Integers read as nullable Int64 and reals as float64. Text and date
+        columns read as strings so values like "1.0" or "007" keep their
+        exact form instead of being inferred as numbers.
+        """
+        dtypes = {}
+        for col, declared_type in self.column_types.items():
+            kind = self.affinity(declared_type)
+            if kind == "integer":
+                dtypes[col] = "Int64"
+            elif kind == "real":
+                dtypes[col] = "float64"
+            else:
+                dtypes[col] = "str"
+        return dtypes
+    
+    def _infer_kind(self, name: str, series: pd.Series) -> str:
+        """Infer a target kind for a column that isn't in the schema"""
+        if "date" in str(name).lower() or "time" in str(name).lower():
+            return "datetime"
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            return "keep"
+        
+        sample = series.dropna().head(self.SAMPLE_SIZE)
+        if sample.empty:
+            return "text"
+        if pd.to_numeric(sample, errors="coerce").notna().all():
+            return "real"
+        return "text"
+    
+    def plan(self, df: pd.DataFrame) -> Dict[str, str]:
+        """Decide the target kind of every column"""
+        plan = {}
+        for col in df.columns:
+            if col in self.column_types:
+                plan[col] = self.affinity(self.column_types[col])
+            else:
+                plan[col] = self._infer_kind(col, df[col])
+        return plan
+    
+    def fix_plan(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert a first chunk and keep its column types for later convert() calls
+        
+        Inference and the categorical cast otherwise look at each chunk on
+        its own, so chunks of one source could come out with different
+        dtypes. After this, every chunk is converted to the types this one
+        got; a column cast to category here stays categorical.
+        
+        Returns:
+            The converted chunk
+        """
+        self.fixed_plan = None
+        converted = self.convert(df)
+        plan = self.plan(df)
+        for col in plan:
+            dtype = converted[col].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                plan[col] = "category"
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                plan[col] = "datetime"
+            elif pd.api.types.is_bool_dtype(dtype):
+                plan[col] = "keep"
+            elif pd.api.types.is_integer_dtype(dtype):
+                plan[col] = "integer"
+            elif pd.api.types.is_float_dtype(dtype):
+                plan[col] = "real"
+        self.fixed_plan = plan
+        # Once more with the fixed plan, so e.g. int64 here matches Int64 in chunks with gaps
+        return self.convert(converted)
+    
+    def _to_numeric(self, series: pd.Series, integer: bool) -> pd.Series:
+        """Convert to numbers, leaving the column alone if values would be lost"""
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            converted = series
+        else:
+            converted = pd.to_numeric(series, errors="coerce")
+            if (converted.isna() & series.notna()).any():
+                return series
+        
+        if integer:
+            non_null = converted.dropna()
+            if (non_null == non_null.round()).all():
+                return converted.astype("Int64")
+        return converted
+    
+    def _to_text(self, series: pd.Series) -> pd.Series:
+        """Keep text as is, or as a categorical when values repeat heavily"""
+        if not self.categorize or len(series) < self.CATEGORY_MIN_ROWS:
+            return series
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            return series
+        if series.nunique(dropna=True) <= len(series) * self.CATEGORY_MAX_RATIO:
+            return series.astype("category")
+        return series
+    
+    def convert(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a new DataFrame with every column converted to its planned type"""
+        plan = self.plan(df)
+        if self.fixed_plan is not None:
+            plan.update((col, kind) for col, kind in self.fixed_plan.items() if col in plan)
+        
+        columns = {}
+        for col, kind in plan.items():
+            series = df[col]
+            if kind == "integer":
+                columns[col] = self._to_numeric(series, integer=True)
+            elif kind == "real":
+                columns[col] = self._to_numeric(series, integer=False)
+            elif kind == "datetime":
+                columns[col] = (series if pd.api.types.is_datetime64_any_dtype(series)
+                                else pd.to_datetime(series, errors="coerce"))
+            elif kind == "category":
+                columns[col] = series.astype("category")
+            elif kind == "text":
+                columns[col] = series if self.fixed_plan is not None else self._to_text(series)
+            else:
+                columns[col] = series
+        
+        return pd.DataFrame(columns, index=df.index)
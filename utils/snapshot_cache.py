@@ -0,0 +1,228 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+# pandas 3 always copies on write; pandas 2 only with the option turned on
+_COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3 or pd.get_option("mode.copy_on_write") is True
+
+
+class SnapshotCache:
+    """Columnar on-disk snapshots of DataFrames, shared between processes
+    
+    Each snapshot is a directory of ``.npy`` files, one or two per column,
+    plus a JSON manifest, stored under ``<cache_dir>/<name>/<key>/``. The key
+    identifies the data the frame was built from (e.g. the data generation),
+    so a snapshot never has to be invalidated: new data gets a new key.
+    
+    Snapshots are loaded with ``np.load(mmap_mode='c')``. Numeric, nullable,
+    datetime and categorical columns are backed directly by the mapped
+    files, so every process on the host shares one physical copy through the
+    page cache; writes stay private to the writing process. Plain text
+    columns are stored dictionary-encoded and decoded once per process.
+    """
+    
+    FORMAT_VERSION = 1
+    MANIFEST = "manifest.json"
+    
+    # Generations kept per snapshot name; older ones are deleted on write.
+    # Processes that still map a deleted snapshot keep reading it safely.
+    KEEP_GENERATIONS = 2
+    
+    def __init__(self, cache_dir: str = "data/snapshots"):
+        """
+        Args:
+            cache_dir: Directory holding the snapshots; point every process
+                that should share snapshots at the same directory
+        """
+        self.cache_dir = cache_dir
+        self._loaded: Dict[str, Tuple[str, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @classmethod
+    def key_for(cls, *parts: Any) -> str:
+        """Derive a snapshot key from values identifying the source data"""
+        digest = hashlib.sha256(repr((cls.FORMAT_VERSION,) + parts).encode("utf-8"))
+        return digest.hexdigest()[:20]
+    
+    def _snapshot_dir(self, name: str, key: str) -> str:
+        return os.path.join(self.cache_dir, name, key)
+    
+    @staticmethod
+    def _encode_text(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Pack strings into one UTF-8 buffer and an offsets array"""
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+    
+    @staticmethod
+    def _decode_text(buffer: np.ndarray, offsets: np.ndarray) -> List[str]:
+        data = buffer.tobytes()
+        return [data[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])]
+    
+    def _column_parts(self, series: pd.Series) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """Split a column into its manifest entry and the arrays to store"""
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories = list(dtype.categories)
+            if not all(isinstance(value, str) for value in categories):
+                raise ValueError(f"Column {series.name} has non-text categories")
+            buffer, offsets = self._encode_text(categories)
+            return ({"kind": "category", "ordered": bool(dtype.ordered)},
+                    {"codes": series.array.codes, "buffer": buffer, "offsets": offsets})
+        
+        if pd.api.types.is_string_dtype(dtype) or pd.api.types.is_object_dtype(dtype):
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            if not all(isinstance(value, str) for value in uniques):
+                raise ValueError(f"Column {series.name} mixes text with other values")
+            buffer, offsets = self._encode_text(list(uniques))
+            return ({"kind": "text", "dtype": str(dtype)},
+                    {"codes": codes.astype(np.int32), "buffer": buffer, "offsets": offsets})
+        
+        if pd.api.types.is_extension_array_dtype(dtype) and hasattr(dtype, "numpy_dtype"):
+            # Nullable Int64 / Float32 / boolean: values plus missing-value mask
+            mask = series.isna().to_numpy()
+            values = series.array.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+            return {"kind": "masked", "dtype": str(dtype)}, {"values": values, "mask": mask}
+        
+        values = series.to_numpy()
+        if values.dtype.kind not in "biufmM":
+            raise ValueError(f"Column {series.name} has unsupported dtype {dtype}")
+        return {"kind": "numpy"}, {"values": values}
+    
+    def write(self, name: str, key: str, df: pd.DataFrame) -> str:
+        """
+        Store df as the snapshot for name and key, replacing nothing
+        
+        The snapshot is written to a private directory and renamed into
+        place, so readers never see a partial snapshot. If another process
+        published the same key first, its snapshot is kept.
+        
+        Returns:
+            Directory of the snapshot
+        
+        Raises:
+            ValueError: If a column can't be stored columnar
+        """
+        columns = []
+        arrays = {}
+        for position, col in enumerate(df.columns):
+            entry, parts = self._column_parts(df[col])
+            entry["name"] = str(col)
+            entry["parts"] = sorted(parts)
+            columns.append(entry)
+            for part, values in parts.items():
+                arrays[f"{position}.{part}.npy"] = values
+        
+        target = self._snapshot_dir(name, key)
+        if os.path.isdir(target):
+            return target
+        
+        staging = os.path.join(self.cache_dir, name, f".tmp-{os.getpid()}-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            for filename, values in arrays.items():
+                np.save(os.path.join(staging, filename), np.ascontiguousarray(values), allow_pickle=False)
+            manifest = {"format": self.FORMAT_VERSION, "rows": len(df), "columns": columns}
+            with open(os.path.join(staging, self.MANIFEST), "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            os.rename(staging, target)
+        except OSError:
+            if not os.path.isdir(target):
+                raise
+            # Another process published this key while we were writing
+        finally:
+            if os.path.isdir(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+        
+        self.prune(name)
+        return target
+    
+    def load(self, name: str, key: str) -> Optional[pd.DataFrame]:
+        """Map the snapshot for name and key, or return None if there is none"""
+        snapshot_dir = self._snapshot_dir(name, key)
+        try:
+            with open(os.path.join(snapshot_dir, self.MANIFEST), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get("format") != self.FORMAT_VERSION:
+            return None
+        
+        data = {}
+        for position, entry in enumerate(manifest["columns"]):
+            # Plain ndarray views of the maps, so pandas doesn't carry the memmap class around
+            parts = {
+                part: np.load(os.path.join(snapshot_dir, f"{position}.{part}.npy"),
+                              mmap_mode="c", allow_pickle=False).view(np.ndarray)
+                for part in entry["parts"]
+            }
+            kind = entry["kind"]
+            if kind == "category":
+                dtype = pd.CategoricalDtype(self._decode_text(parts["buffer"], parts["offsets"]),
+                                            ordered=entry["ordered"])
+                data[entry["name"]] = pd.Categorical.from_codes(parts["codes"], dtype=dtype)
+            elif kind == "masked":
+                array_type = pd.api.types.pandas_dtype(entry["dtype"]).construct_array_type()
+                data[entry["name"]] = array_type(parts["values"], parts["mask"])
+            elif kind == "text":
+                uniques = np.array(self._decode_text(parts["buffer"], parts["offsets"]) + [None],
+                                   dtype=object)
+                # Code -1 (missing) picks the trailing None
+                data[entry["name"]] = pd.array(uniques[parts["codes"]], dtype=entry["dtype"])
+            else:
+                data[entry["name"]] = parts["values"]
+        
+        # copy=False keeps the columns backed by the mapped files
+        return pd.DataFrame(data, index=pd.RangeIndex(manifest["rows"]), copy=False)
+    
+    def get(self, name: str, key: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Get the frame for name and key from this process, disk, or build
+        
+        build is only called when no process has snapshotted the key yet.
+        Empty frames and frames that can't be stored are returned without
+        being snapshotted.
+        """
+        with self._lock:
+            loaded = self._loaded.get(name)
+        if loaded is None or loaded[0] != key:
+            df = self.load(name, key)
+            if df is None:
+                df = build()
+                if df.empty:
+                    return df
+                try:
+                    self.write(name, key, df.reset_index(drop=True))
+                    df = self.load(name, key)
+                except (OSError, ValueError):
+                    return df
+            with self._lock:
+                self._loaded[name] = (key, df)
+            loaded = (key, df)
+        
+        if not _COPY_ON_WRITE:
+            # Without Copy-on-Write, in-place edits would reach the shared frame
+            return loaded[1].copy(deep=True)
+        # Callers get their own lazy (copy-on-write) copy of the shared frame
+        return loaded[1].copy(deep=False)
+    
+    def prune(self, name: str) -> int:
+        """Delete all but the newest KEEP_GENERATIONS snapshots of name"""
+        name_dir = os.path.join(self.cache_dir, name)
+        snapshots = [
+            entry for entry in os.scandir(name_dir)
+            if entry.is_dir() and not entry.name.startswith(".")
+        ]
+        snapshots.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in snapshots[self.KEEP_GENERATIONS:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+        return max(len(snapshots) - self.KEEP_GENERATIONS, 0)
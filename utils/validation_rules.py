@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Callable, Tuple
+
+
+class ValidationResult:
+    """Outcome of evaluating a RuleEngine against a DataFrame
+    
+    ``row_errors`` is a per-row bitmap: bit ``i`` is set when the row failed
+    the i-th compiled rule (see ``rules``). ``messages`` holds one aggregated
+    message per failing rule, in rule order.
+    """
+    
+    def __init__(self, index: pd.Index, row_errors: np.ndarray,
+                 rules: List[Tuple[str, str, str]], messages: List[str]):
+        self.index = index
+        self.row_errors = row_errors
+        self.rules = rules
+        self.messages = messages
+    
+    @property
+    def is_valid(self) -> bool:
+        return not self.row_errors.any()
+    
+    @property
+    def valid_mask(self) -> np.ndarray:
+        """Boolean mask of rows that passed every rule"""
+        return self.row_errors == 0
+    
+    def errors_frame(self) -> pd.DataFrame:
+        """Return the failing rows with the list of messages for each
+        
+        The result is indexed like the validated DataFrame and has a single
+        ``errors`` column; rows without errors are omitted.
+        """
+        failing = np.flatnonzero(self.row_errors)
+        errors: Dict[int, List[str]] = {pos: [] for pos in failing}
+        for bit, (_, _, row_message) in enumerate(self.rules):
+            for pos in np.flatnonzero(self.row_errors[failing] & np.uint64(1 << bit)):
+                errors[failing[pos]].append(row_message)
+        return pd.DataFrame(
+            {"errors": [errors[pos] for pos in failing]},
+            index=self.index[failing]
+        )
+
+
+class RuleEngine:
+    """Compiles column validation rules into vectorized checks
+    
+    Rules use the same format as ``ExcelHandler.validate_data_quality``::
+        
+        {"column": {"not_null": True, "dtype": "numeric",
+                    "allowed_values": [...], "min_value": 0, "max_value": 100}}
+    
+    plus ``required`` (not null and not blank), ``prefix`` (text must start
+    with the given string), ``allow_empty`` (null or empty values pass the
+    ``allowed_values`` and ``prefix`` checks) and ``messages``, a mapping
+    of rule name to the message reported for failing rows.
+    
+    Every rule becomes a function returning a NumPy mask of failing rows, so
+    a column is checked with a handful of array operations regardless of its
+    length.
+    """
+    
+    MAX_RULES = 64
+    
+    def __init__(self, validation_rules: Dict[str, Dict[str, Any]]):
+        self._compiled: List[Tuple[str, str, Callable[[pd.Series], np.ndarray],
+                                   Callable[[pd.Series, np.ndarray], str], str]] = []
+        for column, rules in validation_rules.items():
+            self._compile_column(column, rules)
+        if len(self._compiled) > self.MAX_RULES:
+            raise ValueError(f"At most {self.MAX_RULES} rules are supported")
+    
+    @staticmethod
+    def _is_empty(series: pd.Series) -> np.ndarray:
+        """Mask of null or empty-string values"""
+        return (series.isna() | series.astype("string").eq("").fillna(False)).to_numpy(dtype=bool)
+    
+    @staticmethod
+    def _is_blank(series: pd.Series) -> np.ndarray:
+        """Mask of null or whitespace-only values"""
+        blank = series.astype("string").str.strip().eq("").fillna(False)
+        return (series.isna() | blank).to_numpy(dtype=bool)
+    
+    def _add(self, column: str, rule: str, check, summary, row_message: str, rules: Dict):
+        messages = rules.get("messages", {})
+        if rule in messages:
+            custom = messages[rule]
+            summary = lambda series, mask, custom=custom: custom
+            row_message = custom
+        self._compiled.append((column, rule, check, summary, row_message))
+    
+    def _compile_column(self, column: str, rules: Dict[str, Any]):
+        allow_empty = rules.get("allow_empty", False)
+        
+        if rules.get("required", False):
+            self._add(
+                column, "required",
+                self._is_blank,
+                lambda s, m: f"Column '{column}' has {int(m.sum())} empty values",
+                f"Column '{column}' is required",
+                rules
+            )
+        
+        if rules.get("not_null", False):
+            self._add(
+                column, "not_null",
+                lambda s: s.isna().to_numpy(dtype=bool),
+                lambda s, m: f"Column '{column}' has {int(m.sum())} null values",
+                f"Column '{column}' is null",
+                rules
+            )
+        
+        if rules.get("dtype") == "numeric":
+            def non_numeric(series: pd.Series) -> np.ndarray:
+                if pd.api.types.is_numeric_dtype(series):
+                    return np.zeros(len(series), dtype=bool)
+                coerced = pd.to_numeric(series, errors="coerce")
+                return (coerced.isna() & series.notna()).to_numpy(dtype=bool)
+            
+            self._add(
+                column, "dtype",
+                non_numeric,
+                lambda s, m: f"Column '{column}' has {int(m.sum())} non-numeric values",
+                f"Column '{column}' is not numeric",
+                rules
+            )
+        
+        if "allowed_values" in rules:
+            allowed = list(rules["allowed_values"])
+            
+            def not_allowed(series: pd.Series) -> np.ndarray:
+                mask = ~series.isin(allowed).to_numpy(dtype=bool)
+                if allow_empty:
+                    mask &= ~self._is_empty(series)
+                return mask
+            
+            self._add(
+                column, "allowed_values",
+                not_allowed,
+                lambda s, m: f"Column '{column}' has invalid values: {np.asarray(s[m].unique())[:5]}",
+                f"Column '{column}' has an invalid value",
+                rules
+            )
+        
+        if "prefix" in rules:
+            prefix = rules["prefix"]
+            
+            def wrong_prefix(series: pd.Series) -> np.ndarray:
+                text = series.astype("string")
+                mask = ~text.str.startswith(prefix).fillna(False).to_numpy(dtype=bool)
+                if allow_empty:
+                    mask &= ~self._is_empty(series)
+                return mask
+            
+            self._add(
+                column, "prefix",
+                wrong_prefix,
+                lambda s, m: f"Column '{column}' has {int(m.sum())} values not starting with '{prefix}'",
+                f"Column '{column}' must start with '{prefix}'",
+                rules
+            )
+        
+        if "min_value" in rules:
+            min_value = rules["min_value"]
+            self._add(
+                column, "min_value",
+                lambda s: (pd.to_numeric(s, errors="coerce") < min_value).to_numpy(dtype=bool),
+                lambda s, m: f"Column '{column}' has {int(m.sum())} values below minimum ({min_value})",
+                f"Column '{column}' is below minimum ({min_value})",
+                rules
+            )
+        
+        if "max_value" in rules:
+            max_value = rules["max_value"]
+            self._add(
+                column, "max_value",
+                lambda s: (pd.to_numeric(s, errors="coerce") > max_value).to_numpy(dtype=bool),
+                lambda s, m: f"Column '{column}' has {int(m.sum())} values above maximum ({max_value})",
+                f"Column '{column}' is above maximum ({max_value})",
+                rules
+            )
+    
+    def evaluate(self, df: pd.DataFrame) -> ValidationResult:
+        """Run every rule against df; rules for missing columns are skipped"""
+        row_errors = np.zeros(len(df), dtype=np.uint64)
+        messages = []
+        for bit, (column, _, check, summary, _) in enumerate(self._compiled):
+            if column not in df.columns:
+                continue
+            series = df[column]
+            mask = check(series)
+            if mask.any():
+                row_errors[mask] |= np.uint64(1 << bit)
+                messages.append(summary(series, mask))
+        
+        rules = [(column, rule, row_message) for column, rule, _, _, row_message in self._compiled]
+        return ValidationResult(df.index, row_errors, rules, messages)
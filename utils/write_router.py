@@ -0,0 +1,197 @@
+import logging
+import socket
+import struct
+import threading
+from collections.abc import Iterator
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener, answer_challenge, deliver_challenge
+from typing import Any, Callable, Dict, Iterator as IteratorType, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split a 'host:port' write address"""
+    host, _, port = address.rpartition(":")
+    return host or "0.0.0.0", int(port)
+
+
+class _Stream:
+    """Placeholder for an iterator argument whose items follow the call"""
+
+
+class WriteServer:
+    """Runs write helpers on behalf of replica processes
+    
+    The owner process listens on a TCP address; replicas connect with the
+    shared authkey and send (name, args, kwargs) for one of the registered
+    handlers. Each connection is served on its own thread, and the handlers
+    themselves serialize their writes through the owner's DatabaseWriter.
+    
+    An iterator argument is streamed: the replica sends its items one at a
+    time and the handler receives a generator over them, so chunked imports
+    keep their bounded memory use across the hop.
+    """
+    
+    def __init__(self, address: Tuple[str, int], authkey: bytes,
+                 handlers: Dict[str, Callable[..., Any]]):
+        """
+        Args:
+            address: (host, port) to listen on
+            authkey: Secret shared with the replicas
+            handlers: Callable write helpers by name
+        """
+        self.handlers = handlers
+        self._closed = False
+        self._listener = Listener(address, authkey=authkey)
+        self._thread = threading.Thread(target=self._serve, name="write-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Accepting routed writes on {address[0]}:{address[1]}")
+    
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._listener.address
+    
+    def _serve(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                logger.warning("Rejected a routed write connection with a wrong authkey")
+                continue
+            except (OSError, EOFError):
+                # Closed, or a client hung up during the handshake
+                if self._closed:
+                    return
+                continue
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+    
+    @staticmethod
+    def _receive_stream(conn: Connection) -> IteratorType[Any]:
+        while True:
+            kind, item = conn.recv()
+            if kind == "end":
+                return
+            yield item
+    
+    def _handle(self, conn: Connection):
+        with conn:
+            try:
+                name, args, kwargs = conn.recv()
+            except (EOFError, OSError):
+                return
+            stream = None
+            args = list(args)
+            for position, arg in enumerate(args):
+                if isinstance(arg, _Stream):
+                    stream = self._receive_stream(conn)
+                    args[position] = stream
+            try:
+                handler = self.handlers[name]
+                response = ("ok", handler(*args, **kwargs))
+            except Exception as e:
+                response = ("error", e)
+            # Drain stream items the handler didn't consume before replying
+            if stream is not None:
+                try:
+                    for _ in stream:
+                        pass
+                except (EOFError, OSError):
+                    return
+            try:
+                conn.send(response)
+            except (OSError, ValueError):
+                logger.warning(f"Could not return result of routed write {name}")
+    
+    def close(self):
+        self._closed = True
+        self._listener.close()
+
+
+class WriteClient:
+    """Sends write helper calls to the owner's WriteServer
+    
+    Every wait is bounded: connecting and the authkey handshake by
+    connect_timeout, each send and the wait for the result by timeout. A
+    call that times out raises TimeoutError; the owner may still finish it.
+    """
+    
+    def __init__(self, address: Tuple[str, int], authkey: bytes,
+                 timeout: float = 300.0, connect_timeout: float = 10.0):
+        """
+        Args:
+            address: (host, port) of the owner's WriteServer
+            authkey: Secret shared with the owner
+            timeout: Seconds to wait for the owner to take a sent item or
+                to return the result
+            connect_timeout: Seconds to wait for the connection and handshake
+        """
+        self.address = address
+        self.authkey = authkey
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+    
+    @staticmethod
+    def _set_io_timeouts(sock: socket.socket, seconds: float):
+        # OS-level timeouts, which the blocking reads and writes of a
+        # multiprocessing Connection still honour
+        timeval = struct.pack("ll", int(seconds), int(seconds % 1 * 1_000_000))
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO, timeval)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, timeval)
+    
+    def _connect(self) -> Connection:
+        """Open an authenticated connection, like multiprocessing's Client but bounded"""
+        sock = socket.create_connection(self.address, timeout=self.connect_timeout)
+        sock.setblocking(True)
+        self._set_io_timeouts(sock, self.connect_timeout)
+        conn = Connection(sock.detach())
+        try:
+            answer_challenge(conn, self.authkey)
+            deliver_challenge(conn, self.authkey)
+            with socket.socket(fileno=conn.fileno()) as handle:
+                self._set_io_timeouts(handle, self.timeout)
+                handle.detach()
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+    
+    def call(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run the named write helper on the owner and return its result
+        
+        At most one positional argument may be an iterator; it is streamed
+        to the owner item by item.
+        
+        Raises:
+            Whatever the handler raised; OSError or EOFError if the owner
+            can't be reached, TimeoutError (an OSError) if it didn't answer
+            in time, AuthenticationError if the authkey is wrong
+        """
+        stream = None
+        sent_args = []
+        for arg in args:
+            if isinstance(arg, Iterator):
+                if stream is not None:
+                    raise ValueError("Only one iterator argument can be streamed")
+                stream = arg
+                sent_args.append(_Stream())
+            else:
+                sent_args.append(arg)
+        
+        try:
+            with self._connect() as conn:
+                conn.send((name, tuple(sent_args), kwargs))
+                if stream is not None:
+                    for item in stream:
+                        conn.send(("item", item))
+                    conn.send(("end", None))
+                if not conn.poll(self.timeout):
+                    raise TimeoutError(f"No result from the owner within {self.timeout:.0f}s")
+                status, result = conn.recv()
+        except BlockingIOError as e:
+            # A socket timeout surfaces as EAGAIN from the blocking reads and writes
+            raise TimeoutError(f"The owner stopped responding: {e}") from e
+        if status == "error":
+            raise result
+        return result